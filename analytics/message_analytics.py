@@ -15,6 +15,14 @@ import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
 from collections import Counter
 
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.database import get_database
+from outreach.schema import (
+    migrate_database, MESSAGE_LOOKUP_QUERY, TEMPLATE_ANALYTICS_QUERY, PERIOD_MESSAGE_TOTALS_QUERY,
+    DAILY_MESSAGE_TOTALS_QUERY
+)
+
 class MessageAnalytics:
     """Class for analyzing the effectiveness of outreach messages."""
     
@@ -22,6 +30,7 @@ class MessageAnalytics:
         """Initialize the MessageAnalytics with database path."""
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.db_path = db_path or os.path.join(base_dir, 'data', 'outreach.db')
+        self.db = get_database(self.db_path)
         self.output_dir = os.path.join(base_dir, 'data', 'analytics')
         
         # Create output directory if it doesn't exist
@@ -32,102 +41,61 @@ class MessageAnalytics:
     
     def _create_tables(self):
         """Create necessary database tables if they don't exist."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create message_analytics table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS message_analytics (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            message_id TEXT,
-            business_id TEXT,
-            template_id TEXT,
-            sent_at TEXT,
-            opened_at TEXT,
-            replied_at TEXT,
-            clicked_at TEXT,
-            booked_at TEXT,
-            status TEXT,
-            FOREIGN KEY (business_id) REFERENCES businesses(id),
-            FOREIGN KEY (message_id) REFERENCES messages(id),
-            FOREIGN KEY (template_id) REFERENCES message_templates(id)
-        )
-        ''')
-        
-        # Create message_templates table if it doesn't exist
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS message_templates (
-            id TEXT PRIMARY KEY,
-            name TEXT,
-            subject TEXT,
-            body TEXT,
-            category TEXT,
-            tags TEXT,
-            created_at TEXT,
-            updated_at TEXT
-        )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        # The tables are part of the shared outreach schema, created by its migrations
+        migrate_database(self.db)
     
     def track_message(self, message_id, business_id, template_id, status='sent'):
         """Track a message event."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Check if message already exists
-        cursor.execute('SELECT id FROM message_analytics WHERE message_id = ?', (message_id,))
-        existing = cursor.fetchone()
-        
-        now = datetime.now().isoformat()
-        
-        if existing:
-            # Update existing record
-            if status == 'sent':
-                cursor.execute('UPDATE message_analytics SET sent_at = ? WHERE message_id = ?', (now, message_id))
-            elif status == 'opened':
-                cursor.execute('UPDATE message_analytics SET opened_at = ? WHERE message_id = ?', (now, message_id))
-            elif status == 'replied':
-                cursor.execute('UPDATE message_analytics SET replied_at = ? WHERE message_id = ?', (now, message_id))
-            elif status == 'clicked':
-                cursor.execute('UPDATE message_analytics SET clicked_at = ? WHERE message_id = ?', (now, message_id))
-            elif status == 'booked':
-                cursor.execute('UPDATE message_analytics SET booked_at = ? WHERE message_id = ?', (now, message_id))
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
             
-            cursor.execute('UPDATE message_analytics SET status = ? WHERE message_id = ?', (status, message_id))
-        else:
-            # Create new record
-            sent_at = now if status == 'sent' else None
-            opened_at = now if status == 'opened' else None
-            replied_at = now if status == 'replied' else None
-            clicked_at = now if status == 'clicked' else None
-            booked_at = now if status == 'booked' else None
+            # Check if message already exists
+            cursor.execute(MESSAGE_LOOKUP_QUERY, (message_id,))
+            existing = cursor.fetchone()
+            
+            now = datetime.now().isoformat()
+            
+            if existing:
+                # Update existing record
+                if status == 'sent':
+                    cursor.execute('UPDATE message_analytics SET sent_at = ? WHERE message_id = ?', (now, message_id))
+                elif status == 'opened':
+                    cursor.execute('UPDATE message_analytics SET opened_at = ? WHERE message_id = ?', (now, message_id))
+                elif status == 'replied':
+                    cursor.execute('UPDATE message_analytics SET replied_at = ? WHERE message_id = ?', (now, message_id))
+                elif status == 'clicked':
+                    cursor.execute('UPDATE message_analytics SET clicked_at = ? WHERE message_id = ?', (now, message_id))
+                elif status == 'booked':
+                    cursor.execute('UPDATE message_analytics SET booked_at = ? WHERE message_id = ?', (now, message_id))
+                
+                cursor.execute('UPDATE message_analytics SET status = ? WHERE message_id = ?', (status, message_id))
+            else:
+                # Create new record
+                sent_at = now if status == 'sent' else None
+                opened_at = now if status == 'opened' else None
+                replied_at = now if status == 'replied' else None
+                clicked_at = now if status == 'clicked' else None
+                booked_at = now if status == 'booked' else None
+                
+                cursor.execute('''
+                INSERT INTO message_analytics (
+                    message_id, business_id, template_id, sent_at, opened_at, replied_at, clicked_at, booked_at, status
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    message_id, business_id, template_id, sent_at, opened_at, replied_at, clicked_at, booked_at, status
+                ))
             
-            cursor.execute('''
-            INSERT INTO message_analytics (
-                message_id, business_id, template_id, sent_at, opened_at, replied_at, clicked_at, booked_at, status
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                message_id, business_id, template_id, sent_at, opened_at, replied_at, clicked_at, booked_at, status
-            ))
-        
-        conn.commit()
-        conn.close()
-        
         return {'success': True, 'message_id': message_id, 'status': status}
     
     def get_message_analytics(self, message_id):
         """Get analytics for a specific message."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self.db.connection()
         cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
         
         cursor.execute('SELECT * FROM message_analytics WHERE message_id = ?', (message_id,))
         analytics = cursor.fetchone()
         
-        conn.close()
-        
         if analytics:
             return dict(analytics)
         
@@ -135,20 +103,11 @@ class MessageAnalytics:
     
     def get_template_analytics(self, template_id):
         """Get analytics for a specific template."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self.db.connection()
         cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
         
-        cursor.execute('''
-        SELECT 
-            COUNT(*) as sent_count,
-            SUM(CASE WHEN opened_at IS NOT NULL THEN 1 ELSE 0 END) as opened_count,
-            SUM(CASE WHEN replied_at IS NOT NULL THEN 1 ELSE 0 END) as replied_count,
-            SUM(CASE WHEN clicked_at IS NOT NULL THEN 1 ELSE 0 END) as clicked_count,
-            SUM(CASE WHEN booked_at IS NOT NULL THEN 1 ELSE 0 END) as booked_count
-        FROM message_analytics 
-        WHERE template_id = ?
-        ''', (template_id,))
+        cursor.execute(TEMPLATE_ANALYTICS_QUERY, (template_id,))
         
         analytics = cursor.fetchone()
         
@@ -156,8 +115,6 @@ class MessageAnalytics:
         cursor.execute('SELECT * FROM message_templates WHERE id = ?', (template_id,))
         template = cursor.fetchone()
         
-        conn.close()
-        
         if analytics and template:
             result = dict(analytics)
             result['template'] = dict(template)
@@ -181,9 +138,9 @@ class MessageAnalytics:
     
     def compare_templates(self, template_ids=None):
         """Compare the performance of different templates."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self.db.connection()
         cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
         
         if template_ids:
             placeholders = ','.join(['?' for _ in template_ids])
@@ -223,8 +180,6 @@ class MessageAnalytics:
             if template:
                 template_data[template_id] = template['name']
         
-        conn.close()
-        
         results = []
         for row in analytics:
             template_id = row['template_id']
@@ -252,25 +207,16 @@ class MessageAnalytics:
     
     def generate_performance_report(self, days=30, output_format='html'):
         """Generate a performance report for outreach messages."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self.db.connection()
         cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
         
         # Calculate date range
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
         
         # Get overall metrics
-        cursor.execute('''
-        SELECT 
-            COUNT(*) as sent_count,
-            SUM(CASE WHEN opened_at IS NOT NULL THEN 1 ELSE 0 END) as opened_count,
-            SUM(CASE WHEN replied_at IS NOT NULL THEN 1 ELSE 0 END) as replied_count,
-            SUM(CASE WHEN clicked_at IS NOT NULL THEN 1 ELSE 0 END) as clicked_count,
-            SUM(CASE WHEN booked_at IS NOT NULL THEN 1 ELSE 0 END) as booked_count
-        FROM message_analytics 
-        WHERE sent_at >= ? AND sent_at <= ?
-        ''', (start_date.isoformat(), end_date.isoformat()))
+        cursor.execute(PERIOD_MESSAGE_TOTALS_QUERY, (start_date.isoformat(), end_date.isoformat()))
         
         overall = cursor.fetchone()
         
@@ -293,24 +239,10 @@ class MessageAnalytics:
         templates = cursor.fetchall()
         
         # Get daily metrics
-        cursor.execute('''
-        SELECT 
-            date(sent_at) as date,
-            COUNT(*) as sent_count,
-            SUM(CASE WHEN opened_at IS NOT NULL THEN 1 ELSE 0 END) as opened_count,
-            SUM(CASE WHEN replied_at IS NOT NULL THEN 1 ELSE 0 END) as replied_count,
-            SUM(CASE WHEN clicked_at IS NOT NULL THEN 1 ELSE 0 END) as clicked_count,
-            SUM(CASE WHEN booked_at IS NOT NULL THEN 1 ELSE 0 END) as booked_count
-        FROM message_analytics 
-        WHERE sent_at >= ? AND sent_at <= ?
-        GROUP BY date(sent_at)
-        ORDER BY date(sent_at)
-        ''', (start_date.isoformat(), end_date.isoformat()))
+        cursor.execute(DAILY_MESSAGE_TOTALS_QUERY, (start_date.isoformat(), end_date.isoformat()))
         
         daily = cursor.fetchall()
         
-        conn.close()
-        
         # Generate report
         if output_format == 'html':
             return self._generate_html_report(overall, templates, daily, days)
@@ -726,9 +658,9 @@ class MessageAnalytics:
     
     def analyze_message_content(self, template_ids=None):
         """Analyze message content to identify effective patterns."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self.db.connection()
         cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
         
         # Get templates and their performance
         if template_ids:
@@ -757,7 +689,6 @@ class MessageAnalytics:
             ''')
         
         templates = cursor.fetchall()
-        conn.close()
         
         # Convert to list of dictionaries
         templates = [dict(t) for t in templates]
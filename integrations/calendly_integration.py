@@ -12,61 +12,41 @@ import requests
 from datetime import datetime, timedelta
 import sqlite3
 
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.rate_limiter import RateLimiter, RateLimitError
+from tools.database import get_database
+from outreach.schema import migrate_database, BUSINESS_CALENDLY_EVENTS_QUERY
+
+# Calendly allows bursts but enforces a per-minute quota per token
+CALENDLY_RATE = 1.0
+CALENDLY_BURST = 5
+
 class CalendlyIntegration:
     """Class for integrating Calendly with the business finder and website generator tools."""
     
-    def __init__(self, api_key=None, user_uri=None, db_path=None):
-        """Initialize the CalendlyIntegration with API key and user URI."""
+    def __init__(self, api_key=None, user_uri=None, db_path=None, base_url=None, rate_limiter=None):
+        """Initialize the CalendlyIntegration with API key and user URI.
+        
+        base_url overrides the API root (e.g. a local stub server) and
+        rate_limiter replaces the default shared 'calendly' bucket.
+        """
         self.api_key = api_key or os.environ.get('CALENDLY_API_KEY')
         self.user_uri = user_uri or os.environ.get('CALENDLY_USER_URI')
+        self.base_url = (base_url or os.environ.get('CALENDLY_BASE_URL') or 'https://api.calendly.com').rstrip('/')
+        self.rate_limiter = rate_limiter or RateLimiter('calendly', rate=CALENDLY_RATE, capacity=CALENDLY_BURST)
         
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.db_path = db_path or os.path.join(base_dir, 'data', 'outreach.db')
+        self.db = get_database(self.db_path)
         
         # Create database tables if they don't exist
         self._create_tables()
     
     def _create_tables(self):
         """Create necessary database tables if they don't exist."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create calendly_events table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS calendly_events (
-            id TEXT PRIMARY KEY,
-            business_id TEXT,
-            event_type TEXT,
-            start_time TEXT,
-            end_time TEXT,
-            invitee_name TEXT,
-            invitee_email TEXT,
-            invitee_phone TEXT,
-            status TEXT,
-            created_at TEXT,
-            updated_at TEXT,
-            canceled_at TEXT,
-            FOREIGN KEY (business_id) REFERENCES businesses(id)
-        )
-        ''')
-        
-        # Create calendly_event_types table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS calendly_event_types (
-            id TEXT PRIMARY KEY,
-            name TEXT,
-            slug TEXT,
-            duration INTEGER,
-            description TEXT,
-            uri TEXT,
-            active BOOLEAN,
-            created_at TEXT,
-            updated_at TEXT
-        )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        # The tables are part of the shared outreach schema, created by its migrations
+        migrate_database(self.db)
     
     def get_auth_headers(self):
         """Get authentication headers for Calendly API requests."""
@@ -78,15 +58,22 @@ class CalendlyIntegration:
             'Content-Type': 'application/json'
         }
     
+    def _get(self, path):
+        """Send a rate-limited GET request to the Calendly API, retrying throttled calls."""
+        def fetch():
+            response = requests.get(f"{self.base_url}{path}", headers=self.get_auth_headers())
+            response.raise_for_status()
+            return response
+        
+        return self.rate_limiter.call(fetch)
+    
     def get_event_types(self):
         """Get available event types from Calendly."""
         if not self.api_key or not self.user_uri:
             return {'error': 'Calendly API key and user URI are required'}
         
         try:
-            url = f"https://api.calendly.com/event_types?user={self.user_uri}"
-            response = requests.get(url, headers=self.get_auth_headers())
-            response.raise_for_status()
+            response = self._get(f"/event_types?user={self.user_uri}")
             
             data = response.json()
             event_types = []
@@ -111,32 +98,29 @@ class CalendlyIntegration:
             
             return {'event_types': event_types}
         
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, RateLimitError) as e:
             return {'error': str(e)}
     
     def _save_event_type(self, event_type):
         """Save event type to database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        INSERT OR REPLACE INTO calendly_event_types (
-            id, name, slug, duration, description, uri, active, created_at, updated_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            event_type.get('id'),
-            event_type.get('name'),
-            event_type.get('slug'),
-            event_type.get('duration'),
-            event_type.get('description'),
-            event_type.get('uri'),
-            event_type.get('active', True),
-            event_type.get('created_at'),
-            event_type.get('updated_at')
-        ))
-        
-        conn.commit()
-        conn.close()
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+            INSERT OR REPLACE INTO calendly_event_types (
+                id, name, slug, duration, description, uri, active, created_at, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                event_type.get('id'),
+                event_type.get('name'),
+                event_type.get('slug'),
+                event_type.get('duration'),
+                event_type.get('description'),
+                event_type.get('uri'),
+                event_type.get('active', True),
+                event_type.get('created_at'),
+                event_type.get('updated_at')
+            ))
     
     def get_scheduled_events(self, start_time=None, end_time=None):
         """Get scheduled events from Calendly."""
@@ -150,9 +134,7 @@ class CalendlyIntegration:
             if not end_time:
                 end_time = (datetime.utcnow() + timedelta(days=30)).isoformat() + 'Z'
             
-            url = f"https://api.calendly.com/scheduled_events?user={self.user_uri}&min_start_time={start_time}&max_start_time={end_time}"
-            response = requests.get(url, headers=self.get_auth_headers())
-            response.raise_for_status()
+            response = self._get(f"/scheduled_events?user={self.user_uri}&min_start_time={start_time}&max_start_time={end_time}")
             
             data = response.json()
             events = []
@@ -184,7 +166,7 @@ class CalendlyIntegration:
             
             return {'events': events}
         
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, RateLimitError) as e:
             return {'error': str(e)}
     
     def get_event_invitees(self, event_uri):
@@ -193,9 +175,7 @@ class CalendlyIntegration:
             return {'error': 'Calendly API key is required'}
         
         try:
-            url = f"https://api.calendly.com/scheduled_events/{event_uri.split('/')[-1]}/invitees"
-            response = requests.get(url, headers=self.get_auth_headers())
-            response.raise_for_status()
+            response = self._get(f"/scheduled_events/{event_uri.split('/')[-1]}/invitees")
             
             data = response.json()
             invitees = []
@@ -216,47 +196,42 @@ class CalendlyIntegration:
             
             return {'invitees': invitees}
         
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, RateLimitError) as e:
             return {'error': str(e)}
     
     def _save_event(self, event):
         """Save event to database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        INSERT OR REPLACE INTO calendly_events (
-            id, event_type, start_time, end_time, invitee_name, invitee_email, invitee_phone,
-            status, created_at, updated_at, canceled_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            event.get('id'),
-            event.get('event_type'),
-            event.get('start_time'),
-            event.get('end_time'),
-            event.get('invitee_name'),
-            event.get('invitee_email'),
-            event.get('invitee_phone'),
-            event.get('status'),
-            event.get('created_at'),
-            event.get('updated_at'),
-            event.get('canceled_at')
-        ))
-        
-        conn.commit()
-        conn.close()
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+            INSERT OR REPLACE INTO calendly_events (
+                id, event_type, start_time, end_time, invitee_name, invitee_email, invitee_phone,
+                status, created_at, updated_at, canceled_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                event.get('id'),
+                event.get('event_type'),
+                event.get('start_time'),
+                event.get('end_time'),
+                event.get('invitee_name'),
+                event.get('invitee_email'),
+                event.get('invitee_phone'),
+                event.get('status'),
+                event.get('created_at'),
+                event.get('updated_at'),
+                event.get('canceled_at')
+            ))
     
     def get_event_by_id(self, event_id):
         """Get event details by ID."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self.db.connection()
         cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
         
         cursor.execute('SELECT * FROM calendly_events WHERE id = ?', (event_id,))
         event = cursor.fetchone()
         
-        conn.close()
-        
         if event:
             return dict(event)
         
@@ -264,42 +239,35 @@ class CalendlyIntegration:
     
     def get_events_by_business_id(self, business_id):
         """Get events for a specific business."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self.db.connection()
         cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
         
-        cursor.execute('SELECT * FROM calendly_events WHERE business_id = ? ORDER BY start_time DESC', (business_id,))
+        cursor.execute(BUSINESS_CALENDLY_EVENTS_QUERY, (business_id,))
         events = cursor.fetchall()
         
-        conn.close()
-        
         return [dict(event) for event in events]
     
     def update_event_business_id(self, event_id, business_id):
         """Update the business ID for an event."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('UPDATE calendly_events SET business_id = ? WHERE id = ?', (business_id, event_id))
-        
-        conn.commit()
-        conn.close()
-        
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('UPDATE calendly_events SET business_id = ? WHERE id = ?', (business_id, event_id))
+            
         return {'success': True}
     
     def generate_booking_widget(self, event_type_uri=None, business_id=None, widget_type='inline'):
         """Generate HTML code for Calendly booking widget."""
         if not event_type_uri:
             # Use default event type if not specified
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
+            conn = self.db.connection()
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             cursor.execute('SELECT uri FROM calendly_event_types WHERE active = 1 LIMIT 1')
             event_type = cursor.fetchone()
             
-            conn.close()
-            
             if event_type:
                 event_type_uri = event_type['uri']
             else:
@@ -383,30 +351,27 @@ class CalendlyIntegration:
             return events_data
         
         # Get all businesses from database
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT id, name, email FROM businesses')
-        businesses = cursor.fetchall()
-        
-        # Match events with businesses based on email
-        matched_count = 0
-        
-        for event in events_data.get('events', []):
-            invitee_email = event.get('invitee_email')
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            
+            cursor.execute('SELECT id, name, email FROM businesses')
+            businesses = cursor.fetchall()
+            
+            # Match events with businesses based on email
+            matched_count = 0
+            
+            for event in events_data.get('events', []):
+                invitee_email = event.get('invitee_email')
+                
+                if invitee_email:
+                    for business in businesses:
+                        if business['email'] and business['email'].lower() == invitee_email.lower():
+                            # Update event with business ID
+                            cursor.execute('UPDATE calendly_events SET business_id = ? WHERE id = ?', (business['id'], event.get('id')))
+                            matched_count += 1
+                            break
             
-            if invitee_email:
-                for business in businesses:
-                    if business['email'] and business['email'].lower() == invitee_email.lower():
-                        # Update event with business ID
-                        cursor.execute('UPDATE calendly_events SET business_id = ? WHERE id = ?', (business['id'], event.get('id')))
-                        matched_count += 1
-                        break
-        
-        conn.commit()
-        conn.close()
-        
         return {
             'success': True,
             'total_events': len(events_data.get('events', [])),
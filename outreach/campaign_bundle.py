@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Campaign Bundles
+
+This module stores the generated emails of a campaign in one append-only
+bundle instead of one small .txt file per business. Each email is written as
+a JSON line in its own gzip member, so the bundle as a whole is a valid
+.jsonl.gz file (zcat prints every email), and a side index records the byte
+offset and length of each member. Reading one email back is a dictionary
+lookup, a single positioned read and a small decompress, however large the
+campaign is.
+
+    emails.jsonl.gz   gzip members, one {"id", "saved_at", "content"} line each
+    emails.idx        one ["id", offset, length] JSON line per email
+"""
+
+import os
+import sys
+import json
+import gzip
+import argparse
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are not locked against each other
+    fcntl = None
+
+DATA_NAME = 'emails.jsonl.gz'
+INDEX_NAME = 'emails.idx'
+
+class CampaignBundle:
+    """Append-only store of a campaign's emails with an offset index."""
+    
+    def __init__(self, directory, compresslevel=6, buffer_size=1 << 20, readonly=False):
+        """
+        Initialize the CampaignBundle, creating it if needed.
+        
+        A writable bundle holds an exclusive lock on the data file until it is
+        closed, so a second writer on the same campaign waits for the first.
+        Read-only bundles take no lock and never modify the files, so they can
+        be opened while a campaign is still being written.
+        
+        Args:
+            directory (str): Campaign directory holding the bundle files
+            compresslevel (int): gzip level for new emails (1 fastest - 9 smallest)
+            buffer_size (int): Write buffer size, in bytes
+            readonly (bool): Open for reading only
+        """
+        self.directory = directory
+        self.data_path = os.path.join(directory, DATA_NAME)
+        self.index_path = os.path.join(directory, INDEX_NAME)
+        self.compresslevel = compresslevel
+        self.readonly = readonly
+        
+        self._index = {}
+        self._index_pos = 0
+        self._data = None
+        self._index_file = None
+        self._reader = None
+        self._dirty = False
+        
+        if readonly:
+            self._load_index()
+            return
+            
+        os.makedirs(directory, exist_ok=True)
+        self._data = open(self.data_path, 'ab', buffering=buffer_size)
+        if fcntl is not None:
+            fcntl.flock(self._data.fileno(), fcntl.LOCK_EX)
+        self._recover()
+        self._index_file = open(self.index_path, 'a', encoding='utf-8', buffering=buffer_size)
+        self._offset = self._data.seek(0, os.SEEK_END)
+        
+    def _load_index(self):
+        """
+        Read index entries added since the last load.
+        
+        Loading stops at the first entry that is not completely on disk: a
+        partly written line, or an email whose data has not been flushed yet.
+        Appends are sequential, so everything after it is incomplete too.
+        
+        Returns:
+            bool: True if any entries were loaded
+        """
+        if not os.path.exists(self.index_path):
+            return False
+        data_size = os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0
+        loaded = False
+        with open(self.index_path, 'rb') as f:
+            f.seek(self._index_pos)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    key, offset, length = json.loads(line)
+                except ValueError:
+                    break
+                if offset + length > data_size:
+                    break
+                # A business saved again keeps its first position; lookups return the latest copy
+                self._index[key] = (offset, length)
+                self._index_pos += len(line)
+                loaded = True
+        return loaded
+        
+    def _recover(self):
+        """
+        Load the index and drop whatever an interrupted run left half-written.
+        
+        Only called by a writer holding the lock. The index is cut back to its
+        last complete entry and the data file to the end of the last indexed
+        email, so the next append starts on a clean member boundary.
+        """
+        self._load_index()
+        end = max((offset + length for offset, length in self._index.values()), default=0)
+        if os.path.getsize(self.data_path) > end:
+            self._data.truncate(end)
+        if os.path.exists(self.index_path) and os.path.getsize(self.index_path) > self._index_pos:
+            with open(self.index_path, 'r+b') as f:
+                f.truncate(self._index_pos)
+                
+    def append(self, business_id, content):
+        """
+        Append one email to the bundle.
+        
+        Saving the same business again supersedes the earlier copy.
+        
+        Args:
+            business_id (str): Key the email is retrieved by
+            content (str): Email content
+        """
+        if self.readonly:
+            raise IOError(f"Campaign bundle {self.directory} is open read-only")
+        business_id = str(business_id)
+        record = {'id': business_id, 'saved_at': datetime.now().isoformat(timespec='seconds'), 'content': content}
+        member = gzip.compress((json.dumps(record) + '\n').encode('utf-8'),
+                               compresslevel=self.compresslevel, mtime=0)
+        self._data.write(member)
+        self._index_file.write(json.dumps([business_id, self._offset, len(member)]) + '\n')
+        self._index[business_id] = (self._offset, len(member))
+        self._offset += len(member)
+        self._dirty = True
+        
+    def extend(self, emails):
+        """
+        Append many emails through the same buffered handles.
+        
+        Args:
+            emails (iterable): (business ID, email content) pairs
+            
+        Returns:
+            list: Business IDs written, in input order
+        """
+        written = []
+        for business_id, content in emails:
+            self.append(business_id, content)
+            written.append(str(business_id))
+        return written
+        
+    def flush(self):
+        """Write buffered emails to disk, data before index."""
+        if self.readonly:
+            return
+        self._data.flush()
+        self._index_file.flush()
+        self._dirty = False
+        
+    def get_record(self, business_id):
+        """
+        Get the stored record of an email.
+        
+        Args:
+            business_id (str): Business ID
+            
+        Returns:
+            dict: 'id', 'saved_at' and 'content', or None if the business has no email
+        """
+        business_id = str(business_id)
+        entry = self._index.get(business_id)
+        if entry is None and self.readonly and self._load_index():
+            # The writer may have saved it since this reader loaded the index
+            entry = self._index.get(business_id)
+        if entry is None:
+            return None
+        if self._dirty:
+            self.flush()
+        if self._reader is None:
+            self._reader = open(self.data_path, 'rb')
+        offset, length = entry
+        self._reader.seek(offset)
+        return json.loads(gzip.decompress(self._reader.read(length)))
+        
+    def get(self, business_id):
+        """
+        Get the content of an email.
+        
+        Args:
+            business_id (str): Business ID
+            
+        Returns:
+            str: Email content, or None if the business has no email
+        """
+        record = self.get_record(business_id)
+        return record['content'] if record else None
+        
+    def refresh(self):
+        """
+        Pick up emails a writer has saved since this read-only bundle last loaded its index.
+        
+        Lookups of unknown IDs refresh on their own; this also catches newer
+        copies of emails the reader has already indexed.
+        
+        Returns:
+            bool: True if any entries were loaded
+        """
+        return self.readonly and self._load_index()
+        
+    def ids(self):
+        """Get the business IDs in the bundle, in the order they were first saved."""
+        return list(self._index)
+        
+    def __contains__(self, business_id):
+        return str(business_id) in self._index
+        
+    def __len__(self):
+        return len(self._index)
+        
+    def __iter__(self):
+        """Iterate over (business ID, email content) pairs, latest copy of each."""
+        for business_id in self.ids():
+            yield business_id, self.get(business_id)
+            
+    def close(self):
+        """Flush and close the bundle files, releasing the writer lock."""
+        if self._data is not None:
+            self._data.flush()
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+            
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def main():
+    """List or print emails in a campaign bundle."""
+    parser = argparse.ArgumentParser(description='List or print emails stored in a campaign bundle.')
+    parser.add_argument('directory', help='Campaign directory, e.g. outreach/generated/my_campaign')
+    parser.add_argument('business_ids', nargs='*', help='Print the emails of these businesses (default: list IDs)')
+    args = parser.parse_args()
+    
+    if not os.path.exists(os.path.join(args.directory, INDEX_NAME)):
+        print(f"Error: no campaign bundle in {args.directory}")
+        sys.exit(1)
+        
+    with CampaignBundle(args.directory, readonly=True) as bundle:
+        if not args.business_ids:
+            for business_id in bundle.ids():
+                print(business_id)
+            print(f"{len(bundle):,} emails in {bundle.data_path}")
+            return
+            
+        for business_id in args.business_ids:
+            content = bundle.get(business_id)
+            print(f"===== {business_id} =====")
+            print(content if content is not None else "(not found)")
+
+if __name__ == "__main__":
+    main()
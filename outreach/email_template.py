@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Compiled Email Templates
+
+This module parses a string.Template-style email template ($name, ${name},
+$$) once into literal and placeholder segments. Rendering then fills the
+placeholder slots and joins the segments, instead of re-scanning the whole
+template with a regex for every business as Template.safe_substitute does.
+Output is identical to safe_substitute: unknown placeholders and stray '$'
+signs are left as written.
+"""
+
+from string import Template
+
+class CompiledTemplate:
+    """A template pre-split into literal text and placeholder slots."""
+    
+    def __init__(self, template):
+        """
+        Initialize the CompiledTemplate.
+        
+        Args:
+            template (str): Template text using $name / ${name} placeholders
+        """
+        self.template = template
+        self._parts = []
+        self._slots = []
+        
+        literal = []
+        position = 0
+        for match in Template.pattern.finditer(template):
+            literal.append(template[position:match.start()])
+            position = match.end()
+            
+            name = match.group('named') or match.group('braced')
+            if match.group('escaped') is not None:
+                literal.append(Template.delimiter)
+            elif name is not None:
+                self._parts.append(''.join(literal))
+                literal = []
+                # The slot starts out holding the raw placeholder, which is what a missing value renders as
+                self._slots.append((len(self._parts), name))
+                self._parts.append(match.group(0))
+            else:
+                # Ill-formed delimiter: safe_substitute leaves it as written
+                literal.append(match.group(0))
+        literal.append(template[position:])
+        self._parts.append(''.join(literal))
+        
+        self.placeholders = tuple(dict.fromkeys(name for _, name in self._slots))
+        
+    def render(self, mapping):
+        """
+        Render the template for one set of values.
+        
+        Args:
+            mapping (dict): Placeholder name -> value
+            
+        Returns:
+            str: Rendered text
+        """
+        parts = self._parts[:]
+        for index, name in self._slots:
+            if name in mapping:
+                parts[index] = str(mapping[name])
+        return ''.join(parts)
+        
+    def render_many(self, mappings):
+        """
+        Render the template for a whole batch of values.
+        
+        Args:
+            mappings (iterable): One placeholder dictionary per email
+            
+        Returns:
+            list: Rendered texts, in input order
+        """
+        parts = self._parts
+        slots = self._slots
+        rendered = []
+        for mapping in mappings:
+            buffer = parts[:]
+            for index, name in slots:
+                if name in mapping:
+                    buffer[index] = str(mapping[name])
+            rendered.append(''.join(buffer))
+        return rendered
+        
+    def safe_substitute(self, mapping=None, **kws):
+        """Drop-in replacement for Template.safe_substitute."""
+        if mapping is None:
+            mapping = kws
+        elif kws:
+            mapping = dict(mapping, **kws)
+        return self.render(mapping)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Business Database Sink
+
+This module streams leads straight into the businesses table of the outreach
+database. Rows are upserted in batches through a temporary staging table,
+each batch in its own short write transaction on the shared connection
+manager, so search results reach the database without being serialized to
+CSV/JSON and parsed back, and a long network-bound search never holds the
+database write lock between batches.
+"""
+
+import os
+import sys
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.database import get_database
+from outreach.schema import migrate_database, INCOMING_BUSINESSES_TABLE, STAGED_EXISTING_COUNT_QUERY, STAGED_UPDATE_QUERY
+
+# Columns written to the businesses table (lead dictionaries use the same keys)
+BUSINESS_COLUMNS = ['name', 'category', 'address', 'phone', 'email', 'contact_name', 'location', 'source',
+                    'rating', 'review_count', 'latitude', 'longitude']
+
+# Numeric columns, stored as floats
+NUMERIC_COLUMNS = {'rating': 'REAL', 'review_count': 'INTEGER', 'latitude': 'REAL', 'longitude': 'REAL'}
+
+def _column_value(lead, column):
+    """Get a lead value as text (numbers as floats), treating missing and NaN values (from pandas) as empty."""
+    value = lead.get(column)
+    if column in NUMERIC_COLUMNS:
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return None
+        return None if value != value else value
+    if value is None or value != value:
+        value = ''
+    if column == 'source' and not value:
+        return 'import'
+    return str(value)
+
+class BusinessSink:
+    """Batched upsert of leads into the outreach businesses table."""
+    
+    def __init__(self, db_path=None, batch_size=5000, skip_with_website=True):
+        """
+        Initialize the BusinessSink.
+        
+        Args:
+            db_path (str): Path to the outreach database (default: data/outreach.db)
+            batch_size (int): Leads staged per upsert batch
+            skip_with_website (bool): Ignore leads that already have a website
+        """
+        if db_path is None:
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            db_path = os.path.join(base_dir, 'data', 'outreach.db')
+        self.db_path = db_path
+        self.batch_size = max(1, int(batch_size))
+        self.skip_with_website = skip_with_website
+        
+        self.inserted = 0
+        self.updated = 0
+        self.skipped = 0
+        self._pending = {}
+        
+        self.db = get_database(self.db_path)
+        self._ensure_schema()
+        
+    def _ensure_schema(self):
+        """Create the outreach schema, or apply any migrations an older database is missing."""
+        migrate_database(self.db)
+        
+    @staticmethod
+    def _create_staging_table(conn):
+        """Create the connection's temporary staging table if it does not exist yet."""
+        conn.execute(INCOMING_BUSINESSES_TABLE)
+        
+    def write(self, lead):
+        """
+        Stage a single lead, upserting the batch once it is full.
+        
+        Args:
+            lead (dict): Business data dictionary
+        """
+        if self.skip_with_website and lead.get('has_website', False):
+            self.skipped += 1
+            return
+            
+        row = tuple(_column_value(lead, column) for column in BUSINESS_COLUMNS)
+        
+        # Later copies of a key within a batch win, as they would row by row
+        self._pending[(row[0], row[3])] = row
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+            
+    def write_all(self, leads):
+        """
+        Stage every lead from an iterable.
+        
+        Args:
+            leads (iterable): Business data dictionaries
+            
+        Returns:
+            int: Total rows inserted or updated so far
+        """
+        for lead in leads:
+            self.write(lead)
+        return self.inserted + self.updated
+        
+    def flush(self):
+        """Upsert the staged leads in one short write transaction."""
+        if not self._pending:
+            return
+            
+        placeholders = ', '.join('?' for _ in BUSINESS_COLUMNS)
+        columns = ', '.join(BUSINESS_COLUMNS)
+        
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
+            self._create_staging_table(conn)
+            cursor.executemany(
+                f"INSERT OR REPLACE INTO incoming_businesses ({columns}) VALUES ({placeholders})",
+                self._pending.values()
+            )
+            
+            cursor.execute(STAGED_EXISTING_COUNT_QUERY)
+            updated = cursor.fetchone()[0]
+            
+            cursor.execute(STAGED_UPDATE_QUERY)
+            
+            cursor.execute(f'''
+            INSERT INTO businesses ({columns})
+            SELECT {columns} FROM incoming_businesses i
+            WHERE NOT EXISTS (SELECT 1 FROM businesses b WHERE b.name = i.name AND b.phone = i.phone)
+            ''')
+            inserted = cursor.rowcount
+            
+            cursor.execute('DELETE FROM incoming_businesses')
+            
+        # Counted only once the batch is committed
+        self._pending = {}
+        self.updated += updated
+        self.inserted += inserted
+        
+    def commit(self):
+        """Upsert and commit any staged leads."""
+        self.flush()
+        
+    def stats(self):
+        """
+        Get ingestion statistics.
+        
+        Returns:
+            dict: Rows inserted, updated and skipped
+        """
+        return {
+            'inserted': self.inserted,
+            'updated': self.updated,
+            'skipped': self.skipped
+        }
+        
+    def close(self):
+        """Upsert and commit any staged leads."""
+        self.commit()
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            # Batches already committed stay; the staged remainder of a failed run is dropped
+            self._pending = {}
+        else:
+            self.close()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Pre-built MIME Payloads
+
+This module turns a generated email into its final RFC 5322 bytes ahead of
+time, so the sender can hand stored payloads straight to SMTP instead of
+building and serializing a MIME message for every send. Payloads carry all
+headers, including the Message-ID and the X-Tracking-ID used to match opens,
+clicks and bounces back to the email, and are stored zlib-compressed. Only
+the Date header is left out; it is prepended when the email is actually sent.
+"""
+
+import uuid
+import zlib
+from email import policy
+from email.message import EmailMessage
+from email.utils import formatdate, parseaddr
+
+# CRLF line endings and RFC 2047 encoded headers; bodies stay 7-bit clean so
+# payloads can go to servers without 8BITMIME
+PAYLOAD_POLICY = policy.SMTP.clone(cte_type='7bit')
+
+def compress_payload(payload):
+    """Compress serialized message bytes for storage."""
+    return zlib.compress(payload, 6)
+
+def decompress_payload(blob):
+    """Get the serialized message bytes back from a stored payload."""
+    return zlib.decompress(blob)
+
+def date_header():
+    """Get the Date header line prepended to a payload at send time."""
+    return f"Date: {formatdate(localtime=True)}\r\n".encode('ascii')
+
+class PayloadBuilder:
+    """Builds compressed, send-ready RFC 5322 messages for one sender."""
+    
+    def __init__(self, from_email, reply_to=None):
+        """
+        Initialize the PayloadBuilder.
+        
+        Args:
+            from_email (str): From header, e.g. 'Your Name <you@example.com>'
+            reply_to (str): Optional Reply-To header
+        """
+        self.from_email = from_email
+        self.reply_to = reply_to
+        self.envelope_from = parseaddr(from_email)[1]
+        self.domain = self.envelope_from.rpartition('@')[2] or 'localhost'
+        
+    def message_id(self, tracking_id):
+        """Get the Message-ID of an email, derived from its tracking ID so replies and bounces map back to it."""
+        return f"<{tracking_id}@{self.domain}>"
+        
+    def build(self, to_email, subject, content, tracking_id=None):
+        """
+        Build the final message bytes of an email.
+        
+        The message has the same structure the sender builds on the fly
+        (multipart with one plain-text part), with CRLF line endings.
+        Non-ASCII subjects and display names are RFC 2047 encoded.
+        
+        Args:
+            to_email (str): Recipient email address
+            subject (str): Email subject
+            content (str): Email body
+            tracking_id (str): Tracking ID (default: a new random one)
+            
+        Returns:
+            tuple: (tracking ID, Message-ID, compressed payload bytes)
+        """
+        tracking_id = tracking_id or uuid.uuid4().hex
+        message_id = self.message_id(tracking_id)
+        
+        msg = EmailMessage(policy=PAYLOAD_POLICY)
+        msg['From'] = self.from_email
+        msg['To'] = to_email
+        msg['Subject'] = subject
+        msg['Message-ID'] = message_id
+        msg['X-Tracking-ID'] = tracking_id
+        if self.reply_to:
+            msg['Reply-To'] = self.reply_to
+        msg.set_content(content)
+        msg.make_mixed()
+        
+        payload = msg.as_bytes()
+        return tracking_id, message_id, compress_payload(payload)
@@ -7,18 +7,35 @@ It includes scheduling, tracking, and analytics features.
 """
 
 import os
-import json
+import sys
 import time
 import smtplib
-import pandas as pd
 import sqlite3
 from datetime import datetime, timedelta
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.utils import parseaddr
 import threading
 import schedule
 import logging
 
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.lead_dedup import LeadDeduplicator
+from tools.lead_reader import infer_read_format, iter_leads
+from tools.database import get_database
+from outreach.lead_sink import BusinessSink
+from outreach.mime_payload import PayloadBuilder, decompress_payload, date_header
+from outreach.schema import (
+    migrate_database, SCHEDULED_EMAILS_QUERY, CAMPAIGN_EMAIL_COUNTS_QUERY, CAMPAIGN_ENGAGEMENT_COUNTS_QUERY,
+    CAMPAIGN_PENDING_EMAILS_QUERY, CAMPAIGN_MEMBERSHIP_QUERY, BUSINESS_EMAILS_QUERY, BUSINESS_APPOINTMENTS_QUERY,
+    CAMPAIGN_APPOINTMENT_COUNT_QUERY, DAILY_CAMPAIGN_ANALYTICS_QUERY
+)
+from outreach.spatial_index import AreaFilter, has_rtree
+from tools.lead_scoring import LeadScorer
+from tools.lead_enrichment import RegistryEnricher, print_enrichment_stats
+from tools.postcode_index import PostcodeIndex
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -47,8 +64,12 @@ class OutreachAutomation:
         if db_path is None:
             db_path = os.path.join(self.base_dir, 'data', 'outreach.db')
         self.db_path = db_path
+        self.db = get_database(db_path)
         self._setup_database()
         
+        # Local postcode index for geocoding imported leads, if one has been built
+        self.postcode_index = PostcodeIndex.open_default()
+        
         # Set up email configuration
         self.email_config = email_config or {}
         
@@ -57,101 +78,20 @@ class OutreachAutomation:
         self.scheduler_thread = None
     
     def _setup_database(self):
-        """Set up the SQLite database for tracking outreach."""
+        """Set up the SQLite database for tracking outreach, applying any pending schema migrations."""
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create tables if they don't exist
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS businesses (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            category TEXT,
-            address TEXT,
-            phone TEXT,
-            email TEXT,
-            contact_name TEXT,
-            location TEXT,
-            source TEXT,
-            date_added TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
-        
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS campaigns (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            description TEXT,
-            template_name TEXT,
-            status TEXT DEFAULT 'draft',
-            date_created TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            date_started TIMESTAMP,
-            date_completed TIMESTAMP
-        )
-        ''')
-        
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS emails (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            business_id INTEGER,
-            campaign_id INTEGER,
-            email_type TEXT,
-            subject TEXT,
-            content TEXT,
-            status TEXT DEFAULT 'pending',
-            scheduled_time TIMESTAMP,
-            sent_time TIMESTAMP,
-            opened_time TIMESTAMP,
-            clicked_time TIMESTAMP,
-            replied_time TIMESTAMP,
-            tracking_id TEXT,
-            FOREIGN KEY (business_id) REFERENCES businesses (id),
-            FOREIGN KEY (campaign_id) REFERENCES campaigns (id)
-        )
-        ''')
-        
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS appointments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            business_id INTEGER,
-            campaign_id INTEGER,
-            status TEXT DEFAULT 'scheduled',
-            scheduled_time TIMESTAMP,
-            notes TEXT,
-            calendly_link TEXT,
-            FOREIGN KEY (business_id) REFERENCES businesses (id),
-            FOREIGN KEY (campaign_id) REFERENCES campaigns (id)
-        )
-        ''')
+        version = migrate_database(self.db)
+        self.spatial_index = 'rtree' if has_rtree(self.db.connection().cursor()) else 'btree'
         
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS analytics (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            campaign_id INTEGER,
-            email_type TEXT,
-            sent_count INTEGER DEFAULT 0,
-            open_count INTEGER DEFAULT 0,
-            click_count INTEGER DEFAULT 0,
-            reply_count INTEGER DEFAULT 0,
-            appointment_count INTEGER DEFAULT 0,
-            date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (campaign_id) REFERENCES campaigns (id)
-        )
-        ''')
-        
-        conn.commit()
-        conn.close()
-        
-        logger.info(f"Database setup complete at {self.db_path}")
+        logger.info(f"Database setup complete at {self.db_path} (schema version {version})")
     
     def import_businesses(self, data_file):
         """
-        Import businesses from CSV or JSON file into the database.
+        Import businesses from a CSV, JSON or NDJSON file (optionally gzipped) into the database.
         
         Args:
-            data_file (str): Path to CSV or JSON file with business data
+            data_file (str): Path to the file with business data
             
         Returns:
             int: Number of businesses imported
@@ -160,69 +100,83 @@ class OutreachAutomation:
             logger.error(f"Data file not found: {data_file}")
             return 0
         
-        # Load data from file
-        if data_file.endswith('.csv'):
-            df = pd.read_csv(data_file)
-            businesses = df.to_dict('records')
-        elif data_file.endswith('.json'):
-            with open(data_file, 'r') as f:
-                businesses = json.load(f)
-        else:
+        # Stream records from the file; only the deduplication keys are kept in memory
+        try:
+            infer_read_format(data_file)
+        except ValueError:
             logger.error(f"Unsupported file format: {data_file}")
             return 0
         
-        # Connect to database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # Drop duplicate rows within the file before touching the database
+        deduplicator = LeadDeduplicator()
+        count = self.import_leads(deduplicator.filter(iter_leads(data_file)))
         
-        # Import businesses
-        count = 0
-        for business in businesses:
-            # Skip businesses with websites
-            if business.get('has_website', False):
-                continue
-                
-            # Prepare data
-            name = business.get('name', '')
-            category = business.get('category', '')
-            address = business.get('address', '')
-            phone = business.get('phone', '')
-            email = business.get('email', '')
-            contact_name = business.get('contact_name', '')
-            location = business.get('location', '')
-            source = business.get('source', 'import')
+        duplicates = deduplicator.stats()['duplicates']
+        if duplicates:
+            logger.info(f"Skipped {duplicates} duplicate businesses in {data_file}")
+        logger.info(f"Imported {count} new businesses from {data_file}")
+        return count
+    
+    def import_leads(self, leads):
+        """
+        Stream leads straight into the database, e.g. from BusinessFinder.iter_businesses.
+        
+        Businesses with websites are skipped and existing businesses (same
+        name and phone) are updated, committed batch by batch. Leads
+        without coordinates are geocoded from the local postcode index.
+        
+        Args:
+            leads (iterable): Business data dictionaries
             
-            # Check if business already exists
-            cursor.execute(
-                "SELECT id FROM businesses WHERE name = ? AND phone = ?",
-                (name, phone)
-            )
-            existing = cursor.fetchone()
+        Returns:
+            int: Number of new businesses inserted
+        """
+        if self.postcode_index is not None:
+            leads = self.postcode_index.geocode_leads(leads)
             
-            if existing:
-                # Update existing business
-                cursor.execute('''
-                UPDATE businesses 
-                SET category = ?, address = ?, email = ?, contact_name = ?, 
-                    location = ?, source = ?
-                WHERE id = ?
-                ''', (category, address, email, contact_name, location, source, existing[0]))
-                logger.info(f"Updated existing business: {name}")
-            else:
-                # Insert new business
-                cursor.execute('''
-                INSERT INTO businesses 
-                (name, category, address, phone, email, contact_name, location, source)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (name, category, address, phone, email, contact_name, location, source))
-                count += 1
-                logger.info(f"Imported new business: {name}")
+        with BusinessSink(self.db_path) as sink:
+            sink.write_all(leads)
+            
+        stats = sink.stats()
+        logger.info(f"Inserted {stats['inserted']} and updated {stats['updated']} businesses")
+        return stats['inserted']
+    
+    def enrich_businesses(self, registry_file, columns=None):
+        """
+        Fill missing email, contact name and phone from a local registry dump.
         
-        conn.commit()
-        conn.close()
+        Businesses missing any of those fields are loaded once and joined
+        against the registry in a single streaming pass (see RegistryEnricher);
+        the filled values are written back in one transaction.
         
-        logger.info(f"Imported {count} new businesses from {data_file}")
-        return count
+        Args:
+            registry_file (str): Registry CSV, e.g. a Companies House bulk download
+            columns (dict): Optional registry column names (see RegistryEnricher)
+            
+        Returns:
+            dict: Match statistics
+        """
+        cursor = self.db.connection().cursor()
+        cursor.row_factory = sqlite3.Row
+        
+        cursor.execute('''
+        SELECT id, name, address, phone, email, contact_name FROM businesses
+        WHERE COALESCE(email, '') = '' OR COALESCE(contact_name, '') = '' OR COALESCE(phone, '') = ''
+        ''')
+        businesses = [dict(row) for row in cursor.fetchall()]
+        
+        # The registry scan runs outside the transaction, so other writers are not held up
+        enricher = RegistryEnricher(registry_file, columns=columns)
+        enriched = enricher.enrich(businesses)
+        
+        with self.db.transaction() as conn:
+            conn.executemany('''
+            UPDATE businesses SET email = ?, contact_name = ?, phone = ? WHERE id = ?
+            ''', [(b['email'], b['contact_name'], b['phone'], b['id']) for b in enriched])
+        
+        stats = enricher.stats()
+        logger.info(f"Enriched {stats['matched']} of {stats['candidates']} businesses from {registry_file}")
+        return stats
     
     def create_campaign(self, name, description, template_name):
         """
@@ -236,112 +190,124 @@ class OutreachAutomation:
         Returns:
             int: Campaign ID
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        INSERT INTO campaigns (name, description, template_name, status)
-        VALUES (?, ?, ?, 'draft')
-        ''', (name, description, template_name))
-        
-        campaign_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+            INSERT INTO campaigns (name, description, template_name, status)
+            VALUES (?, ?, ?, 'draft')
+            ''', (name, description, template_name))
+            
+            campaign_id = cursor.lastrowid
         
         logger.info(f"Created campaign: {name} (ID: {campaign_id})")
         return campaign_id
     
-    def add_businesses_to_campaign(self, campaign_id, business_ids=None, filters=None):
+    def add_businesses_to_campaign(self, campaign_id, business_ids=None, filters=None, top=None):
         """
         Add businesses to a campaign based on IDs or filters.
         
         Args:
             campaign_id (int): Campaign ID
             business_ids (list): List of business IDs to add
-            filters (dict): Filters to select businesses
+            filters (dict): Filters to select businesses: 'category' and 'location'
+                            (substring), 'near' ({'lat', 'lng', 'radius_km'}) and
+                            'polygon' ([[lat, lng], ...])
+            top (int): Only add the N highest-priority businesses (see tools.lead_scoring)
             
         Returns:
             int: Number of businesses added
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Verify campaign exists
-        cursor.execute("SELECT id FROM campaigns WHERE id = ?", (campaign_id,))
-        if not cursor.fetchone():
-            logger.error(f"Campaign not found: {campaign_id}")
-            conn.close()
-            return 0
-        
-        # Get businesses to add
-        if business_ids:
-            # Add specific businesses
-            placeholders = ','.join(['?'] * len(business_ids))
-            cursor.execute(
-                f"SELECT id, name FROM businesses WHERE id IN ({placeholders})",
-                business_ids
-            )
-        elif filters:
-            # Add businesses based on filters
-            query = "SELECT id, name FROM businesses WHERE 1=1"
-            params = []
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
             
-            if 'category' in filters:
-                query += " AND category LIKE ?"
-                params.append(f"%{filters['category']}%")
+            # Verify campaign exists
+            cursor.execute("SELECT id FROM campaigns WHERE id = ?", (campaign_id,))
+            if not cursor.fetchone():
+                logger.error(f"Campaign not found: {campaign_id}")
+                return 0
             
-            if 'location' in filters:
-                query += " AND location LIKE ?"
-                params.append(f"%{filters['location']}%")
+            # Get businesses to add
+            columns = "b.id, b.name, b.category, b.rating, b.review_count, b.latitude, b.longitude, b.date_added"
+            area = None
+            if business_ids:
+                # Add specific businesses
+                placeholders = ','.join(['?'] * len(business_ids))
+                cursor.execute(
+                    f"SELECT {columns} FROM businesses b WHERE b.id IN ({placeholders})",
+                    business_ids
+                )
+            elif filters:
+                # Add businesses based on filters
+                area = AreaFilter.from_filters(filters)
+                join, where, params = area.sql(cursor) if area else ('', '', [])
+                
+                query = f"SELECT {columns} FROM businesses b{join} WHERE 1=1{where}"
+                
+                if 'category' in filters:
+                    query += " AND b.category LIKE ?"
+                    params.append(f"%{filters['category']}%")
+                
+                if 'location' in filters:
+                    query += " AND b.location LIKE ?"
+                    params.append(f"%{filters['location']}%")
+                
+                cursor.execute(query, params)
+            else:
+                # Add all businesses
+                cursor.execute(f"SELECT {columns} FROM businesses b")
             
-            cursor.execute(query, params)
-        else:
-            # Add all businesses
-            cursor.execute("SELECT id, name FROM businesses")
-        
-        businesses = cursor.fetchall()
-        
-        # Generate emails for each business
-        count = 0
-        for business_id, business_name in businesses:
-            # Check if business already has an email in this campaign
-            cursor.execute(
-                "SELECT id FROM emails WHERE business_id = ? AND campaign_id = ?",
-                (business_id, campaign_id)
-            )
-            if cursor.fetchone():
-                logger.info(f"Business already in campaign: {business_name}")
-                continue
+            fields = ['id', 'name', 'category', 'rating', 'review_count', 'latitude', 'longitude', 'date_added']
+            businesses = [dict(zip(fields, row)) for row in cursor.fetchall()]
             
-            # Add initial email
-            cursor.execute('''
-            INSERT INTO emails 
-            (business_id, campaign_id, email_type, status)
-            VALUES (?, ?, 'initial', 'pending')
-            ''', (business_id, campaign_id))
+            # The index only narrows to a bounding box; apply the exact area test
+            if area is not None:
+                businesses = [b for b in businesses if area.contains(b['latitude'], b['longitude'])]
+            
+            # Keep the highest-priority businesses, best first
+            if top:
+                near = (filters or {}).get('near')
+                origin = (float(near['lat']), float(near['lng'])) if near else None
+                businesses = LeadScorer(origin=origin).top_k(businesses, top)
+            
+            # Generate emails for each business
+            count = 0
+            for business in businesses:
+                business_id, business_name = business['id'], business['name']
+                
+                # Check if business already has an email in this campaign
+                cursor.execute(CAMPAIGN_MEMBERSHIP_QUERY, (business_id, campaign_id))
+                if cursor.fetchone():
+                    logger.info(f"Business already in campaign: {business_name}")
+                    continue
+                
+                # Add initial email
+                cursor.execute('''
+                INSERT INTO emails 
+                (business_id, campaign_id, email_type, status)
+                VALUES (?, ?, 'initial', 'pending')
+                ''', (business_id, campaign_id))
+                
+                count += 1
+                logger.info(f"Added business to campaign: {business_name}")
             
-            count += 1
-            logger.info(f"Added business to campaign: {business_name}")
-        
-        conn.commit()
-        conn.close()
-        
         logger.info(f"Added {count} businesses to campaign {campaign_id}")
         return count
     
-    def generate_campaign_emails(self, campaign_id, from_outreach_generator=True):
+    def generate_campaign_emails(self, campaign_id, from_outreach_generator=True, prebuild_mime=False):
         """
         Generate email content for all businesses in a campaign.
         
         Args:
             campaign_id (int): Campaign ID
             from_outreach_generator (bool): Whether to use OutreachGenerator
+            prebuild_mime (bool): Also store the final MIME bytes of each email
+                                  (see prebuild_campaign_payloads)
             
         Returns:
             int: Number of emails generated
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.db.connection().cursor()
         
         # Get campaign details
         cursor.execute(
@@ -351,7 +317,6 @@ class OutreachAutomation:
         campaign = cursor.fetchone()
         if not campaign:
             logger.error(f"Campaign not found: {campaign_id}")
-            conn.close()
             return 0
         
         campaign_name, template_name = campaign
@@ -367,10 +332,11 @@ class OutreachAutomation:
         emails = cursor.fetchall()
         if not emails:
             logger.info(f"No pending emails found for campaign {campaign_id}")
-            conn.close()
             return 0
         
-        count = 0
+        # Render every email before taking the write lock, so other writers
+        # only wait for the final batch update
+        updates = []
         
         if from_outreach_generator:
             # Use OutreachGenerator to generate email content
@@ -408,48 +374,77 @@ class OutreachAutomation:
                             subject = line.replace('Subject:', '').strip()
                             break
                     
-                    # Update email in database
-                    cursor.execute('''
-                    UPDATE emails
-                    SET subject = ?, content = ?
-                    WHERE id = ?
-                    ''', (subject, email_content, email_id))
-                    
-                    count += 1
+                    updates.append((subject, email_content, email_id))
                     logger.info(f"Generated email for {name} in campaign {campaign_name}")
                 
             except ImportError as e:
                 logger.error(f"Failed to import OutreachGenerator: {e}")
                 # Fall back to simple templates
-                for email_id, business_id, email_type, name, category, location, contact_name in emails:
-                    subject = f"Website for {name}"
-                    content = f"Dear {contact_name or 'Business Owner'},\n\nThis is a placeholder email for {name}.\n\nBest regards,\nYour Name"
-                    
-                    cursor.execute('''
-                    UPDATE emails
-                    SET subject = ?, content = ?
-                    WHERE id = ?
-                    ''', (subject, content, email_id))
-                    
-                    count += 1
-        else:
+                from_outreach_generator = False
+        
+        if not from_outreach_generator:
             # Use simple templates
             for email_id, business_id, email_type, name, category, location, contact_name in emails:
                 subject = f"Website for {name}"
                 content = f"Dear {contact_name or 'Business Owner'},\n\nThis is a placeholder email for {name}.\n\nBest regards,\nYour Name"
-                
-                cursor.execute('''
-                UPDATE emails
-                SET subject = ?, content = ?
-                WHERE id = ?
-                ''', (subject, content, email_id))
-                
-                count += 1
+                updates.append((subject, content, email_id))
         
-        conn.commit()
-        conn.close()
+        # Emails filled in by another process meanwhile keep their content
+        with self.db.transaction() as conn:
+            count = conn.executemany('''
+            UPDATE emails
+            SET subject = ?, content = ?
+            WHERE id = ? AND content IS NULL
+            ''', updates).rowcount
         
         logger.info(f"Generated {count} emails for campaign {campaign_id}")
+        
+        if prebuild_mime:
+            self.prebuild_campaign_payloads(campaign_id)
+        return count
+    
+    def prebuild_campaign_payloads(self, campaign_id):
+        """
+        Serialize the generated emails of a campaign into send-ready MIME bytes.
+        
+        Each unsent email with content and a recipient address gets a tracking
+        ID, a Message-ID and its compressed RFC 5322 payload, so sending it
+        later needs no MIME construction.
+        
+        Args:
+            campaign_id (int): Campaign ID
+            
+        Returns:
+            int: Number of payloads built
+        """
+        from_email = self.email_config.get('from_email', self.email_config.get('smtp_username', ''))
+        if not from_email:
+            logger.error("Email configuration not set; cannot pre-build MIME payloads")
+            return 0
+        builder = PayloadBuilder(from_email, self.email_config.get('reply_to'))
+        
+        cursor = self.db.connection().cursor()
+        cursor.execute('''
+        SELECT e.id, e.subject, e.content, e.tracking_id, b.email
+        FROM emails e
+        JOIN businesses b ON e.business_id = b.id
+        WHERE e.campaign_id = ? AND e.content IS NOT NULL AND e.mime_payload IS NULL
+          AND e.status IN ('pending', 'scheduled') AND COALESCE(b.email, '') != ''
+        ''', (campaign_id,))
+        
+        # Serialize outside the write transaction; only the batch update holds the lock
+        updates = []
+        for email_id, subject, content, tracking_id, business_email in cursor.fetchall():
+            tracking_id, message_id, payload = builder.build(business_email, subject, content, tracking_id)
+            updates.append((tracking_id, message_id, payload, email_id))
+        
+        with self.db.transaction() as conn:
+            count = conn.executemany('''
+            UPDATE emails SET tracking_id = ?, message_id = ?, mime_payload = ?
+            WHERE id = ? AND mime_payload IS NULL
+            ''', updates).rowcount
+        
+        logger.info(f"Pre-built {count} MIME payloads for campaign {campaign_id}")
         return count
     
     def schedule_campaign(self, campaign_id, start_date=None, emails_per_day=10, follow_up_days=7):
@@ -468,70 +463,63 @@ class OutreachAutomation:
         if start_date is None:
             start_date = datetime.now()
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Update campaign status
-        cursor.execute('''
-        UPDATE campaigns
-        SET status = 'scheduled', date_started = ?
-        WHERE id = ?
-        ''', (start_date, campaign_id))
-        
-        # Get all pending emails for this campaign
-        cursor.execute('''
-        SELECT id FROM emails
-        WHERE campaign_id = ? AND status = 'pending' AND scheduled_time IS NULL
-        ''', (campaign_id,))
-        
-        emails = cursor.fetchall()
-        if not emails:
-            logger.info(f"No pending emails found for campaign {campaign_id}")
-            conn.close()
-            return 0
-        
-        # Schedule emails
-        current_date = start_date
-        count = 0
-        
-        for i, (email_id,) in enumerate(emails):
-            # Calculate scheduled time
-            day_offset = i // emails_per_day
-            scheduled_time = current_date + timedelta(days=day_offset)
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
+            
+            # Get all pending emails for this campaign
+            cursor.execute(CAMPAIGN_PENDING_EMAILS_QUERY, (campaign_id,))
             
-            # Update email with scheduled time
+            emails = cursor.fetchall()
+            if not emails:
+                logger.info(f"No pending emails found for campaign {campaign_id}")
+                return 0
+            
+            # Update campaign status
             cursor.execute('''
-            UPDATE emails
-            SET scheduled_time = ?, status = 'scheduled'
+            UPDATE campaigns
+            SET status = 'scheduled', date_started = ?
             WHERE id = ?
-            ''', (scheduled_time, email_id))
+            ''', (start_date, campaign_id))
             
-            count += 1
-        
-        # Schedule follow-up emails
-        cursor.execute('''
-        SELECT e.id, e.business_id
-        FROM emails e
-        WHERE e.campaign_id = ? AND e.email_type = 'initial' AND e.status = 'scheduled'
-        ''', (campaign_id,))
-        
-        initial_emails = cursor.fetchall()
-        
-        for email_id, business_id in initial_emails:
-            # Schedule follow-up email
-            follow_up_time = start_date + timedelta(days=follow_up_days)
+            # Schedule emails
+            current_date = start_date
+            count = 0
+            
+            for i, (email_id,) in enumerate(emails):
+                # Calculate scheduled time
+                day_offset = i // emails_per_day
+                scheduled_time = current_date + timedelta(days=day_offset)
+                
+                # Update email with scheduled time
+                cursor.execute('''
+                UPDATE emails
+                SET scheduled_time = ?, status = 'scheduled'
+                WHERE id = ?
+                ''', (scheduled_time, email_id))
+                
+                count += 1
             
+            # Schedule follow-up emails
             cursor.execute('''
-            INSERT INTO emails 
-            (business_id, campaign_id, email_type, status, scheduled_time)
-            VALUES (?, ?, 'follow_up', 'scheduled', ?)
-            ''', (business_id, campaign_id, follow_up_time))
+            SELECT e.id, e.business_id
+            FROM emails e
+            WHERE e.campaign_id = ? AND e.email_type = 'initial' AND e.status = 'scheduled'
+            ''', (campaign_id,))
+            
+            initial_emails = cursor.fetchall()
+            
+            for email_id, business_id in initial_emails:
+                # Schedule follow-up email
+                follow_up_time = start_date + timedelta(days=follow_up_days)
+                
+                cursor.execute('''
+                INSERT INTO emails 
+                (business_id, campaign_id, email_type, status, scheduled_time)
+                VALUES (?, ?, 'follow_up', 'scheduled', ?)
+                ''', (business_id, campaign_id, follow_up_time))
+                
+                count += 1
             
-            count += 1
-        
-        conn.commit()
-        conn.close()
-        
         logger.info(f"Scheduled {count} emails for campaign {campaign_id}")
         return count
     
@@ -546,28 +534,24 @@ class OutreachAutomation:
             logger.error("Email configuration not set")
             return 0
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.db.connection().cursor()
         
         # Get scheduled emails that are due
         now = datetime.now()
-        cursor.execute('''
-        SELECT e.id, e.subject, e.content, b.name, b.email
-        FROM emails e
-        JOIN businesses b ON e.business_id = b.id
-        WHERE e.status = 'scheduled' AND e.scheduled_time <= ? AND e.content IS NOT NULL
-        ''', (now,))
+        cursor.execute(SCHEDULED_EMAILS_QUERY, (now,))
         
         emails = cursor.fetchall()
         if not emails:
             logger.info("No scheduled emails due")
-            conn.close()
             return 0
         
-        # Send emails
-        count = 0
+        # Send emails outside any transaction, so the dashboard can keep writing
+        # while SMTP is slow; pre-built payloads share one SMTP connection
+        sent_ids = []
+        failed_ids = []
+        server = None
         
-        for email_id, subject, content, business_name, business_email in emails:
+        for email_id, subject, content, payload, business_name, business_email in emails:
             # Skip if no email address
             if not business_email:
                 logger.warning(f"No email address for {business_name}, skipping")
@@ -575,39 +559,48 @@ class OutreachAutomation:
             
             # Send email
             try:
-                self._send_email(business_email, subject, content)
-                
-                # Update email status
-                cursor.execute('''
-                UPDATE emails
-                SET status = 'sent', sent_time = ?
-                WHERE id = ?
-                ''', (now, email_id))
+                if payload is not None:
+                    if server is None:
+                        server = self._connect_smtp()
+                    self._send_payload(server, business_email, payload)
+                else:
+                    self._send_email(business_email, subject, content)
                 
-                count += 1
+                sent_ids.append(email_id)
                 logger.info(f"Sent email to {business_name} <{business_email}>")
                 
             except Exception as e:
                 logger.error(f"Failed to send email to {business_name}: {e}")
-                
-                # Update email status
-                cursor.execute('''
-                UPDATE emails
-                SET status = 'failed'
-                WHERE id = ?
-                ''', (email_id,))
+                if isinstance(e, smtplib.SMTPServerDisconnected):
+                    server = None
+                failed_ids.append(email_id)
         
-        # Update campaign analytics
-        cursor.execute('''
-        UPDATE analytics
-        SET sent_count = sent_count + ?
-        WHERE campaign_id IN (
-            SELECT DISTINCT campaign_id FROM emails WHERE id IN (?)
-        )
-        ''', (count, ','.join([str(e[0]) for e in emails])))
+        if server is not None:
+            server.quit()
         
-        conn.commit()
-        conn.close()
+        count = len(sent_ids)
+        with self.db.transaction() as conn:
+            # Update email statuses
+            conn.executemany('''
+            UPDATE emails
+            SET status = 'sent', sent_time = ?
+            WHERE id = ?
+            ''', [(now, email_id) for email_id in sent_ids])
+            
+            conn.executemany('''
+            UPDATE emails
+            SET status = 'failed'
+            WHERE id = ?
+            ''', [(email_id,) for email_id in failed_ids])
+            
+            # Update campaign analytics
+            conn.execute('''
+            UPDATE analytics
+            SET sent_count = sent_count + ?
+            WHERE campaign_id IN (
+                SELECT DISTINCT campaign_id FROM emails WHERE id IN (?)
+            )
+            ''', (count, ','.join([str(e[0]) for e in emails])))
         
         logger.info(f"Sent {count} scheduled emails")
         return count
@@ -629,12 +622,7 @@ class OutreachAutomation:
             logger.error("Email configuration not set")
             return False
         
-        # Extract SMTP settings
-        smtp_server = self.email_config.get('smtp_server', 'smtp.gmail.com')
-        smtp_port = self.email_config.get('smtp_port', 587)
-        smtp_username = self.email_config.get('smtp_username', '')
-        smtp_password = self.email_config.get('smtp_password', '')
-        from_email = self.email_config.get('from_email', smtp_username)
+        from_email = self.email_config.get('from_email', self.email_config.get('smtp_username', ''))
         
         # Create message
         msg = MIMEMultipart()
@@ -647,9 +635,7 @@ class OutreachAutomation:
         
         # Send email
         try:
-            server = smtplib.SMTP(smtp_server, smtp_port)
-            server.starttls()
-            server.login(smtp_username, smtp_password)
+            server = self._connect_smtp()
             server.send_message(msg)
             server.quit()
             return True
@@ -657,6 +643,38 @@ class OutreachAutomation:
             logger.error(f"Failed to send email: {e}")
             return False
     
+    def _connect_smtp(self):
+        """
+        Open an authenticated SMTP connection from the email configuration.
+        
+        Returns:
+            smtplib.SMTP: Connected server
+        """
+        smtp_server = self.email_config.get('smtp_server', 'smtp.gmail.com')
+        smtp_port = self.email_config.get('smtp_port', 587)
+        smtp_username = self.email_config.get('smtp_username', '')
+        smtp_password = self.email_config.get('smtp_password', '')
+        
+        server = smtplib.SMTP(smtp_server, smtp_port)
+        server.starttls()
+        server.login(smtp_username, smtp_password)
+        return server
+    
+    def _send_payload(self, server, to_email, payload):
+        """
+        Send a pre-built MIME payload over an open SMTP connection.
+        
+        The stored bytes are sent as they are, behind a fresh Date header.
+        
+        Args:
+            server (smtplib.SMTP): Connected server
+            to_email (str): Recipient email address
+            payload (bytes): Compressed payload from prebuild_campaign_payloads
+        """
+        from_email = self.email_config.get('from_email', self.email_config.get('smtp_username', ''))
+        envelope_from = parseaddr(from_email)[1]
+        server.sendmail(envelope_from, [to_email], date_header() + decompress_payload(payload))
+    
     def start_scheduler(self):
         """Start the scheduler to send emails automatically."""
         if self.scheduler_running:
@@ -694,76 +712,58 @@ class OutreachAutomation:
     
     def update_analytics(self):
         """Update analytics for all campaigns."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get all active campaigns
-        cursor.execute('''
-        SELECT id, name FROM campaigns
-        WHERE status IN ('scheduled', 'active', 'running')
-        ''')
-        
-        campaigns = cursor.fetchall()
-        if not campaigns:
-            logger.info("No active campaigns for analytics update")
-            conn.close()
-            return
-        
-        for campaign_id, campaign_name in campaigns:
-            # Count emails by status
-            cursor.execute('''
-            SELECT 
-                COUNT(CASE WHEN status = 'sent' THEN 1 END) as sent,
-                COUNT(CASE WHEN opened_time IS NOT NULL THEN 1 END) as opened,
-                COUNT(CASE WHEN clicked_time IS NOT NULL THEN 1 END) as clicked,
-                COUNT(CASE WHEN replied_time IS NOT NULL THEN 1 END) as replied
-            FROM emails
-            WHERE campaign_id = ?
-            ''', (campaign_id,))
-            
-            counts = cursor.fetchone()
-            if not counts:
-                continue
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
             
-            sent, opened, clicked, replied = counts
-            
-            # Count appointments
+            # Get all active campaigns
             cursor.execute('''
-            SELECT COUNT(*) FROM appointments
-            WHERE campaign_id = ?
-            ''', (campaign_id,))
-            
-            appointments = cursor.fetchone()[0]
+            SELECT id, name FROM campaigns
+            WHERE status IN ('scheduled', 'active', 'running')
+            ''')
             
-            # Check if analytics entry exists
-            cursor.execute('''
-            SELECT id FROM analytics
-            WHERE campaign_id = ? AND date >= date('now', 'start of day')
-            ''', (campaign_id,))
+            campaigns = cursor.fetchall()
+            if not campaigns:
+                logger.info("No active campaigns for analytics update")
+                return
             
-            analytics_id = cursor.fetchone()
-            
-            if analytics_id:
-                # Update existing entry
-                cursor.execute('''
-                UPDATE analytics
-                SET sent_count = ?, open_count = ?, click_count = ?, 
-                    reply_count = ?, appointment_count = ?
-                WHERE id = ?
-                ''', (sent, opened, clicked, replied, appointments, analytics_id[0]))
-            else:
-                # Create new entry
-                cursor.execute('''
-                INSERT INTO analytics
-                (campaign_id, sent_count, open_count, click_count, reply_count, appointment_count)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ''', (campaign_id, sent, opened, clicked, replied, appointments))
+            for campaign_id, campaign_name in campaigns:
+                # Count emails by status
+                cursor.execute(CAMPAIGN_ENGAGEMENT_COUNTS_QUERY, (campaign_id,))
+                
+                counts = cursor.fetchone()
+                if not counts:
+                    continue
+                
+                sent, opened, clicked, replied = counts
+                
+                # Count appointments
+                cursor.execute(CAMPAIGN_APPOINTMENT_COUNT_QUERY, (campaign_id,))
+                
+                appointments = cursor.fetchone()[0]
+                
+                # Check if analytics entry exists
+                cursor.execute(DAILY_CAMPAIGN_ANALYTICS_QUERY, (campaign_id,))
+                
+                analytics_id = cursor.fetchone()
+                
+                if analytics_id:
+                    # Update existing entry
+                    cursor.execute('''
+                    UPDATE analytics
+                    SET sent_count = ?, open_count = ?, click_count = ?, 
+                        reply_count = ?, appointment_count = ?
+                    WHERE id = ?
+                    ''', (sent, opened, clicked, replied, appointments, analytics_id[0]))
+                else:
+                    # Create new entry
+                    cursor.execute('''
+                    INSERT INTO analytics
+                    (campaign_id, sent_count, open_count, click_count, reply_count, appointment_count)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ''', (campaign_id, sent, opened, clicked, replied, appointments))
+                
+                logger.info(f"Updated analytics for campaign {campaign_name}")
             
-            logger.info(f"Updated analytics for campaign {campaign_name}")
-        
-        conn.commit()
-        conn.close()
-        
         logger.info(f"Analytics updated for {len(campaigns)} campaigns")
     
     def get_campaign_stats(self, campaign_id):
@@ -776,7 +776,7 @@ class OutreachAutomation:
         Returns:
             dict: Campaign statistics
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self.db.connection()
         cursor = conn.cursor()
         
         # Get campaign details
@@ -789,33 +789,17 @@ class OutreachAutomation:
         campaign = cursor.fetchone()
         if not campaign:
             logger.error(f"Campaign not found: {campaign_id}")
-            conn.close()
             return {}
         
         name, status, date_created, date_started, date_completed = campaign
         
         # Get email counts
-        cursor.execute('''
-        SELECT 
-            COUNT(*) as total,
-            COUNT(CASE WHEN status = 'pending' THEN 1 END) as pending,
-            COUNT(CASE WHEN status = 'scheduled' THEN 1 END) as scheduled,
-            COUNT(CASE WHEN status = 'sent' THEN 1 END) as sent,
-            COUNT(CASE WHEN status = 'failed' THEN 1 END) as failed,
-            COUNT(CASE WHEN opened_time IS NOT NULL THEN 1 END) as opened,
-            COUNT(CASE WHEN clicked_time IS NOT NULL THEN 1 END) as clicked,
-            COUNT(CASE WHEN replied_time IS NOT NULL THEN 1 END) as replied
-        FROM emails
-        WHERE campaign_id = ?
-        ''', (campaign_id,))
+        cursor.execute(CAMPAIGN_EMAIL_COUNTS_QUERY, (campaign_id,))
         
         email_counts = cursor.fetchone()
         
         # Get appointment count
-        cursor.execute('''
-        SELECT COUNT(*) FROM appointments
-        WHERE campaign_id = ?
-        ''', (campaign_id,))
+        cursor.execute(CAMPAIGN_APPOINTMENT_COUNT_QUERY, (campaign_id,))
         
         appointment_count = cursor.fetchone()[0]
         
@@ -855,7 +839,6 @@ class OutreachAutomation:
             }
         }
         
-        conn.close()
         return stats
     
     def get_all_campaigns(self):
@@ -865,7 +848,7 @@ class OutreachAutomation:
         Returns:
             list: List of campaign dictionaries
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self.db.connection()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -896,7 +879,6 @@ class OutreachAutomation:
                 'sent_emails': sent
             })
         
-        conn.close()
         return campaigns
     
     def get_business_details(self, business_id):
@@ -909,7 +891,7 @@ class OutreachAutomation:
         Returns:
             dict: Business details
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self.db.connection()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -921,17 +903,10 @@ class OutreachAutomation:
         business = cursor.fetchone()
         if not business:
             logger.error(f"Business not found: {business_id}")
-            conn.close()
             return {}
         
         # Get email history
-        cursor.execute('''
-        SELECT e.id, e.campaign_id, c.name, e.email_type, e.status, e.sent_time, e.opened_time, e.replied_time
-        FROM emails e
-        JOIN campaigns c ON e.campaign_id = c.id
-        WHERE e.business_id = ?
-        ORDER BY e.sent_time DESC
-        ''', (business_id,))
+        cursor.execute(BUSINESS_EMAILS_QUERY, (business_id,))
         
         emails = []
         for email_id, campaign_id, campaign_name, email_type, status, sent_time, opened_time, replied_time in cursor.fetchall():
@@ -947,12 +922,7 @@ class OutreachAutomation:
             })
         
         # Get appointment history
-        cursor.execute('''
-        SELECT id, campaign_id, status, scheduled_time, notes
-        FROM appointments
-        WHERE business_id = ?
-        ORDER BY scheduled_time DESC
-        ''', (business_id,))
+        cursor.execute(BUSINESS_APPOINTMENTS_QUERY, (business_id,))
         
         appointments = []
         for appointment_id, campaign_id, status, scheduled_time, notes in cursor.fetchall():
@@ -980,7 +950,6 @@ class OutreachAutomation:
             'appointments': appointments
         }
         
-        conn.close()
         return details
     
     def add_appointment(self, business_id, campaign_id, scheduled_time, notes=None, calendly_link=None):
@@ -997,18 +966,16 @@ class OutreachAutomation:
         Returns:
             int: Appointment ID
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        INSERT INTO appointments
-        (business_id, campaign_id, status, scheduled_time, notes, calendly_link)
-        VALUES (?, ?, 'scheduled', ?, ?, ?)
-        ''', (business_id, campaign_id, scheduled_time, notes, calendly_link))
-        
-        appointment_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+            INSERT INTO appointments
+            (business_id, campaign_id, status, scheduled_time, notes, calendly_link)
+            VALUES (?, ?, 'scheduled', ?, ?, ?)
+            ''', (business_id, campaign_id, scheduled_time, notes, calendly_link))
+            
+            appointment_id = cursor.lastrowid
         
         logger.info(f"Added appointment for business {business_id} in campaign {campaign_id}")
         return appointment_id
@@ -1041,14 +1008,41 @@ def main():
             print(f"Imported {count} businesses from {data_file}")
             return
         
+        elif sys.argv[1] == 'enrich' and len(sys.argv) > 2:
+            # Fill missing contact details from a registry dump
+            registry_file = sys.argv[2]
+            stats = automation.enrich_businesses(registry_file)
+            print_enrichment_stats(stats)
+            return
+        
         elif sys.argv[1] == 'create-campaign' and len(sys.argv) > 3:
-            # Create a new campaign
-            name = sys.argv[2]
-            description = sys.argv[3]
-            template = sys.argv[4] if len(sys.argv) > 4 else 'initial_contact.txt'
+            # Create a new campaign, optionally seeded with the top N businesses
+            args = sys.argv[2:]
+            top = None
+            if '--top' in args:
+                i = args.index('--top')
+                top = int(args[i + 1])
+                del args[i:i + 2]
+            
+            name = args[0]
+            description = args[1]
+            template = args[2] if len(args) > 2 else 'initial_contact.txt'
             
             campaign_id = automation.create_campaign(name, description, template)
             print(f"Created campaign: {name} (ID: {campaign_id})")
+            
+            if top:
+                count = automation.add_businesses_to_campaign(campaign_id, top=top)
+                print(f"Added the top {count} businesses to the campaign")
+            return
+        
+        elif sys.argv[1] == 'generate' and len(sys.argv) > 2:
+            # Generate campaign emails, optionally pre-building their MIME payloads
+            campaign_id = int(sys.argv[2])
+            prebuild = '--mime' in sys.argv[3:]
+            count = automation.generate_campaign_emails(campaign_id, prebuild_mime=prebuild)
+            print(f"Generated {count} emails for campaign {campaign_id}"
+                  f"{' with pre-built MIME payloads' if prebuild else ''}")
             return
         
         elif sys.argv[1] == 'stats' and len(sys.argv) > 2:
@@ -1073,7 +1067,10 @@ def main():
     # Show example usage
     print("\nExample usage:")
     print("  python outreach_automation.py import /path/to/businesses.csv")
+    print("  python outreach_automation.py enrich /path/to/BasicCompanyData.csv")
     print("  python outreach_automation.py create-campaign 'Campaign Name' 'Campaign Description'")
+    print("  python outreach_automation.py create-campaign 'Campaign Name' 'Campaign Description' --top 100")
+    print("  python outreach_automation.py generate 1 --mime")
     print("  python outreach_automation.py stats 1")
     
     print("\nFor programmatic usage, see the OutreachAutomation class documentation.")
@@ -8,6 +8,7 @@ This script provides a command-line interface for the OutreachGenerator tool.
 import argparse
 import sys
 import os
+import time
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from outreach.outreach_generator import OutreachGenerator
 
@@ -16,7 +17,7 @@ def parse_arguments():
     parser = argparse.ArgumentParser(description='Generate personalized outreach emails for businesses without websites.')
     
     parser.add_argument('--input-file', '-i', type=str, required=True,
-                        help='Path to CSV or JSON file containing business data')
+                        help='Path to CSV, JSON or NDJSON file (optionally gzipped) containing business data')
     
     parser.add_argument('--template', '-t', type=str, default='initial_contact.txt',
                         choices=['initial_contact.txt', 'follow_up.txt', 'value_proposition.txt'],
@@ -28,6 +29,15 @@ def parse_arguments():
     parser.add_argument('--list-templates', '-l', action='store_true',
                         help='List available email templates')
     
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='Worker processes rendering emails in parallel (default: 1)')
+    
+    parser.add_argument('--chunk-size', type=int, default=500,
+                        help='Businesses rendered per chunk (default: 500)')
+    
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Seed for reproducible custom benefits/features')
+    
     return parser.parse_args()
 
 def main():
@@ -35,7 +45,7 @@ def main():
     args = parse_arguments()
     
     # Initialize the OutreachGenerator
-    generator = OutreachGenerator()
+    generator = OutreachGenerator(seed=args.seed)
     
     # List templates if requested
     if args.list_templates:
@@ -49,38 +59,40 @@ def main():
         print(f"Error: Input file '{args.input_file}' not found.")
         return
     
-    # Load business data from input file
-    print(f"Loading business data from {args.input_file}...")
-    if args.input_file.endswith('.csv'):
-        businesses = generator.load_businesses_from_csv(args.input_file)
-    elif args.input_file.endswith('.json'):
-        businesses = generator.load_businesses_from_json(args.input_file)
-    else:
-        print("Error: Input file must be CSV or JSON format.")
-        return
-    
-    if not businesses:
-        print("No business data found in the input file.")
+    # Stream business data from the input file; nothing is loaded up front
+    print(f"Reading business data from {args.input_file}...")
+    try:
+        businesses = generator.iter_businesses_from_file(args.input_file)
+    except ValueError:
+        print("Error: Input file must be CSV, JSON or NDJSON format (optionally gzipped).")
         return
     
-    print(f"Loaded {len(businesses)} businesses.")
+    # Generate emails, streaming each chunk to disk as it is rendered
+    print(f"Generating personalized emails using template '{args.template}' "
+          f"({args.workers} worker{'s' if args.workers != 1 else ''}, chunks of {args.chunk_size})...")
+    campaign_name = args.campaign or f"campaign_{os.path.basename(args.input_file).split('.')[0]}"
     
-    # Generate emails
-    print(f"Generating personalized emails using template '{args.template}'...")
-    emails = generator.generate_batch_emails(businesses, args.template)
+    start = time.time()
+    emails = generator.iter_emails(businesses, args.template, workers=args.workers, chunk_size=args.chunk_size)
+    saved_ids = generator.save_batch_emails(emails, campaign_name=campaign_name)
+    generator.close()
+    elapsed = max(time.time() - start, 1e-9)
     
-    # Save the generated emails
-    campaign_name = args.campaign or f"campaign_{os.path.basename(args.input_file).split('.')[0]}"
-    saved_files = generator.save_batch_emails(emails, campaign_name=campaign_name)
+    if not saved_ids:
+        print("No business data found in the input file.")
+        return
     
-    print(f"Generated and saved {len(saved_files)} emails:")
-    for filepath in saved_files[:5]:  # Show first 5 files
-        print(f"  - {filepath}")
+    print(f"Generated and saved {len(saved_ids)} emails in {elapsed:.1f}s "
+          f"({len(saved_ids) / elapsed:,.0f} emails/s):")
+    for key in saved_ids[:5]:  # Show first 5 businesses
+        print(f"  - {key}")
     
-    if len(saved_files) > 5:
-        print(f"  ... and {len(saved_files) - 5} more.")
+    if len(saved_ids) > 5:
+        print(f"  ... and {len(saved_ids) - 5} more.")
     
-    print(f"\nAll emails saved to: {os.path.dirname(saved_files[0])}")
+    campaign_dir = generator.campaign_dir(campaign_name)
+    print(f"\nAll emails saved to the campaign bundle in: {campaign_dir}")
+    print(f"Read one back with: python outreach/campaign_bundle.py {campaign_dir} <business id>")
     print("Done!")
 
 if __name__ == "__main__":
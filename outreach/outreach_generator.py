@@ -7,35 +7,130 @@ It uses templates and customization based on business data.
 """
 
 import os
-import json
+import sys
 import random
-import pandas as pd
-from datetime import datetime
-from string import Template
+import hashlib
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from outreach.campaign_bundle import CampaignBundle
+from outreach.template_registry import get_registry
+from tools.lead_dedup import normalize_name, normalize_phone
+from tools.lead_reader import infer_read_format, iter_leads
+
+# Category keyword -> custom benefits mentioned in emails (matched as a substring, in order)
+CUSTOM_BENEFITS = {
+    'restaurant': [
+        "Allow customers to view your menu and make reservations online",
+        "Showcase your signature dishes with high-quality photos",
+        "Highlight special events and promotions to drive more bookings",
+        "Enable online ordering for takeaway or delivery services"
+    ],
+    'plumber': [
+        "Let customers request emergency services with a simple online form",
+        "Display testimonials from satisfied customers to build trust",
+        "Showcase your range of services with detailed descriptions",
+        "Allow customers to book appointments online at their convenience"
+    ],
+    'electrician': [
+        "Enable customers to request quotes through an online form",
+        "Showcase your certifications and qualifications prominently",
+        "Display before-and-after photos of your electrical work",
+        "Allow customers to schedule routine maintenance online"
+    ],
+    'hairdresser': [
+        "Let clients book appointments online 24/7",
+        "Showcase your portfolio of styles and transformations",
+        "Promote special offers and loyalty programs",
+        "Allow clients to select their preferred stylist when booking"
+    ],
+    'dentist': [
+        "Enable patients to book appointments and fill forms online",
+        "Showcase before-and-after photos of successful treatments",
+        "Provide educational content about dental health",
+        "Allow patients to request emergency appointments online"
+    ],
+    'mechanic': [
+        "Let customers book service appointments online",
+        "Display testimonials from satisfied customers",
+        "Showcase your specializations and certifications",
+        "Allow customers to request quotes for specific repairs"
+    ],
+    'cleaner': [
+        "Enable customers to book cleaning services online",
+        "Showcase your range of cleaning packages",
+        "Display testimonials from satisfied customers",
+        "Allow customers to specify special cleaning requirements"
+    ],
+    # Default category for any other business type
+    'default': [
+        "Showcase testimonials from satisfied customers",
+        "Display your portfolio of work and achievements",
+        "Highlight your unique selling points and specializations",
+        "Allow customers to contact you easily through online forms"
+    ]
+}
+
+# Category keyword -> custom website features mentioned in emails
+CUSTOM_FEATURES = {
+    'restaurant': [
+        "online reservation",
+        "menu display",
+        "food ordering",
+        "table booking"
+    ],
+    'plumber': [
+        "emergency service request",
+        "appointment scheduling",
+        "quote request",
+        "service area map"
+    ],
+    'electrician': [
+        "emergency callout",
+        "service booking",
+        "quote request",
+        "project gallery"
+    ],
+    'hairdresser': [
+        "appointment booking",
+        "stylist selection",
+        "service pricing",
+        "style gallery"
+    ],
+    'dentist': [
+        "appointment scheduling",
+        "patient form submission",
+        "treatment information",
+        "emergency contact"
+    ],
+    'mechanic': [
+        "service booking",
+        "repair quote request",
+        "service history tracking",
+        "vehicle information storage"
+    ],
+    'cleaner': [
+        "service scheduling",
+        "package selection",
+        "special request submission",
+        "recurring booking"
+    ],
+    # Default category for any other business type
+    'default': [
+        "contact form",
+        "service showcase",
+        "customer testimonial",
+        "appointment booking"
+    ]
+}
 
-class OutreachGenerator:
-    """Tool to generate personalized outreach emails for businesses without websites."""
-    
-    def __init__(self):
-        """Initialize the OutreachGenerator."""
-        self.base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        self.templates_dir = os.path.join(self.base_dir, 'outreach', 'templates')
-        self.output_dir = os.path.join(self.base_dir, 'outreach', 'generated')
-        
-        # Create directories if they don't exist
-        os.makedirs(self.templates_dir, exist_ok=True)
-        os.makedirs(self.output_dir, exist_ok=True)
-        
-        # Initialize with default templates
-        self.create_default_templates()
-        
-        # Load templates
-        self.templates = self.load_templates()
-        
-    def create_default_templates(self):
-        """Create default email templates if they don't exist."""
-        default_templates = {
-            'initial_contact.txt': """Subject: Boost Your Online Presence for ${business_name}
+# Default email templates, written to the templates directory on first use if missing
+DEFAULT_TEMPLATES = {
+    'initial_contact.txt': """Subject: Boost Your Online Presence for ${business_name}
 
 Dear ${contact_name},
 
@@ -59,7 +154,7 @@ Looking forward to potentially working together,
 [Your Name]
 [Your Contact Information]
 """,
-            'follow_up.txt': """Subject: Following Up: Website for ${business_name}
+    'follow_up.txt': """Subject: Following Up: Website for ${business_name}
 
 Dear ${contact_name},
 
@@ -81,7 +176,7 @@ Best regards,
 [Your Name]
 [Your Contact Information]
 """,
-            'value_proposition.txt': """Subject: How ${business_name} Can Benefit from a Professional Website
+    'value_proposition.txt': """Subject: How ${business_name} Can Benefit from a Professional Website
 
 Dear ${contact_name},
 
@@ -114,166 +209,154 @@ Best regards,
 [Your Name]
 [Your Contact Information]
 """
-        }
+}
+
+def resolve_category(business_category):
+    """
+    Map a business category to its benefit/feature pool key.
+    
+    Args:
+        business_category (str): Category as stored on the lead (e.g. 'Italian Restaurant')
         
-        for filename, content in default_templates.items():
-            filepath = os.path.join(self.templates_dir, filename)
-            if not os.path.exists(filepath):
-                with open(filepath, 'w') as f:
-                    f.write(content)
-                print(f"Created default template: {filepath}")
+    Returns:
+        str: Key into CUSTOM_BENEFITS and CUSTOM_FEATURES ('default' if nothing matches)
+    """
+    category = str(business_category or '').lower()
+    for key in CUSTOM_BENEFITS:
+        if key in category:
+            return key
+    return 'default'
+
+@lru_cache(maxsize=4096)
+def category_pools(business_category):
+    """
+    Get the benefit and feature pools for a business category.
     
-    def load_templates(self):
-        """Load all email templates from the templates directory."""
-        templates = {}
-        for filename in os.listdir(self.templates_dir):
-            if filename.endswith('.txt'):
-                filepath = os.path.join(self.templates_dir, filename)
-                with open(filepath, 'r') as f:
-                    templates[filename] = Template(f.read())
-        return templates
-    
-    def generate_custom_benefit(self, business_category):
-        """Generate a custom benefit based on business category."""
-        benefits = {
-            'restaurant': [
-                "Allow customers to view your menu and make reservations online",
-                "Showcase your signature dishes with high-quality photos",
-                "Highlight special events and promotions to drive more bookings",
-                "Enable online ordering for takeaway or delivery services"
-            ],
-            'plumber': [
-                "Let customers request emergency services with a simple online form",
-                "Display testimonials from satisfied customers to build trust",
-                "Showcase your range of services with detailed descriptions",
-                "Allow customers to book appointments online at their convenience"
-            ],
-            'electrician': [
-                "Enable customers to request quotes through an online form",
-                "Showcase your certifications and qualifications prominently",
-                "Display before-and-after photos of your electrical work",
-                "Allow customers to schedule routine maintenance online"
-            ],
-            'hairdresser': [
-                "Let clients book appointments online 24/7",
-                "Showcase your portfolio of styles and transformations",
-                "Promote special offers and loyalty programs",
-                "Allow clients to select their preferred stylist when booking"
-            ],
-            'dentist': [
-                "Enable patients to book appointments and fill forms online",
-                "Showcase before-and-after photos of successful treatments",
-                "Provide educational content about dental health",
-                "Allow patients to request emergency appointments online"
-            ],
-            'mechanic': [
-                "Let customers book service appointments online",
-                "Display testimonials from satisfied customers",
-                "Showcase your specializations and certifications",
-                "Allow customers to request quotes for specific repairs"
-            ],
-            'cleaner': [
-                "Enable customers to book cleaning services online",
-                "Showcase your range of cleaning packages",
-                "Display testimonials from satisfied customers",
-                "Allow customers to specify special cleaning requirements"
-            ],
-            # Default category for any other business type
-            'default': [
-                "Showcase testimonials from satisfied customers",
-                "Display your portfolio of work and achievements",
-                "Highlight your unique selling points and specializations",
-                "Allow customers to contact you easily through online forms"
-            ]
-        }
+    Memoized per distinct category string, so the keyword scan runs once per
+    category and choosing a benefit for each email is a cached lookup.
+    
+    Args:
+        business_category (str): Category as stored on the lead
         
-        # Find the most relevant category
-        for key in benefits.keys():
-            if key in business_category.lower():
-                return random.choice(benefits[key])
+    Returns:
+        tuple: (benefits, features) tuples
+    """
+    key = resolve_category(business_category)
+    return tuple(CUSTOM_BENEFITS[key]), tuple(CUSTOM_FEATURES.get(key, CUSTOM_FEATURES['default']))
+
+def _present(value):
+    """Check that a business field has a value (not None, '' or NaN from pandas)."""
+    return value is not None and value == value and str(value).strip() != ''
+
+def business_id(business_data):
+    """
+    Get a stable ID for a business, used to key its generated email.
+    
+    The database 'id' or Places 'place_id' is used when present. Otherwise
+    the ID is the name slug plus a digest of the normalized name, phone and
+    address, so two businesses sharing a name still get different IDs and
+    the same business gets the same ID on every run.
+    
+    Args:
+        business_data (dict): Dictionary containing business information
         
-        # If no specific category matches, use default
-        return random.choice(benefits['default'])
+    Returns:
+        str: Business ID
+    """
+    for key in ('id', 'place_id'):
+        value = business_data.get(key)
+        if _present(value):
+            return str(int(value) if isinstance(value, float) and value.is_integer() else value)
+            
+    name = normalize_name(business_data.get('name'))
+    identity = '|'.join((
+        name,
+        normalize_phone(business_data.get('phone')) if _present(business_data.get('phone')) else '',
+        normalize_name(business_data.get('address')) if _present(business_data.get('address')) else ''
+    ))
+    digest = hashlib.sha1(identity.encode('utf-8')).hexdigest()[:10]
+    return f"{name.replace(' ', '_')[:40] or 'business'}-{digest}"
+
+# Generator used by each process-pool worker, created once per process
+_worker_generator = None
+
+def _init_worker():
+    """Load the templates once in a process-pool worker."""
+    global _worker_generator
+    _worker_generator = OutreachGenerator()
+
+def _render_chunk_in_worker(task):
+    """Render one chunk in a process-pool worker."""
+    businesses_data, template_name, seed = task
+    return _worker_generator.render_chunk(businesses_data, template_name, seed)
+
+class OutreachGenerator:
+    """Tool to generate personalized outreach emails for businesses without websites."""
     
-    def generate_custom_feature(self, business_category):
-        """Generate a custom feature based on business category."""
-        features = {
-            'restaurant': [
-                "online reservation",
-                "menu display",
-                "food ordering",
-                "table booking"
-            ],
-            'plumber': [
-                "emergency service request",
-                "appointment scheduling",
-                "quote request",
-                "service area map"
-            ],
-            'electrician': [
-                "emergency callout",
-                "service booking",
-                "quote request",
-                "project gallery"
-            ],
-            'hairdresser': [
-                "appointment booking",
-                "stylist selection",
-                "service pricing",
-                "style gallery"
-            ],
-            'dentist': [
-                "appointment scheduling",
-                "patient form submission",
-                "treatment information",
-                "emergency contact"
-            ],
-            'mechanic': [
-                "service booking",
-                "repair quote request",
-                "service history tracking",
-                "vehicle information storage"
-            ],
-            'cleaner': [
-                "service scheduling",
-                "package selection",
-                "special request submission",
-                "recurring booking"
-            ],
-            # Default category for any other business type
-            'default': [
-                "contact form",
-                "service showcase",
-                "customer testimonial",
-                "appointment booking"
-            ]
-        }
+    def __init__(self, seed=None):
+        """
+        Initialize the OutreachGenerator.
+        
+        Args:
+            seed (int): Optional seed for choosing custom benefits/features, so batches are reproducible
+        """
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.templates_dir = os.path.join(self.base_dir, 'outreach', 'templates')
+        self.output_dir = os.path.join(self.base_dir, 'outreach', 'generated')
+        
+        # Templates come from the process-wide registry, which reads them on first use
+        self.registry = get_registry(self.templates_dir, DEFAULT_TEMPLATES)
         
-        # Find the most relevant category
-        for key in features.keys():
-            if key in business_category.lower():
-                return random.choice(features[key])
+        # Open campaign bundles by campaign name: writers for save_email, and
+        # read-only bundles for load_email, which must not take the writer lock
+        self._bundles = {}
+        self._readers = {}
         
-        # If no specific category matches, use default
-        return random.choice(features['default'])
+    @property
+    def templates(self):
+        """Template name -> CompiledTemplate mapping, shared by all generators and loaded lazily."""
+        return self.registry
     
-    def generate_email(self, business_data, template_name='initial_contact.txt'):
+    def create_default_templates(self):
+        """Create default email templates if they don't exist."""
+        self.registry.create_defaults()
+    
+    def load_templates(self):
+        """Load and compile all email templates from the templates directory."""
+        return {name: self.registry[name] for name in self.registry}
+    
+    def generate_custom_benefit(self, business_category, rng=None):
+        """Generate a custom benefit based on business category."""
+        return (rng or self.rng).choice(category_pools(business_category)[0])
+    
+    def generate_custom_feature(self, business_category, rng=None):
+        """Generate a custom feature based on business category."""
+        return (rng or self.rng).choice(category_pools(business_category)[1])
+    
+    def _resolve_template_name(self, template_name):
+        """Get the template to use, falling back to initial_contact.txt."""
+        if template_name not in self.templates:
+            print(f"Template {template_name} not found. Using initial_contact.txt instead.")
+            template_name = 'initial_contact.txt'
+        return template_name
+    
+    def _get_template(self, template_name):
+        """Get a compiled template, falling back to initial_contact.txt."""
+        return self.templates[self._resolve_template_name(template_name)]
+    
+    def build_substitutions(self, business_data, rng=None):
         """
-        Generate a personalized email for a business.
+        Build the template placeholder values for a business.
         
         Args:
             business_data (dict): Dictionary containing business information
-            template_name (str): Name of the template file to use
+            rng (random.Random): Optional RNG for the custom elements (default: the generator's own)
             
         Returns:
-            str: Personalized email content
+            dict: Placeholder name -> value
         """
-        if template_name not in self.templates:
-            print(f"Template {template_name} not found. Using initial_contact.txt instead.")
-            template_name = 'initial_contact.txt'
-        
-        template = self.templates[template_name]
-        
         # Extract business information
         business_name = business_data.get('name', 'your business')
         business_category = business_data.get('category', 'local business')
@@ -282,14 +365,13 @@ Best regards,
         # Generate contact name if not available
         contact_name = business_data.get('contact_name', 'Business Owner')
         
-        # Generate custom elements
-        custom_benefit = business_data.get('custom_benefit', 
-                                          self.generate_custom_benefit(business_category))
-        custom_feature = business_data.get('custom_feature',
-                                          self.generate_custom_feature(business_category))
+        # Generate custom elements only where the business does not provide them
+        custom_benefit = business_data['custom_benefit'] if 'custom_benefit' in business_data \
+            else self.generate_custom_benefit(business_category, rng)
+        custom_feature = business_data['custom_feature'] if 'custom_feature' in business_data \
+            else self.generate_custom_feature(business_category, rng)
         
-        # Prepare substitution dictionary
-        substitutions = {
+        return {
             'business_name': business_name,
             'contact_name': contact_name,
             'business_category': business_category,
@@ -297,10 +379,92 @@ Best regards,
             'custom_benefit': custom_benefit,
             'custom_feature': custom_feature
         }
+    
+    def generate_email(self, business_data, template_name='initial_contact.txt'):
+        """
+        Generate a personalized email for a business.
         
-        # Generate personalized email
-        email_content = template.safe_substitute(substitutions)
-        return email_content
+        Args:
+            business_data (dict): Dictionary containing business information
+            template_name (str): Name of the template file to use
+            
+        Returns:
+            str: Personalized email content
+        """
+        template = self._get_template(template_name)
+        return template.render(self.build_substitutions(business_data))
+    
+    def render_many(self, businesses_data, template_name='initial_contact.txt'):
+        """
+        Render one template for a whole batch of businesses.
+        
+        Args:
+            businesses_data (list): List of dictionaries containing business information
+            template_name (str): Name of the template file to use
+            
+        Returns:
+            list: Personalized email contents, in input order
+        """
+        template = self._get_template(template_name)
+        return template.render_many(self.build_substitutions(b) for b in businesses_data)
+    
+    def render_chunk(self, businesses_data, template_name, seed=None):
+        """
+        Render one chunk of emails with its own RNG.
+        
+        Args:
+            businesses_data (list): List of dictionaries containing business information
+            template_name (str): Name of the template file to use
+            seed (str): Seed for the chunk's RNG (None for unseeded)
+            
+        Returns:
+            list: (business ID, email content) pairs, in input order
+        """
+        rng = random.Random(seed)
+        template = self._get_template(template_name)
+        contents = template.render_many(self.build_substitutions(b, rng) for b in businesses_data)
+        return [(business_id(b), content) for b, content in zip(businesses_data, contents)]
+    
+    def _chunk_seed(self, index):
+        """Derive the seed of a chunk, so output does not depend on how chunks are spread over workers."""
+        return None if self.seed is None else f"{self.seed}:{index}"
+    
+    def iter_emails(self, businesses, template_name='initial_contact.txt', workers=1, chunk_size=500):
+        """
+        Stream personalized emails, optionally rendering chunks in parallel processes.
+        
+        Businesses are consumed lazily a chunk at a time and emails are
+        yielded in input order. With workers > 1 chunks are rendered in a
+        process pool with at most two chunks per worker in flight, so memory
+        stays bounded however many businesses there are. With a seed the
+        output is the same for any number of workers.
+        
+        Args:
+            businesses (iterable): Dictionaries containing business information
+            template_name (str): Name of the template file to use
+            workers (int): Number of worker processes (1 renders in this process)
+            chunk_size (int): Businesses per chunk
+            
+        Yields:
+            tuple: (business ID, email content)
+        """
+        template_name = self._resolve_template_name(template_name)
+        businesses = iter(businesses)
+        chunks = iter(lambda: list(islice(businesses, chunk_size)), [])
+        
+        if workers <= 1:
+            for index, chunk in enumerate(chunks):
+                yield from self.render_chunk(chunk, template_name, self._chunk_seed(index))
+            return
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            pending = deque()
+            for index, chunk in enumerate(chunks):
+                pending.append(executor.submit(_render_chunk_in_worker, (chunk, template_name, self._chunk_seed(index))))
+                if len(pending) >= workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
     
     def generate_batch_emails(self, businesses_data, template_name='initial_contact.txt'):
         """
@@ -311,62 +475,132 @@ Best regards,
             template_name (str): Name of the template file to use
             
         Returns:
-            dict: Dictionary mapping business names to their personalized emails
+            dict: Dictionary mapping business IDs (see business_id) to their personalized emails
         """
-        emails = {}
-        for business_data in businesses_data:
-            business_name = business_data.get('name', f"Business_{len(emails)}")
-            email_content = self.generate_email(business_data, template_name)
-            emails[business_name] = email_content
-        return emails
+        return dict(self.iter_emails(businesses_data, template_name))
+    
+    def campaign_dir(self, campaign_name=None):
+        """Get the directory holding a campaign's bundle (the output directory itself without a campaign)."""
+        return os.path.join(self.output_dir, campaign_name) if campaign_name else self.output_dir
+    
+    def open_bundle(self, campaign_name=None, readonly=False):
+        """
+        Open a campaign's email bundle.
+        
+        Args:
+            campaign_name (str): Optional campaign name for organizing emails
+            readonly (bool): Open for reading only, without taking the writer lock
+            
+        Returns:
+            CampaignBundle: The bundle; close it when done
+        """
+        return CampaignBundle(self.campaign_dir(campaign_name), readonly=readonly)
+    
+    def _bundle(self, campaign_name=None):
+        """Get this generator's open bundle for a campaign, opening it on first use."""
+        bundle = self._bundles.get(campaign_name)
+        if bundle is None:
+            bundle = self._bundles[campaign_name] = self.open_bundle(campaign_name)
+        return bundle
+    
+    def _reader(self, campaign_name=None):
+        """Get this generator's read-only bundle for a campaign, opening it on first use."""
+        reader = self._readers.get(campaign_name)
+        if reader is None:
+            reader = self._readers[campaign_name] = self.open_bundle(campaign_name, readonly=True)
+        return reader
+    
+    def _saved(self, campaign_name):
+        """Let an open reader see emails just flushed by this generator, including resaved ones."""
+        reader = self._readers.get(campaign_name)
+        if reader is not None:
+            reader.refresh()
     
     def save_email(self, business_name, email_content, campaign_name=None):
         """
-        Save a generated email to a file.
+        Save a generated email to the campaign bundle.
         
         Args:
-            business_name (str): Name of the business
+            business_name (str): Name or ID of the business, used to retrieve the email
             email_content (str): Content of the email
             campaign_name (str): Optional campaign name for organizing emails
             
         Returns:
-            str: Path to the saved email file
+            str: Path to the campaign bundle
         """
-        # Create campaign directory if specified
-        if campaign_name:
-            campaign_dir = os.path.join(self.output_dir, campaign_name)
-            os.makedirs(campaign_dir, exist_ok=True)
-            output_dir = campaign_dir
-        else:
-            output_dir = self.output_dir
-        
-        # Sanitize business name for filename
-        safe_name = "".join([c if c.isalnum() else "_" for c in business_name])
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{safe_name}_{timestamp}.txt"
+        bundle = self._bundle(campaign_name)
+        bundle.append(business_name, email_content)
+        bundle.flush()
+        self._saved(campaign_name)
+        return bundle.data_path
+    
+    def save_batch_emails(self, emails, campaign_name=None):
+        """
+        Save multiple generated emails to the campaign bundle.
         
-        filepath = os.path.join(output_dir, filename)
-        with open(filepath, 'w') as f:
-            f.write(email_content)
+        All emails go through one buffered bundle handle, so a large campaign
+        writes a single data file and index rather than a file per business.
         
-        return filepath
+        Args:
+            emails (dict): Dictionary mapping business IDs to their personalized emails,
+                           or an iterable of (business ID, email) pairs such as iter_emails()
+            campaign_name (str): Optional campaign name for organizing emails
+            
+        Returns:
+            list: Business IDs saved, in input order
+        """
+        items = emails.items() if isinstance(emails, dict) else emails
+        bundle = self._bundle(campaign_name)
+        try:
+            return bundle.extend(items)
+        finally:
+            bundle.flush()
+            self._saved(campaign_name)
     
-    def save_batch_emails(self, emails, campaign_name=None):
+    def load_email(self, business_key, campaign_name=None):
         """
-        Save multiple generated emails to files.
+        Load one saved email from the campaign bundle.
+        
+        Reads through a read-only bundle, so loading never waits on or
+        repairs a bundle another process is writing.
         
         Args:
-            emails (dict): Dictionary mapping business names to their personalized emails
+            business_key (str): Business ID (or name) the email was saved under
             campaign_name (str): Optional campaign name for organizing emails
             
         Returns:
-            list: List of paths to the saved email files
+            str: Email content, or None if it was not saved
+        """
+        return self._reader(campaign_name).get(business_key)
+    
+    def close(self):
+        """Close the campaign bundles this generator has open, releasing their writer locks."""
+        for bundle in list(self._bundles.values()) + list(self._readers.values()):
+            bundle.close()
+        self._bundles.clear()
+        self._readers.clear()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def iter_businesses_from_file(self, data_file):
+        """
+        Stream business data from a CSV, JSON or NDJSON file, optionally gzipped.
+        
+        Records are read one at a time (see tools.lead_reader), so a file of
+        any size can be rendered in constant memory.
+        
+        Args:
+            data_file (str): Path to the file
+            
+        Returns:
+            iterator: Dictionaries containing business information
         """
-        saved_files = []
-        for business_name, email_content in emails.items():
-            filepath = self.save_email(business_name, email_content, campaign_name)
-            saved_files.append(filepath)
-        return saved_files
+        infer_read_format(data_file)
+        return iter_leads(data_file)
     
     def load_businesses_from_csv(self, csv_file):
         """
@@ -379,9 +613,7 @@ Best regards,
             list: List of dictionaries containing business information
         """
         try:
-            df = pd.read_csv(csv_file)
-            businesses = df.to_dict('records')
-            return businesses
+            return list(iter_leads(csv_file, fmt='csv'))
         except Exception as e:
             print(f"Error loading CSV file: {e}")
             return []
@@ -397,9 +629,7 @@ Best regards,
             list: List of dictionaries containing business information
         """
         try:
-            with open(json_file, 'r') as f:
-                businesses = json.load(f)
-            return businesses
+            return list(iter_leads(json_file, fmt='json'))
         except Exception as e:
             print(f"Error loading JSON file: {e}")
             return []
@@ -435,11 +665,12 @@ def main():
     emails = generator.generate_batch_emails(example_businesses)
     
     # Save the generated emails
-    saved_files = generator.save_batch_emails(emails, campaign_name='example_campaign')
+    saved_ids = generator.save_batch_emails(emails, campaign_name='example_campaign')
+    generator.close()
     
-    print(f"Generated and saved {len(saved_files)} emails:")
-    for filepath in saved_files:
-        print(f"  - {filepath}")
+    print(f"Generated and saved {len(saved_ids)} emails to {generator.campaign_dir('example_campaign')}:")
+    for key in saved_ids:
+        print(f"  - {key}")
     
     # Example of loading from CSV (if available)
     data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
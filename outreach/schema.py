@@ -0,0 +1,547 @@
+#!/usr/bin/env python3
+"""
+Outreach Database Schema
+
+This module owns the schema of the outreach database as a list of numbered
+migrations, applied once per database by ConnectionManager.migrate() and
+tracked in PRAGMA user_version, instead of each component running its own
+CREATE TABLE IF NOT EXISTS blocks on every start. It also holds the hot
+queries of the scheduler, campaign stats, lead import and analytics, which
+those components execute from here, together with the index each one must
+use, and checks them with EXPLAIN QUERY PLAN so a dropped or unusable index
+is caught before it turns into a full scan.
+
+    python outreach/schema.py [--db data/outreach.db]
+"""
+
+import os
+import sys
+import sqlite3
+import argparse
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.database import get_database
+
+def _create_base_tables(conn):
+    """Create the original tables (kept IF NOT EXISTS so unversioned databases adopt them)."""
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS businesses (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        category TEXT,
+        address TEXT,
+        phone TEXT,
+        email TEXT,
+        contact_name TEXT,
+        location TEXT,
+        source TEXT,
+        rating REAL,
+        review_count INTEGER,
+        latitude REAL,
+        longitude REAL,
+        date_added TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS campaigns (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        description TEXT,
+        template_name TEXT,
+        status TEXT DEFAULT 'draft',
+        date_created TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        date_started TIMESTAMP,
+        date_completed TIMESTAMP
+    )
+    ''')
+    
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS emails (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        business_id INTEGER,
+        campaign_id INTEGER,
+        email_type TEXT,
+        subject TEXT,
+        content TEXT,
+        status TEXT DEFAULT 'pending',
+        scheduled_time TIMESTAMP,
+        sent_time TIMESTAMP,
+        opened_time TIMESTAMP,
+        clicked_time TIMESTAMP,
+        replied_time TIMESTAMP,
+        tracking_id TEXT,
+        FOREIGN KEY (business_id) REFERENCES businesses (id),
+        FOREIGN KEY (campaign_id) REFERENCES campaigns (id)
+    )
+    ''')
+    
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS appointments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        business_id INTEGER,
+        campaign_id INTEGER,
+        status TEXT DEFAULT 'scheduled',
+        scheduled_time TIMESTAMP,
+        notes TEXT,
+        calendly_link TEXT,
+        FOREIGN KEY (business_id) REFERENCES businesses (id),
+        FOREIGN KEY (campaign_id) REFERENCES campaigns (id)
+    )
+    ''')
+    
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS analytics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        campaign_id INTEGER,
+        email_type TEXT,
+        sent_count INTEGER DEFAULT 0,
+        open_count INTEGER DEFAULT 0,
+        click_count INTEGER DEFAULT 0,
+        reply_count INTEGER DEFAULT 0,
+        appointment_count INTEGER DEFAULT 0,
+        date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (campaign_id) REFERENCES campaigns (id)
+    )
+    ''')
+    
+    # Message analytics (analytics/message_analytics.py)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS message_analytics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        message_id TEXT,
+        business_id TEXT,
+        template_id TEXT,
+        sent_at TEXT,
+        opened_at TEXT,
+        replied_at TEXT,
+        clicked_at TEXT,
+        booked_at TEXT,
+        status TEXT,
+        FOREIGN KEY (business_id) REFERENCES businesses(id),
+        FOREIGN KEY (message_id) REFERENCES messages(id),
+        FOREIGN KEY (template_id) REFERENCES message_templates(id)
+    )
+    ''')
+    
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS message_templates (
+        id TEXT PRIMARY KEY,
+        name TEXT,
+        subject TEXT,
+        body TEXT,
+        category TEXT,
+        tags TEXT,
+        created_at TEXT,
+        updated_at TEXT
+    )
+    ''')
+    
+    # Calendly bookings (integrations/calendly_integration.py)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS calendly_events (
+        id TEXT PRIMARY KEY,
+        business_id TEXT,
+        event_type TEXT,
+        start_time TEXT,
+        end_time TEXT,
+        invitee_name TEXT,
+        invitee_email TEXT,
+        invitee_phone TEXT,
+        status TEXT,
+        created_at TEXT,
+        updated_at TEXT,
+        canceled_at TEXT,
+        FOREIGN KEY (business_id) REFERENCES businesses(id)
+    )
+    ''')
+    
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS calendly_event_types (
+        id TEXT PRIMARY KEY,
+        name TEXT,
+        slug TEXT,
+        duration INTEGER,
+        description TEXT,
+        uri TEXT,
+        active BOOLEAN,
+        created_at TEXT,
+        updated_at TEXT
+    )
+    ''')
+
+def _add_business_columns(conn):
+    """
+    Add the rating and coordinate columns to older businesses tables and index the coordinates.
+    
+    The coordinates get an R*Tree kept in step by triggers, or a B-tree index
+    on builds of SQLite without the R*Tree module.
+    """
+    cursor = conn.cursor()
+    existing = {row[1] for row in cursor.execute("PRAGMA table_info(businesses)")}
+    for column, column_type in (('rating', 'REAL'), ('review_count', 'INTEGER'),
+                                ('latitude', 'REAL'), ('longitude', 'REAL')):
+        if column not in existing:
+            cursor.execute(f"ALTER TABLE businesses ADD COLUMN {column} {column_type}")
+            
+    try:
+        cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS businesses_rtree USING rtree(
+            id, min_lat, max_lat, min_lng, max_lng
+        )
+        ''')
+    except sqlite3.OperationalError:
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_businesses_lat_lng ON businesses (latitude, longitude)')
+        return
+        
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS businesses_rtree_insert AFTER INSERT ON businesses
+    WHEN NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL
+    BEGIN
+        INSERT OR REPLACE INTO businesses_rtree VALUES (NEW.id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude);
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS businesses_rtree_update AFTER UPDATE OF latitude, longitude ON businesses
+    BEGIN
+        DELETE FROM businesses_rtree WHERE id = OLD.id;
+        INSERT INTO businesses_rtree
+        SELECT NEW.id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude
+        WHERE NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL;
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS businesses_rtree_delete AFTER DELETE ON businesses
+    BEGIN
+        DELETE FROM businesses_rtree WHERE id = OLD.id;
+    END
+    ''')
+    
+    # Backfill rows stored before the index existed
+    cursor.execute('''
+    INSERT INTO businesses_rtree
+    SELECT id, latitude, latitude, longitude, longitude FROM businesses
+    WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+      AND id NOT IN (SELECT id FROM businesses_rtree)
+    ''')
+
+def _add_payload_columns(conn):
+    """Add the Message-ID and pre-built MIME payload columns to older emails tables."""
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(emails)")}
+    for column, column_type in (('message_id', 'TEXT'), ('mime_payload', 'BLOB')):
+        if column not in existing:
+            conn.execute(f"ALTER TABLE emails ADD COLUMN {column} {column_type}")
+
+# Index name -> (table, columns) of the secondary indexes behind the hot queries
+INDEXES = {
+    # send_scheduled_emails: status = 'scheduled' AND scheduled_time <= now
+    'idx_emails_status_scheduled': ('emails', 'status, scheduled_time'),
+    # Campaign stats, generation and scheduling: campaign_id (+ status, unscheduled)
+    'idx_emails_campaign_status': ('emails', 'campaign_id, status, scheduled_time'),
+    # Campaign membership check and lead details: business_id (+ campaign_id)
+    'idx_emails_business_campaign': ('emails', 'business_id, campaign_id'),
+    # Import / upsert duplicate check
+    'idx_businesses_name_phone': ('businesses', 'name, phone'),
+    'idx_appointments_campaign': ('appointments', 'campaign_id'),
+    'idx_appointments_business': ('appointments', 'business_id, scheduled_time'),
+    # update_analytics: today's row of a campaign
+    'idx_analytics_campaign_date': ('analytics', 'campaign_id, date'),
+    'idx_message_analytics_message': ('message_analytics', 'message_id'),
+    'idx_message_analytics_template': ('message_analytics', 'template_id'),
+    'idx_message_analytics_sent_at': ('message_analytics', 'sent_at'),
+    'idx_calendly_events_business': ('calendly_events', 'business_id, start_time'),
+}
+
+def _create_indexes(conn):
+    """Create the secondary indexes of the hot queries."""
+    for name, (table, columns) in INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+
+# (version, description, apply) - append new migrations, never edit applied ones;
+# their DDL is written out here so later changes elsewhere cannot alter them
+MIGRATIONS = [
+    (1, 'Base tables', _create_base_tables),
+    (2, 'Business rating/coordinate columns and spatial index', _add_business_columns),
+    (3, 'Pre-built MIME payload columns', _add_payload_columns),
+    (4, 'Hot-path indexes', _create_indexes),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def migrate_database(db):
+    """
+    Create or upgrade the outreach schema.
+    
+    Args:
+        db (ConnectionManager): Manager of the outreach database
+        
+    Returns:
+        int: Schema version
+    """
+    return db.migrate(MIGRATIONS)
+
+# Hot queries, executed by the application and checked by check_query_plans()
+
+# OutreachAutomation.send_scheduled_emails
+SCHEDULED_EMAILS_QUERY = '''
+SELECT e.id, e.subject, e.content, e.mime_payload, b.name, b.email
+FROM emails e
+JOIN businesses b ON e.business_id = b.id
+WHERE e.status = 'scheduled' AND e.scheduled_time <= ? AND e.content IS NOT NULL
+'''
+
+# OutreachAutomation.get_campaign_stats
+CAMPAIGN_EMAIL_COUNTS_QUERY = '''
+SELECT 
+    COUNT(*) as total,
+    COUNT(CASE WHEN status = 'pending' THEN 1 END) as pending,
+    COUNT(CASE WHEN status = 'scheduled' THEN 1 END) as scheduled,
+    COUNT(CASE WHEN status = 'sent' THEN 1 END) as sent,
+    COUNT(CASE WHEN status = 'failed' THEN 1 END) as failed,
+    COUNT(CASE WHEN opened_time IS NOT NULL THEN 1 END) as opened,
+    COUNT(CASE WHEN clicked_time IS NOT NULL THEN 1 END) as clicked,
+    COUNT(CASE WHEN replied_time IS NOT NULL THEN 1 END) as replied
+FROM emails
+WHERE campaign_id = ?
+'''
+
+# OutreachAutomation.update_analytics
+CAMPAIGN_ENGAGEMENT_COUNTS_QUERY = '''
+SELECT 
+    COUNT(CASE WHEN status = 'sent' THEN 1 END) as sent,
+    COUNT(CASE WHEN opened_time IS NOT NULL THEN 1 END) as opened,
+    COUNT(CASE WHEN clicked_time IS NOT NULL THEN 1 END) as clicked,
+    COUNT(CASE WHEN replied_time IS NOT NULL THEN 1 END) as replied
+FROM emails
+WHERE campaign_id = ?
+'''
+
+# OutreachAutomation.schedule_campaign
+CAMPAIGN_PENDING_EMAILS_QUERY = '''
+SELECT id FROM emails
+WHERE campaign_id = ? AND status = 'pending' AND scheduled_time IS NULL
+'''
+
+# OutreachAutomation.add_businesses_to_campaign
+CAMPAIGN_MEMBERSHIP_QUERY = "SELECT id FROM emails WHERE business_id = ? AND campaign_id = ?"
+
+# OutreachAutomation.get_business_details
+BUSINESS_EMAILS_QUERY = '''
+SELECT e.id, e.campaign_id, c.name, e.email_type, e.status, e.sent_time, e.opened_time, e.replied_time
+FROM emails e
+JOIN campaigns c ON e.campaign_id = c.id
+WHERE e.business_id = ?
+ORDER BY e.sent_time DESC
+'''
+
+BUSINESS_APPOINTMENTS_QUERY = '''
+SELECT id, campaign_id, status, scheduled_time, notes
+FROM appointments
+WHERE business_id = ?
+ORDER BY scheduled_time DESC
+'''
+
+# OutreachAutomation.get_campaign_stats and update_analytics
+CAMPAIGN_APPOINTMENT_COUNT_QUERY = '''
+SELECT COUNT(*) FROM appointments
+WHERE campaign_id = ?
+'''
+
+# OutreachAutomation.update_analytics: today's row of a campaign
+DAILY_CAMPAIGN_ANALYTICS_QUERY = '''
+SELECT id FROM analytics
+WHERE campaign_id = ? AND date >= date('now', 'start of day')
+'''
+
+# BusinessSink.flush: a batch of leads is staged in this table, then upserted by (name, phone)
+INCOMING_BUSINESSES_TABLE = '''
+CREATE TEMP TABLE IF NOT EXISTS incoming_businesses (
+    name TEXT NOT NULL,
+    category TEXT,
+    address TEXT,
+    phone TEXT NOT NULL,
+    email TEXT,
+    contact_name TEXT,
+    location TEXT,
+    source TEXT,
+    rating REAL,
+    review_count INTEGER,
+    latitude REAL,
+    longitude REAL,
+    PRIMARY KEY (name, phone)
+)
+'''
+
+STAGED_EXISTING_COUNT_QUERY = '''
+SELECT COUNT(*) FROM incoming_businesses i
+WHERE EXISTS (SELECT 1 FROM businesses b WHERE b.name = i.name AND b.phone = i.phone)
+'''
+
+# Unary + stops the planner from scanning businesses to probe the staging
+# table's key; the small staged batch drives the (name, phone) index instead
+STAGED_UPDATE_QUERY = '''
+UPDATE businesses
+SET category = i.category, address = i.address, email = i.email,
+    contact_name = i.contact_name, location = i.location, source = i.source,
+    rating = COALESCE(i.rating, businesses.rating),
+    review_count = COALESCE(i.review_count, businesses.review_count),
+    latitude = COALESCE(i.latitude, businesses.latitude),
+    longitude = COALESCE(i.longitude, businesses.longitude)
+FROM incoming_businesses i
+WHERE businesses.name = +i.name AND businesses.phone = +i.phone
+'''
+
+# MessageAnalytics.track_message
+MESSAGE_LOOKUP_QUERY = 'SELECT id FROM message_analytics WHERE message_id = ?'
+
+# MessageAnalytics.get_template_analytics
+TEMPLATE_ANALYTICS_QUERY = '''
+SELECT 
+    COUNT(*) as sent_count,
+    SUM(CASE WHEN opened_at IS NOT NULL THEN 1 ELSE 0 END) as opened_count,
+    SUM(CASE WHEN replied_at IS NOT NULL THEN 1 ELSE 0 END) as replied_count,
+    SUM(CASE WHEN clicked_at IS NOT NULL THEN 1 ELSE 0 END) as clicked_count,
+    SUM(CASE WHEN booked_at IS NOT NULL THEN 1 ELSE 0 END) as booked_count
+FROM message_analytics 
+WHERE template_id = ?
+'''
+
+# MessageAnalytics.generate_performance_report
+PERIOD_MESSAGE_TOTALS_QUERY = '''
+SELECT 
+    COUNT(*) as sent_count,
+    SUM(CASE WHEN opened_at IS NOT NULL THEN 1 ELSE 0 END) as opened_count,
+    SUM(CASE WHEN replied_at IS NOT NULL THEN 1 ELSE 0 END) as replied_count,
+    SUM(CASE WHEN clicked_at IS NOT NULL THEN 1 ELSE 0 END) as clicked_count,
+    SUM(CASE WHEN booked_at IS NOT NULL THEN 1 ELSE 0 END) as booked_count
+FROM message_analytics 
+WHERE sent_at >= ? AND sent_at <= ?
+'''
+
+DAILY_MESSAGE_TOTALS_QUERY = '''
+SELECT 
+    date(sent_at) as date,
+    COUNT(*) as sent_count,
+    SUM(CASE WHEN opened_at IS NOT NULL THEN 1 ELSE 0 END) as opened_count,
+    SUM(CASE WHEN replied_at IS NOT NULL THEN 1 ELSE 0 END) as replied_count,
+    SUM(CASE WHEN clicked_at IS NOT NULL THEN 1 ELSE 0 END) as clicked_count,
+    SUM(CASE WHEN booked_at IS NOT NULL THEN 1 ELSE 0 END) as booked_count
+FROM message_analytics 
+WHERE sent_at >= ? AND sent_at <= ?
+GROUP BY date(sent_at)
+ORDER BY date(sent_at)
+'''
+
+# CalendlyIntegration.get_events_by_business_id
+BUSINESS_CALENDLY_EVENTS_QUERY = 'SELECT * FROM calendly_events WHERE business_id = ? ORDER BY start_time DESC'
+
+# Query name -> (SQL, index it must use)
+HOT_QUERIES = {
+    'scheduled_emails': (SCHEDULED_EMAILS_QUERY, 'idx_emails_status_scheduled'),
+    'campaign_email_counts': (CAMPAIGN_EMAIL_COUNTS_QUERY, 'idx_emails_campaign_status'),
+    'campaign_engagement_counts': (CAMPAIGN_ENGAGEMENT_COUNTS_QUERY, 'idx_emails_campaign_status'),
+    'campaign_pending_emails': (CAMPAIGN_PENDING_EMAILS_QUERY, 'idx_emails_campaign_status'),
+    'campaign_membership': (CAMPAIGN_MEMBERSHIP_QUERY, 'idx_emails_business_campaign'),
+    'business_emails': (BUSINESS_EMAILS_QUERY, 'idx_emails_business_campaign'),
+    'business_appointments': (BUSINESS_APPOINTMENTS_QUERY, 'idx_appointments_business'),
+    'campaign_appointments': (CAMPAIGN_APPOINTMENT_COUNT_QUERY, 'idx_appointments_campaign'),
+    'daily_campaign_analytics': (DAILY_CAMPAIGN_ANALYTICS_QUERY, 'idx_analytics_campaign_date'),
+    'staged_existing_count': (STAGED_EXISTING_COUNT_QUERY, 'idx_businesses_name_phone'),
+    'staged_update': (STAGED_UPDATE_QUERY, 'idx_businesses_name_phone'),
+    'message_lookup': (MESSAGE_LOOKUP_QUERY, 'idx_message_analytics_message'),
+    'template_analytics': (TEMPLATE_ANALYTICS_QUERY, 'idx_message_analytics_template'),
+    'period_message_totals': (PERIOD_MESSAGE_TOTALS_QUERY, 'idx_message_analytics_sent_at'),
+    'daily_message_totals': (DAILY_MESSAGE_TOTALS_QUERY, 'idx_message_analytics_sent_at'),
+    'business_calendly_events': (BUSINESS_CALENDLY_EVENTS_QUERY, 'idx_calendly_events_business'),
+}
+
+def query_plan(conn, sql):
+    """
+    Get the EXPLAIN QUERY PLAN details of a query.
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+        sql (str): Query, with ? placeholders
+        
+    Returns:
+        list: Plan detail strings, e.g. 'SEARCH emails USING INDEX ... (campaign_id=?)'
+    """
+    parameters = (None,) * sql.count('?')
+    return [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", parameters)]
+
+def query_plans(db_path):
+    """
+    Get the plans of all hot queries.
+    
+    Plans come from a fresh connection without a statement cache, since a
+    cached statement can report the plan it was prepared with before an
+    index was created or dropped.
+    
+    Args:
+        db_path (str): Path to a migrated outreach database
+        
+    Returns:
+        dict: Query name -> plan details
+    """
+    conn = sqlite3.connect(db_path, cached_statements=0)
+    try:
+        # The lead import queries read from the staging table, which only exists per connection
+        conn.execute(INCOMING_BUSINESSES_TABLE)
+        return {name: query_plan(conn, sql) for name, (sql, _) in HOT_QUERIES.items()}
+    finally:
+        conn.close()
+
+def check_query_plans(db_path):
+    """
+    Check that every hot query searches with its index.
+    
+    Args:
+        db_path (str): Path to a migrated outreach database
+        
+    Returns:
+        dict: Query name -> plan details, for the queries that do not use their index
+    """
+    failures = {}
+    for name, plan in query_plans(db_path).items():
+        index = HOT_QUERIES[name][1]
+        if not any(detail.startswith('SEARCH') and index in detail for detail in plan):
+            failures[name] = plan
+    return failures
+
+def assert_query_plans(db_path):
+    """
+    Raise AssertionError if any hot query does not use its index.
+    
+    Args:
+        db_path (str): Path to a migrated outreach database
+    """
+    failures = check_query_plans(db_path)
+    if failures:
+        lines = [f"{name} (expected {HOT_QUERIES[name][1]}): {'; '.join(plan)}" for name, plan in failures.items()]
+        raise AssertionError("Hot queries not using their index:\n" + '\n'.join(lines))
+
+def main():
+    """Migrate an outreach database and check the hot query plans."""
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description='Migrate the outreach database and check hot query plans.')
+    parser.add_argument('--db', default=os.path.join(base_dir, 'data', 'outreach.db'), help='Database path')
+    args = parser.parse_args()
+    
+    db = get_database(args.db)
+    before = db.user_version()
+    version = migrate_database(db)
+    print(f"Schema version {version} (was {before}): {args.db}")
+    
+    plans = query_plans(args.db)
+    failures = check_query_plans(args.db)
+    for name, plan in plans.items():
+        status = 'FAIL' if name in failures else 'ok'
+        print(f"  {status:4} {name}: {'; '.join(plan)}")
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
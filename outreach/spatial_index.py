@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Business Spatial Index
+
+This module keeps an SQLite R*Tree over the latitude/longitude of stored
+businesses so campaigns can target "within N km of a point" or "inside a
+polygon" without scanning the whole table. The R*Tree narrows candidates to a
+bounding box and the exact distance / polygon test runs only on those rows.
+The R*Tree and the triggers that keep it in step are created by the schema
+migrations (outreach/schema.py); builds of SQLite without the R*Tree module
+fall back to a B-tree index.
+"""
+
+import os
+import sys
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.geo import bounding_box, haversine_km, point_in_polygon, radius_bounding_box
+
+# R*Tree coordinates are 32-bit floats; pad query boxes so rounding never drops a match
+_BOX_PADDING = 1e-4
+
+def has_rtree(cursor):
+    """Check whether the database has the businesses R*Tree."""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'businesses_rtree'")
+    return cursor.fetchone() is not None
+
+class AreaFilter:
+    """A "near" or "polygon" campaign filter: a bounding box plus an exact test."""
+    
+    def __init__(self, bbox, contains):
+        """
+        Initialize the AreaFilter.
+        
+        Args:
+            bbox (tuple): (south, west, north, east) box enclosing the area
+            contains (callable): Exact test taking (lat, lng)
+        """
+        self.bbox = bbox
+        self.contains = contains
+        
+    @classmethod
+    def from_filters(cls, filters):
+        """
+        Build the area filter from campaign filters, if one is set.
+        
+        Supported filters:
+            near: {'lat': ..., 'lng': ..., 'radius_km': ...}
+            polygon: [[lat, lng], ...]
+            
+        Args:
+            filters (dict): Campaign filters
+            
+        Returns:
+            AreaFilter: Filter for the area, or None if no area is given
+        """
+        near = filters.get('near')
+        polygon = filters.get('polygon')
+        areas = []
+        
+        if near:
+            lat, lng = float(near['lat']), float(near['lng'])
+            radius_km = float(near['radius_km'])
+            areas.append(cls(
+                radius_bounding_box(lat, lng, radius_km),
+                lambda p_lat, p_lng: haversine_km(lat, lng, p_lat, p_lng) <= radius_km
+            ))
+            
+        if polygon:
+            vertices = [(float(p[0]), float(p[1])) for p in polygon]
+            if len(vertices) < 3:
+                raise ValueError("A polygon filter needs at least 3 vertices")
+            areas.append(cls(
+                bounding_box(vertices),
+                lambda p_lat, p_lng: point_in_polygon(p_lat, p_lng, vertices)
+            ))
+            
+        if not areas:
+            return None
+        if len(areas) == 1:
+            return areas[0]
+            
+        # Both given: the intersection of the two areas
+        (s1, w1, n1, e1), (s2, w2, n2, e2) = areas[0].bbox, areas[1].bbox
+        first, second = areas[0].contains, areas[1].contains
+        return cls(
+            (max(s1, s2), max(w1, w2), min(n1, n2), min(e1, e2)),
+            lambda p_lat, p_lng: first(p_lat, p_lng) and second(p_lat, p_lng)
+        )
+        
+    def sql(self, cursor, alias='b'):
+        """
+        Get the SQL that narrows a businesses query to the bounding box.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor on the outreach database
+            alias (str): Alias of the businesses table in the query
+            
+        Returns:
+            tuple: (join clause, where clause, parameters)
+        """
+        south, west, north, east = self.bbox
+        params = [south - _BOX_PADDING, north + _BOX_PADDING, west - _BOX_PADDING, east + _BOX_PADDING]
+        
+        if has_rtree(cursor):
+            join = f" JOIN businesses_rtree r ON r.id = {alias}.id"
+            where = " AND r.min_lat >= ? AND r.max_lat <= ? AND r.min_lng >= ? AND r.max_lng <= ?"
+        else:
+            join = ""
+            where = f" AND {alias}.latitude BETWEEN ? AND ? AND {alias}.longitude BETWEEN ? AND ?"
+        return join, where, params
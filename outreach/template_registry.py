@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Email Template Registry
+
+This module keeps one registry of compiled email templates per templates
+directory for the whole process, so generators share it instead of each
+re-reading and re-compiling every template file. Templates are compiled
+lazily on first use, and each file's modification time and size are checked
+on access, so an edited template is recompiled on its own while the others
+stay cached. Saving a template through the registry recompiles only that one.
+"""
+
+import os
+import sys
+import threading
+from collections.abc import Mapping
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from outreach.email_template import CompiledTemplate
+
+TEMPLATE_SUFFIX = '.txt'
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+def get_registry(templates_dir, defaults=None):
+    """
+    Get the process-wide registry of a templates directory.
+    
+    Args:
+        templates_dir (str): Directory holding the .txt templates
+        defaults (dict): Template filename -> content, written on first use if missing
+        
+    Returns:
+        TemplateRegistry: The shared registry
+    """
+    key = os.path.abspath(templates_dir)
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = TemplateRegistry(key, defaults)
+        return registry
+
+class TemplateRegistry(Mapping):
+    """Lazily loaded template name -> CompiledTemplate mapping, invalidated per file by mtime."""
+    
+    def __init__(self, templates_dir, defaults=None):
+        """
+        Initialize the TemplateRegistry. Nothing is read until a template is used.
+        
+        Args:
+            templates_dir (str): Directory holding the .txt templates
+            defaults (dict): Template filename -> content, written on first use if missing
+        """
+        self.templates_dir = templates_dir
+        self.defaults = dict(defaults or {})
+        self._lock = threading.RLock()
+        self._compiled = {}
+        self._names = None
+        self._listing_mtime = None
+        self._defaults_written = False
+        
+    def path(self, name):
+        """Get the file path of a template."""
+        return os.path.join(self.templates_dir, name)
+        
+    def create_defaults(self):
+        """Write any default templates that do not exist yet (checked once per process)."""
+        with self._lock:
+            if self._defaults_written:
+                return
+            os.makedirs(self.templates_dir, exist_ok=True)
+            for filename, content in self.defaults.items():
+                filepath = self.path(filename)
+                if not os.path.exists(filepath):
+                    with open(filepath, 'w') as f:
+                        f.write(content)
+                    print(f"Created default template: {filepath}")
+            self._defaults_written = True
+            
+    def names(self):
+        """
+        Get the available template names.
+        
+        The directory is listed again only when its modification time changes,
+        i.e. when a template is added, removed or renamed.
+        
+        Returns:
+            list: Template filenames, sorted
+        """
+        self.create_defaults()
+        with self._lock:
+            mtime = os.stat(self.templates_dir).st_mtime_ns
+            if self._names is None or mtime != self._listing_mtime:
+                self._names = sorted(f for f in os.listdir(self.templates_dir) if f.endswith(TEMPLATE_SUFFIX))
+                self._listing_mtime = mtime
+                # Forget templates whose files are gone
+                for name in set(self._compiled) - set(self._names):
+                    del self._compiled[name]
+            return list(self._names)
+            
+    def get_template(self, name):
+        """
+        Get a compiled template, recompiling it if its file changed.
+        
+        Args:
+            name (str): Template filename
+            
+        Returns:
+            CompiledTemplate: The template, or None if there is no such file
+        """
+        if os.path.basename(name) != name:
+            return None
+        self.create_defaults()
+        filepath = self.path(name)
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        version = (stat.st_mtime_ns, stat.st_size)
+        
+        with self._lock:
+            cached = self._compiled.get(name)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            with open(filepath, 'r') as f:
+                template = CompiledTemplate(f.read())
+            self._compiled[name] = (version, template)
+            return template
+            
+    def save(self, name, content):
+        """
+        Write a template and recompile only that template.
+        
+        Args:
+            name (str): Template filename (.txt is added if missing)
+            content (str): Template text
+            
+        Returns:
+            str: Template filename saved
+        """
+        if not name.endswith(TEMPLATE_SUFFIX):
+            name += TEMPLATE_SUFFIX
+        if os.path.basename(name) != name or name.startswith('.'):
+            raise ValueError(f"Invalid template name: {name}")
+            
+        self.create_defaults()
+        filepath = self.path(name)
+        temp_path = filepath + '.tmp'
+        with self._lock:
+            with open(temp_path, 'w') as f:
+                f.write(content)
+            # Replace atomically so concurrent readers never compile a half-written template
+            os.replace(temp_path, filepath)
+            stat = os.stat(filepath)
+            self._compiled[name] = ((stat.st_mtime_ns, stat.st_size), CompiledTemplate(content))
+        return name
+        
+    def invalidate(self, name=None):
+        """Drop one compiled template, or all of them, so they are re-read on next use."""
+        with self._lock:
+            if name is None:
+                self._compiled.clear()
+                self._names = None
+            else:
+                self._compiled.pop(name, None)
+                
+    def __getitem__(self, name):
+        template = self.get_template(name)
+        if template is None:
+            raise KeyError(name)
+        return template
+        
+    def __contains__(self, name):
+        return name in self.names()
+        
+    def __iter__(self):
+        return iter(self.names())
+        
+    def __len__(self):
+        return len(self.names())
@@ -271,6 +271,38 @@ def test_analytics_system():
     print_result("Analytics System", success)
     return success
 
+def test_database_schema():
+    """Test the outreach database migrations and hot query plans."""
+    print_header("Testing Database Schema")
+    
+    try:
+        import tempfile
+        sys.path.append(os.getcwd())
+        from tools.database import get_database
+        from outreach.schema import SCHEMA_VERSION, HOT_QUERIES, migrate_database, check_query_plans
+    
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db = get_database(os.path.join(temp_dir, 'outreach.db'))
+    
+            # Migrating twice must land on the same version without re-running anything
+            version = migrate_database(db)
+            migrated = version == SCHEMA_VERSION and migrate_database(db) == SCHEMA_VERSION
+            print(f"Schema version {version} (expected {SCHEMA_VERSION}): {'✅' if migrated else '❌'}")
+    
+            # Every hot query must search with its index instead of scanning the table
+            failures = check_query_plans(db.db_path)
+            for name, (sql, index) in HOT_QUERIES.items():
+                print(f"Query '{name}' uses {index}: {'❌ ' + '; '.join(failures[name]) if name in failures else '✅'}")
+            db.close_all()
+    
+        success = migrated and not failures
+    except Exception as e:
+        print(f"❌ Failed to check database schema: {str(e)}")
+        success = False
+    
+    print_result("Database Schema", success)
+    return success
+
 def test_pageandbrand_website():
     """Test the PageAndBrand website."""
     print_header("Testing PageAndBrand Website")
@@ -380,6 +412,7 @@ def main():
         "Website Generator": test_website_generator(),
         "Calendly Integration": test_calendly_integration(),
         "Analytics System": test_analytics_system(),
+        "Database Schema": test_database_schema(),
         "PageAndBrand Website": test_pageandbrand_website(),
         "UI Components": test_ui_components()
     }
@@ -0,0 +1,78 @@
+"""Local HTTP stub server for tests of the network-facing tools."""
+
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class StubServer:
+    """
+    Serves scripted responses on 127.0.0.1.
+    
+    routes maps a path, or a host and path ('www.example.com/page'), to a
+    list of (status, headers), (status, headers, delay) or
+    (status, headers, delay, body) responses, played in order with the last
+    one repeated; a dict body is sent as JSON and unknown paths answer 404.
+    Every request is recorded as (method, host + path), and peak counts the
+    most requests seen in flight at once.
+    """
+    
+    def __init__(self, routes=None):
+        self.routes = {path: list(responses) for path, responses in (routes or {}).items()}
+        self.requests = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self):
+                self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                status, headers, body = stub._next(self.command, self.headers.get('Host', ''), self.path)
+                if isinstance(body, dict):
+                    body = json.dumps(body)
+                if isinstance(body, str):
+                    body = body.encode('utf-8')
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(body)
+            
+            do_GET = do_HEAD = do_POST = _respond
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+    
+    def _next(self, method, host, path):
+        path = path.split('?')[0]
+        with self._lock:
+            self.requests.append((method, host + path))
+            responses = self.routes.get(host + path) or self.routes.get(path)
+            if not responses:
+                return 404, {}, b''
+            response = responses.pop(0) if len(responses) > 1 else responses[0]
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            if len(response) > 2:
+                time.sleep(response[2])
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        return response[0], response[1], response[3] if len(response) > 3 else b''
+    
+    def __enter__(self):
+        self._thread.start()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,68 @@
+"""Tests for concurrent Places detail fetching in BusinessFinder."""
+
+import pytest
+
+from tests.stub_server import StubServer
+from tools.business_finder import BusinessFinder
+from tools.rate_limiter import RateLimiter
+
+def place(i):
+    return {'name': f'places/{i}', 'id': str(i), 'displayName': {'text': f'Business {i}'}}
+
+def detail_routes(count, delay=0.05):
+    # Later places answer faster, so completion order differs from request order
+    return {f'/v1/places/{i}': [(200, {'Content-Type': 'application/json'}, delay / (1 + i), place(i))]
+            for i in range(count)}
+
+@pytest.fixture
+def make_finder(tmp_path):
+    limiter = RateLimiter('test-places', rate=10000, capacity=10000, path=str(tmp_path / 'rate_limits.db'))
+    
+    def make_finder(server):
+        return BusinessFinder(api_key='test', max_in_flight=4, places_endpoint=server.url,
+                              rate_limiter=limiter, dedupe=False)
+    yield make_finder
+    limiter.close()
+
+def test_details_keep_search_order(make_finder):
+    names = [f'places/{i}' for i in range(20)]
+    with StubServer(detail_routes(20)) as server:
+        details = make_finder(server).fetch_place_details(names)
+    
+    assert [detail['name'] for detail in details] == names
+    assert sorted(path.split('/', 1)[1] for _, path in server.requests) == sorted(f'v1/{name}' for name in names)
+
+def test_details_run_concurrently_within_limit(make_finder):
+    with StubServer(detail_routes(20)) as server:
+        make_finder(server).fetch_place_details([f'places/{i}' for i in range(20)])
+    
+    assert 1 < server.peak <= 4
+
+def test_max_in_flight_override(make_finder):
+    with StubServer(detail_routes(10)) as server:
+        make_finder(server).fetch_place_details([f'places/{i}' for i in range(10)], max_in_flight=2)
+    
+    assert server.peak <= 2
+
+def test_single_worker_runs_serially(make_finder):
+    names = [f'places/{i}' for i in range(5)]
+    with StubServer(detail_routes(5)) as server:
+        details = make_finder(server).fetch_place_details(names, max_in_flight=1)
+    
+    assert [detail['name'] for detail in details] == names
+    assert server.peak == 1
+
+def test_search_fetches_details_of_every_hit(make_finder):
+    routes = detail_routes(3, delay=0)
+    routes['/v1/places:searchNearby'] = [(200, {}, 0, {'places': [place(i) for i in range(3)]})]
+    with StubServer(routes) as server:
+        businesses = make_finder(server).search_places('plumbers', 'Leeds, UK')
+    
+    assert [business['name'] for business in businesses] == ['Business 0', 'Business 1', 'Business 2']
+    assert server.requests[0][0] == 'POST'
+    assert server.requests[0][1].endswith('/v1/places:searchNearby')
+
+def test_no_places(make_finder):
+    with StubServer() as server:
+        assert make_finder(server).fetch_place_details([]) == []
+    assert server.requests == []
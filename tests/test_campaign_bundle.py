@@ -0,0 +1,132 @@
+"""Tests for the append-only campaign bundle and its recovery."""
+
+import os
+import json
+import threading
+
+from outreach.campaign_bundle import CampaignBundle, DATA_NAME, INDEX_NAME
+from outreach.outreach_generator import OutreachGenerator
+
+def sizes(directory):
+    return (os.path.getsize(os.path.join(directory, DATA_NAME)),
+            os.path.getsize(os.path.join(directory, INDEX_NAME)))
+
+def test_round_trip_and_latest_copy_wins(tmp_path):
+    with CampaignBundle(str(tmp_path)) as bundle:
+        bundle.extend([('1', 'first'), ('2', 'Café Nero'), ('1', 'second')])
+        assert bundle.get('1') == 'second'
+    
+    with CampaignBundle(str(tmp_path), readonly=True) as bundle:
+        assert bundle.ids() == ['1', '2']
+        assert bundle.get('2') == 'Café Nero'
+        assert bundle.get('3') is None
+
+def test_reader_never_truncates_an_open_writer(tmp_path):
+    directory = str(tmp_path)
+    writer = CampaignBundle(directory)
+    writer.extend([('1', 'one'), ('2', 'two')])
+    writer.flush()
+    
+    # Mid-append: the new email's data is on disk, its index line is still buffered
+    writer.append('3', 'three')
+    writer._data.flush()
+    before = sizes(directory)
+    
+    with CampaignBundle(directory, readonly=True) as reader:
+        assert reader.ids() == ['1', '2']
+        assert sizes(directory) == before
+        
+        # Once the writer flushes, the reader finds the new email on lookup
+        writer.flush()
+        assert reader.get('3') == 'three'
+    writer.close()
+
+def test_reader_ignores_entries_past_end_of_data(tmp_path):
+    directory = str(tmp_path)
+    with CampaignBundle(directory) as bundle:
+        bundle.append('1', 'one')
+    with open(os.path.join(directory, INDEX_NAME), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(['2', 10 ** 6, 100]) + '\n')
+    before = sizes(directory)
+    
+    with CampaignBundle(directory, readonly=True) as bundle:
+        assert bundle.ids() == ['1']
+        assert bundle.get('2') is None
+    assert sizes(directory) == before
+
+def test_writer_repairs_an_interrupted_run(tmp_path):
+    directory = str(tmp_path)
+    with CampaignBundle(directory) as bundle:
+        bundle.extend([('1', 'one'), ('2', 'two')])
+    clean = sizes(directory)
+    with open(os.path.join(directory, DATA_NAME), 'ab') as f:
+        f.write(b'half a member')
+    with open(os.path.join(directory, INDEX_NAME), 'a', encoding='utf-8') as f:
+        f.write('["3", 12')
+    
+    with CampaignBundle(directory) as bundle:
+        assert sizes(directory) == clean
+        bundle.append('3', 'three')
+    
+    with CampaignBundle(directory, readonly=True) as bundle:
+        assert [bundle.get(key) for key in ('1', '2', '3')] == ['one', 'two', 'three']
+
+def test_second_writer_waits_for_the_first(tmp_path):
+    directory = str(tmp_path)
+    first = CampaignBundle(directory)
+    first.append('1', 'one')
+    opened = threading.Event()
+    
+    def open_second():
+        with CampaignBundle(directory) as second:
+            opened.set()
+            assert second.get('1') == 'one'
+    
+    thread = threading.Thread(target=open_second)
+    thread.start()
+    assert not opened.wait(0.2)
+    first.close()
+    thread.join(5)
+    assert opened.is_set()
+
+def test_generator_reuses_one_bundle_per_campaign(tmp_path, monkeypatch):
+    generator = OutreachGenerator()
+    generator.output_dir = str(tmp_path)
+    opened = []
+    open_bundle = generator.open_bundle
+    monkeypatch.setattr(generator, 'open_bundle',
+                        lambda *args, **kwargs: opened.append(kwargs.get('readonly', False)) or open_bundle(*args, **kwargs))
+    
+    for i in range(5):
+        generator.save_email(f'business {i}', f'email {i}', campaign_name='spring')
+    generator.save_batch_emails({'business 5': 'email 5'}, campaign_name='spring')
+    assert generator.load_email('business 3', campaign_name='spring') == 'email 3'
+    assert generator.load_email('business 4', campaign_name='spring') == 'email 4'
+    # One writer for saving and one reader for loading
+    assert opened == [False, True]
+    
+    # A resaved email is seen by the open reader
+    generator.save_email('business 3', 'email 3 again', campaign_name='spring')
+    assert generator.load_email('business 3', campaign_name='spring') == 'email 3 again'
+    
+    # Saved emails are on disk for readers before the generator is closed
+    with CampaignBundle(generator.campaign_dir('spring'), readonly=True) as bundle:
+        assert len(bundle) == 6
+    generator.close()
+
+def test_generator_loads_while_another_writer_holds_the_lock(tmp_path):
+    generator = OutreachGenerator()
+    generator.output_dir = str(tmp_path)
+    writer = CampaignBundle(generator.campaign_dir('spring'))
+    writer.append('1', 'one')
+    writer.flush()
+    loaded = []
+    
+    thread = threading.Thread(target=lambda: loaded.append(generator.load_email('1', campaign_name='spring')),
+                              daemon=True)
+    thread.start()
+    thread.join(2)
+    
+    assert loaded == ['one']
+    writer.close()
+    generator.close()
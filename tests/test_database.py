@@ -0,0 +1,88 @@
+"""Tests for the pooled per-thread SQLite ConnectionManager."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from tools.database import ConnectionManager
+
+@pytest.fixture
+def db(tmp_path):
+    db = ConnectionManager(str(tmp_path / 'outreach.db'), pool_size=2)
+    db.execute("CREATE TABLE visits (id INTEGER PRIMARY KEY)")
+    yield db
+    db.close_all()
+
+def run_in_thread(func):
+    thread = threading.Thread(target=func)
+    thread.start()
+    thread.join()
+
+def test_threaded_server_reuses_connections(db):
+    # Like Flask's threaded server: every request is handled on a new thread
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with db.transaction() as conn:
+                conn.execute("INSERT INTO visits DEFAULT VALUES")
+            self.send_response(200)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        
+        def log_message(self, format, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        for _ in range(20):
+            requests.get(f"http://127.0.0.1:{server.server_address[1]}/", timeout=5).raise_for_status()
+    finally:
+        server.shutdown()
+        server.server_close()
+    
+    assert db.execute("SELECT COUNT(*) FROM visits").fetchone()[0] == 20
+    # The main thread's connection, plus at most a couple while a finished thread is still exiting
+    assert db.connections_opened <= 4
+
+def test_finished_threads_hand_their_connection_on(db):
+    seen = []
+    for _ in range(5):
+        run_in_thread(lambda: seen.append(id(db.connection())))
+    
+    assert len(set(seen)) == 1
+    assert db.connections_opened == 2
+
+def test_pool_is_bounded(db):
+    barrier = threading.Barrier(4)
+    
+    def hold_connection():
+        db.connection()
+        barrier.wait()
+    
+    threads = [threading.Thread(target=hold_connection) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    del threads, thread
+    
+    assert len(db._idle) == 2
+
+def test_release_returns_the_connection_now(db):
+    conn = db.connection()
+    db.release()
+    
+    reused = []
+    run_in_thread(lambda: reused.append(db.connection()))
+    assert reused == [conn]
+    assert db.connections_opened == 1
+
+def test_release_inside_a_transaction_keeps_the_connection(db):
+    with db.transaction() as conn:
+        db.release()
+        assert db.connection() is conn
+        conn.execute("INSERT INTO visits DEFAULT VALUES")
+    
+    assert db.execute("SELECT COUNT(*) FROM visits").fetchone()[0] == 1
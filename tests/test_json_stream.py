@@ -0,0 +1,43 @@
+"""Tests for the streaming JSON array reader."""
+
+import io
+import json
+
+import pytest
+
+from tools.json_stream import iter_json_array
+
+ITEMS = [
+    2.5, -0.125, 1e-07, 6.02e+23, -3, 0, 1234567890, 12.0,
+    True, False, None, "Café Nero", "",
+    {"name": "Zoë's Plumbing", "rating": 4.75, "tags": ["24h", -1.5e3]},
+    [1.25, [2.5e-3, {"lat": 51.5072, "lng": -0.1276}]],
+]
+DOCUMENT = json.dumps(ITEMS)
+GEOJSON = json.dumps({"type": "FeatureCollection", "bbox": [-0.5, 51.25], "features": ITEMS})
+
+@pytest.mark.parametrize('chunk_size', range(1, len(DOCUMENT) + 2))
+def test_every_chunk_size_text(chunk_size):
+    assert list(iter_json_array(io.StringIO(DOCUMENT), chunk_size=chunk_size)) == ITEMS
+
+@pytest.mark.parametrize('chunk_size', range(1, len(DOCUMENT.encode('utf-8')) + 2))
+def test_every_chunk_size_binary(chunk_size):
+    stream = io.BytesIO(DOCUMENT.encode('utf-8'))
+    assert list(iter_json_array(stream, chunk_size=chunk_size)) == ITEMS
+
+@pytest.mark.parametrize('chunk_size', range(1, len(GEOJSON) + 2))
+def test_every_chunk_size_keyed(chunk_size):
+    stream = io.StringIO(GEOJSON)
+    assert list(iter_json_array(stream, key='features', chunk_size=chunk_size)) == ITEMS
+
+@pytest.mark.parametrize('chunk_size', range(1, 12))
+def test_top_level_numbers_split_mid_number(chunk_size):
+    document = '[2.5,1e5,-7.25E-2,3]'
+    assert list(iter_json_array(io.StringIO(document), chunk_size=chunk_size)) == [2.5, 1e5, -7.25e-2, 3]
+
+def test_empty_array():
+    assert list(iter_json_array(io.StringIO(' [ ] '), chunk_size=1)) == []
+
+def test_truncated_document_raises():
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('[1.5, 2'), chunk_size=2))
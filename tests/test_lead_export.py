@@ -0,0 +1,36 @@
+"""Tests for the streaming lead export writers."""
+
+import csv
+import json
+
+import pytest
+
+from tools.lead_export import LeadWriter, export_leads
+
+LEAD = {
+    'name': 'Café Nero', 'phone': '020 7946 0000', 'has_website': False, 'category': 'restaurant',
+    'rating': 4.5, 'email': 'owner@cafenero.co.uk', 'contact_name': 'Zoë Smith',
+    'has_social_media': True, 'social_media': 'https://www.facebook.com/cafenero', 'score': 0.875,
+}
+
+def test_csv_keeps_contact_presence_and_score_columns(tmp_path):
+    path = str(tmp_path / 'leads.csv')
+    
+    assert export_leads([LEAD], path) == 1
+    
+    with open(path, encoding='utf-8') as f:
+        row = next(csv.DictReader(f))
+    for field in ('email', 'contact_name', 'has_social_media', 'social_media', 'score'):
+        assert row[field] == str(LEAD[field])
+
+def test_ndjson_writes_whole_leads(tmp_path):
+    path = str(tmp_path / 'leads.ndjson')
+    
+    export_leads([LEAD, LEAD], path)
+    
+    with open(path, encoding='utf-8') as f:
+        assert [json.loads(line) for line in f] == [LEAD, LEAD]
+
+def test_writer_base_class_is_abstract(tmp_path):
+    with pytest.raises(TypeError):
+        LeadWriter(str(tmp_path / 'leads.csv'))
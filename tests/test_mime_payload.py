@@ -0,0 +1,41 @@
+"""Tests for pre-built MIME payloads."""
+
+from email import policy
+from email.parser import BytesParser
+
+import pytest
+
+from outreach.mime_payload import PayloadBuilder, decompress_payload, date_header
+
+def parse(payload):
+    return BytesParser(policy=policy.default).parsebytes(date_header() + decompress_payload(payload))
+
+@pytest.mark.parametrize('from_email, subject', [
+    ('Sam Smith <sam@example.com>', 'Boost Your Online Presence for Smith Plumbing'),
+    ('Zoë Smith <zoe@example.com>', 'Boost Your Online Presence for Café Nero'),
+])
+def test_payload_round_trips(from_email, subject):
+    builder = PayloadBuilder(from_email, reply_to='Zoë <replies@example.com>')
+    content = "Dear owner of Café Nero,\n\nA website would help customers find you.\n"
+    
+    tracking_id, message_id, payload = builder.build('owner@cafenero.co.uk', subject, content)
+    raw = decompress_payload(payload)
+    msg = parse(payload)
+    
+    assert raw.isascii()
+    assert b'\n' not in raw.replace(b'\r\n', b'')
+    assert msg['Subject'] == subject
+    assert msg['From'] == from_email
+    assert msg['Reply-To'] == 'Zoë <replies@example.com>'
+    assert msg['Message-ID'] == message_id == f'<{tracking_id}@example.com>'
+    assert msg['X-Tracking-ID'] == tracking_id
+    assert msg['Date']
+    assert msg.get_content_type() == 'multipart/mixed'
+    parts = list(msg.iter_parts())
+    assert len(parts) == 1
+    assert parts[0].get_content().replace('\r\n', '\n') == content
+
+def test_tracking_id_is_kept():
+    _, message_id, _ = PayloadBuilder('sam@example.com').build('owner@example.com', 'Hi', 'Hello', 'abc123')
+    
+    assert message_id == '<abc123@example.com>'
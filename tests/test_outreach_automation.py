@@ -0,0 +1,63 @@
+"""Tests for campaign email generation in OutreachAutomation."""
+
+import sqlite3
+
+import pytest
+
+from outreach import outreach_automation
+from outreach.outreach_automation import OutreachAutomation
+from outreach.outreach_generator import OutreachGenerator
+
+LEADS = [
+    {'name': 'Café Nero', 'category': 'restaurant', 'location': 'London, UK', 'email': 'owner@cafenero.co.uk'},
+    {'name': 'Smith Plumbing', 'category': 'plumber', 'location': 'Leeds, UK', 'email': 'sam@smithplumbing.co.uk'},
+]
+
+@pytest.fixture
+def automation(tmp_path):
+    automation = OutreachAutomation(email_config={'from_email': 'Zoë Smith <zoe@example.com>'},
+                                    db_path=str(tmp_path / 'outreach.db'))
+    automation.import_leads(LEADS)
+    campaign_id = automation.create_campaign('Spring', 'Test campaign', 'initial_contact.txt')
+    automation.add_businesses_to_campaign(campaign_id)
+    automation.campaign_id = campaign_id
+    yield automation
+    automation.db.close_all()
+
+def assert_not_write_locked(db_path):
+    """Take and release the write lock from another connection, failing if it is held."""
+    conn = sqlite3.connect(db_path, timeout=0)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.rollback()
+    finally:
+        conn.close()
+
+def test_rendering_runs_outside_the_write_transaction(automation, monkeypatch):
+    generate_email = OutreachGenerator.generate_email
+    build = outreach_automation.PayloadBuilder.build
+    
+    def checked_generate(self, *args, **kwargs):
+        assert_not_write_locked(automation.db_path)
+        return generate_email(self, *args, **kwargs)
+    
+    def checked_build(self, *args, **kwargs):
+        assert_not_write_locked(automation.db_path)
+        return build(self, *args, **kwargs)
+    
+    monkeypatch.setattr(OutreachGenerator, 'generate_email', checked_generate)
+    monkeypatch.setattr(outreach_automation.PayloadBuilder, 'build', checked_build)
+    
+    assert automation.generate_campaign_emails(automation.campaign_id, prebuild_mime=True) == 2
+    
+    rows = automation.db.execute(
+        "SELECT content, mime_payload FROM emails WHERE campaign_id = ?", (automation.campaign_id,)
+    ).fetchall()
+    assert len(rows) == 2
+    assert all(content and payload for content, payload in rows)
+
+def test_generated_emails_are_not_regenerated(automation):
+    assert automation.generate_campaign_emails(automation.campaign_id) == 2
+    assert automation.generate_campaign_emails(automation.campaign_id) == 0
+    assert automation.prebuild_campaign_payloads(automation.campaign_id) == 2
+    assert automation.prebuild_campaign_payloads(automation.campaign_id) == 0
@@ -0,0 +1,141 @@
+"""Tests for PresenceProber against a local HTTP stub server and a stub resolver."""
+
+import time
+
+import pytest
+
+from tools.presence_prober import PresenceProber
+from tools.response_cache import ResponseCache
+from stub_server import StubServer
+
+def resolver(*hosts):
+    """Stub DNS: only the given hosts resolve."""
+    return lambda host: host in hosts
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.db'))
+    yield cache
+    cache.close()
+
+def probe(server, lead, resolve=resolver(), **kwargs):
+    prober = PresenceProber(max_workers=4, timeout=0.5, resolver=resolve, base_url=server.url,
+                            tlds=['.co.uk'], **kwargs)
+    try:
+        return prober.probe([dict(lead)])[0], prober.stats()
+    finally:
+        prober.close()
+
+def test_resolving_domain_that_serves_a_site():
+    routes = {'smithplumbing.co.uk/': [(200, {})]}
+    with StubServer(routes) as server:
+        lead, stats = probe(server, {'name': 'Smith Plumbing'}, resolver('smithplumbing.co.uk'))
+    
+    assert lead['has_website'] is True
+    assert lead['website'] == 'https://smithplumbing.co.uk'
+    assert stats['websites_found'] == 1
+
+@pytest.mark.parametrize('status', [301, 302, 403, 405, 429])
+def test_site_redirects_and_refusals_count_as_present(status):
+    routes = {'smithplumbing.co.uk/': [(status, {'Location': 'https://www.smithplumbing.co.uk/'})]}
+    with StubServer(routes) as server:
+        lead, _ = probe(server, {'name': 'Smith Plumbing'}, resolver('smithplumbing.co.uk'))
+    
+    assert lead['has_website'] is True
+
+def test_unresolvable_domain_is_not_requested():
+    with StubServer() as server:
+        lead, _ = probe(server, {'name': 'Smith Plumbing'}, social_profiles={})
+    
+    assert not lead.get('has_website')
+    assert server.requests == []
+
+def test_existing_profile_is_found():
+    routes = {'www.facebook.com/smithplumbing': [(200, {})]}
+    with StubServer(routes) as server:
+        lead, stats = probe(server, {'name': 'Smith Plumbing'})
+    
+    assert lead['has_social_media'] is True
+    assert lead['social_media'] == 'https://www.facebook.com/smithplumbing'
+    assert stats['social_found'] == 1
+
+@pytest.mark.parametrize('status', [301, 302, 429, 403, 500])
+def test_login_redirects_and_throttling_are_not_profiles(status):
+    # Unknown profiles are answered with a login redirect or a rate limit
+    response = (status, {'Location': 'https://www.instagram.com/accounts/login/'})
+    routes = {'www.facebook.com/smithplumbing': [response], 'www.instagram.com/smithplumbing': [response]}
+    with StubServer(routes) as server:
+        lead, stats = probe(server, {'name': 'Smith Plumbing'})
+    
+    assert lead['has_social_media'] is False
+    assert stats['unknown'] == 2
+
+def test_missing_profile_is_absent():
+    with StubServer() as server:
+        lead, stats = probe(server, {'name': 'Smith Plumbing'})
+    
+    assert lead['has_social_media'] is False
+    assert stats['unknown'] == 0
+
+def test_definite_results_are_cached(cache):
+    routes = {'smithplumbing.co.uk/': [(200, {})], 'www.facebook.com/smithplumbing': [(200, {})]}
+    with StubServer(routes) as server:
+        probe(server, {'name': 'Smith Plumbing'}, resolver('smithplumbing.co.uk'), cache=cache)
+        first = len(server.requests)
+        lead, stats = probe(server, {'name': 'Smith Plumbing'}, resolver('smithplumbing.co.uk'), cache=cache)
+    
+    assert first == 3
+    assert len(server.requests) == first
+    assert stats['lookups'] == 0
+    assert lead['has_website'] and lead['has_social_media']
+
+def test_timeouts_and_inconclusive_results_are_not_cached(cache):
+    routes = {
+        'smithplumbing.co.uk/': [(200, {}, 1.0)],
+        'www.facebook.com/smithplumbing': [(302, {'Location': '/login'})],
+        'www.instagram.com/smithplumbing': [(429, {})],
+    }
+    with StubServer(routes) as server:
+        lead, stats = probe(server, {'name': 'Smith Plumbing'}, resolver('smithplumbing.co.uk'), cache=cache)
+        assert stats['errors'] == 1
+        assert stats['unknown'] == 3
+        assert not lead.get('has_website')
+        
+        # The next run probes everything again instead of trusting a cached "absent"
+        server.routes['smithplumbing.co.uk/'] = [(200, {})]
+        lead, stats = probe(server, {'name': 'Smith Plumbing'}, resolver('smithplumbing.co.uk'), cache=cache)
+    
+    assert stats['lookups'] == 3
+    assert lead['has_website'] is True
+
+def test_slow_dns_lookup_is_unknown_not_absent(cache):
+    def slow_resolver(host):
+        time.sleep(2)
+        return True
+    
+    with StubServer() as server:
+        started = time.time()
+        lead, stats = probe(server, {'name': 'Smith Plumbing'}, slow_resolver, cache=cache, social_profiles={})
+        elapsed = time.time() - started
+    
+    assert elapsed < 1.5
+    # smithplumbing.co.uk and smith-plumbing.co.uk
+    assert stats['unknown'] == 2
+    assert not lead.get('has_website')
+    assert server.requests == []
+    # The timed-out lookup is not cached as an absent domain
+    assert cache.stats()['entries'] == 0
+
+def test_shared_candidates_are_probed_once():
+    leads = [{'name': 'Smith Plumbing'}, {'name': 'Smith Plumbing'}, {'name': 'smith  plumbing'}]
+    with StubServer() as server:
+        prober = PresenceProber(max_workers=4, timeout=0.5, resolver=resolver('smithplumbing.co.uk'),
+                                base_url=server.url, tlds=['.co.uk'])
+        prober.probe(leads)
+        prober.close()
+    
+    assert sorted(server.requests) == sorted([
+        ('HEAD', 'smithplumbing.co.uk/'),
+        ('HEAD', 'www.facebook.com/smithplumbing'),
+        ('HEAD', 'www.instagram.com/smithplumbing'),
+    ])
@@ -0,0 +1,117 @@
+"""Tests for the shared token-bucket RateLimiter."""
+
+import time
+import threading
+
+import pytest
+import requests
+
+from tools.rate_limiter import RateLimiter, RateLimitError
+from stub_server import StubServer
+
+@pytest.fixture
+def bucket_path(tmp_path):
+    return str(tmp_path / 'rate_limits.db')
+
+def get(url):
+    response = requests.get(url, timeout=5)
+    response.raise_for_status()
+    return response.status_code
+
+def test_burst_then_refill(bucket_path):
+    limiter = RateLimiter('refill', rate=20, capacity=5, path=bucket_path)
+    
+    # A full bucket serves the whole burst without waiting
+    assert sum(limiter.acquire() for _ in range(5)) == 0
+    
+    # The next token takes 1/rate seconds to refill
+    waited = limiter.acquire()
+    assert 0.03 <= waited <= 0.2
+    
+    # Idle time refills the bucket, but never beyond capacity
+    time.sleep(0.5)
+    assert sum(limiter.acquire() for _ in range(5)) == 0
+    assert limiter.acquire() > 0
+    limiter.close()
+
+def test_limiters_share_a_bucket(bucket_path):
+    first = RateLimiter('shared', rate=10, capacity=2, path=bucket_path)
+    second = RateLimiter('shared', rate=10, capacity=2, path=bucket_path)
+    
+    assert first.acquire() == 0
+    assert first.acquire() == 0
+    assert second.acquire() > 0
+    first.close()
+    second.close()
+
+def test_request_larger_than_capacity_raises(bucket_path):
+    limiter = RateLimiter('oversize', rate=10, capacity=3, path=bucket_path)
+    
+    with pytest.raises(ValueError):
+        limiter.acquire(tokens=4)
+    with pytest.raises(ValueError):
+        limiter.call(lambda: None, tokens=4)
+    assert limiter.acquire(tokens=3) == 0
+    limiter.close()
+
+def test_429_retry_after_backs_off_and_retries(bucket_path):
+    routes = {'/search': [(429, {'Retry-After': '0.2'}), (429, {'Retry-After': '0.2'}), (200, {})]}
+    limiter = RateLimiter('throttled', rate=100, capacity=10, path=bucket_path, base_delay=0.01)
+    
+    with StubServer(routes) as server:
+        started = time.time()
+        assert limiter.call(lambda: get(server.url + '/search')) == 200
+        elapsed = time.time() - started
+    
+    assert len(server.requests) == 3
+    assert elapsed >= 0.4
+    stats = limiter.stats()
+    assert stats['throttles'] == 2
+    assert stats['retries'] == 2
+    limiter.close()
+
+def test_429_pauses_every_limiter_on_the_bucket(bucket_path):
+    routes = {'/search': [(429, {'Retry-After': '0.5'}), (200, {})]}
+    first = RateLimiter('paused', rate=100, capacity=10, path=bucket_path)
+    second = RateLimiter('paused', rate=100, capacity=10, path=bucket_path)
+    results = []
+    
+    with StubServer(routes) as server:
+        thread = threading.Thread(target=lambda: results.append(first.call(lambda: get(server.url + '/search'))))
+        thread.start()
+        deadline = time.time() + 5
+        while first.stats()['throttles'] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        
+        # A limiter that never saw the 429 still waits out the pause it caused
+        assert second.acquire() >= 0.2
+        thread.join(5)
+    
+    assert results == [200]
+    assert len(server.requests) == 2
+    first.close()
+    second.close()
+
+def test_transient_errors_give_up_after_max_retries(bucket_path):
+    routes = {'/search': [(503, {})]}
+    limiter = RateLimiter('flaky', rate=100, capacity=10, path=bucket_path, max_retries=2, base_delay=0.01)
+    
+    with StubServer(routes) as server:
+        with pytest.raises(RateLimitError):
+            limiter.call(lambda: get(server.url + '/search'))
+    
+    assert len(server.requests) == 3
+    assert limiter.stats()['retries'] == 2
+    limiter.close()
+
+def test_client_errors_are_not_retried(bucket_path):
+    limiter = RateLimiter('missing', rate=100, capacity=10, path=bucket_path)
+    
+    with StubServer() as server:
+        with pytest.raises(requests.HTTPError):
+            limiter.call(lambda: get(server.url + '/unknown'))
+    
+    assert len(server.requests) == 1
+    assert limiter.stats()['retries'] == 0
+    limiter.close()
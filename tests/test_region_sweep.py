@@ -0,0 +1,60 @@
+"""Tests for resuming an interrupted region sweep."""
+
+import json
+
+from tools.region_sweep import RegionSweep
+
+CELLS = [{'id': i, 'lat': 51.5 + i / 100, 'lng': -0.1, 'radius': 500} for i in range(4)]
+
+def cell_leads(cell):
+    return [{'name': f"Business {cell['id']}-{n}", 'place_id': f"{cell['id']}-{n}"} for n in range(2)]
+
+class StubFinder:
+    """Answers each cell search with two leads, recording the cells searched."""
+    
+    def __init__(self):
+        self.searched = []
+    
+    def iter_places(self, query, location, radius, page_size, exclude_place_ids):
+        cell = next(cell for cell in CELLS if location == f"{cell['lat']},{cell['lng']}")
+        self.searched.append(cell['id'])
+        return [lead for lead in cell_leads(cell) if lead['place_id'] not in exclude_place_ids]
+
+def read_leads(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+def test_resume_after_a_crash_mid_write(tmp_path):
+    checkpoint = str(tmp_path / 'sweep.json')
+    crashed = RegionSweep(StubFinder(), 'plumbers', CELLS, checkpoint, workers=1)
+    # Cells 0-2 reached the leads file, the checkpoint only records 0-1, and
+    # the crash cut cell 3's first lead off mid-line
+    crashed.completed_cells = {0, 1}
+    crashed._write_checkpoint()
+    with open(crashed.leads_path, 'w', encoding='utf-8') as f:
+        for cell in CELLS[:3]:
+            for lead in cell_leads(cell):
+                f.write(json.dumps(lead) + '\n')
+        f.write(json.dumps(cell_leads(CELLS[3])[0])[:20])
+    
+    finder = StubFinder()
+    summary = RegionSweep(finder, 'plumbers', CELLS, checkpoint, workers=1).run()
+    
+    assert sorted(finder.searched) == [2, 3]
+    assert summary['new_leads'] == 2
+    assert summary['completed_cells'] == 4
+    assert [lead['place_id'] for lead in read_leads(crashed.leads_path)] == [
+        lead['place_id'] for cell in CELLS for lead in cell_leads(cell)
+    ]
+
+def test_last_lead_missing_its_newline_is_kept(tmp_path):
+    checkpoint = str(tmp_path / 'sweep.json')
+    sweep = RegionSweep(StubFinder(), 'plumbers', CELLS, checkpoint, workers=1)
+    sweep._write_checkpoint()
+    with open(sweep.leads_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(cell_leads(CELLS[0])[0]))
+    
+    sweep.run()
+    
+    place_ids = [lead['place_id'] for lead in read_leads(sweep.leads_path)]
+    assert sorted(place_ids) == sorted(lead['place_id'] for cell in CELLS for lead in cell_leads(cell))
@@ -0,0 +1,57 @@
+"""Tests for the persistent ResponseCache."""
+
+import time
+
+import pytest
+
+from tools.response_cache import ResponseCache
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.db'), max_entries=3)
+    yield cache
+    cache.close()
+
+def test_overwrites_do_not_grow_the_size(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.db'))
+    for i in range(5):
+        cache.set('place', {'name': 'Café Nero', 'visit': i})
+        cache.set_many({'a': i, 'b': i})
+    
+    assert cache.stats()['entries'] == 3
+    assert cache.get('place') == {'name': 'Café Nero', 'visit': 4}
+    assert cache.get_many(['a', 'b']) == {'a': 4, 'b': 4}
+    cache.close()
+
+def test_expired_entries_are_misses(cache):
+    cache.set('fresh', 1)
+    cache.set('stale', 2, ttl=0.05)
+    time.sleep(0.1)
+    
+    assert cache.get('stale') is None
+    assert cache.get('fresh') == 1
+    assert cache.get_many(['fresh', 'stale']) == {'fresh': 1}
+    assert cache.stats()['entries'] == 1
+
+def test_least_recently_used_entry_is_evicted(cache):
+    for key in ('a', 'b', 'c'):
+        cache.set(key, key)
+        time.sleep(0.01)
+    # The hit is only buffered in memory, but eviction must still see it
+    assert cache.get('a') == 'a'
+    
+    cache.set('d', 'd')
+    
+    assert cache.get('b') is None
+    assert [cache.get(key) for key in ('a', 'c', 'd')] == ['a', 'c', 'd']
+    assert cache.stats()['entries'] == 3
+
+def test_get_many_and_set_many_round_trip(cache):
+    cache.set_many({'a': [1, 2], 'b': {'x': None}})
+    
+    assert cache.get_many(['a', 'b', 'missing', 'a']) == {'a': [1, 2], 'b': {'x': None}}
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (2, 1, 2)
+    
+    cache.set_many({})
+    assert cache.stats()['entries'] == 2
@@ -0,0 +1,51 @@
+"""Tests for the outreach schema migrations and hot query plans."""
+
+import sqlite3
+
+import pytest
+
+from outreach.schema import SCHEMA_VERSION, HOT_QUERIES, migrate_database, check_query_plans, assert_query_plans
+from tools.database import get_database
+
+@pytest.fixture
+def db(tmp_path):
+    db = get_database(str(tmp_path / 'outreach.db'))
+    yield db
+    db.close_all()
+
+def columns(db, table):
+    return {row[1] for row in db.execute(f"PRAGMA table_info({table})")}
+
+def test_migrations_are_applied_once(db):
+    assert migrate_database(db) == SCHEMA_VERSION
+    assert migrate_database(db) == SCHEMA_VERSION
+    assert db.user_version() == SCHEMA_VERSION
+
+def test_hot_queries_use_their_indexes(db):
+    migrate_database(db)
+    
+    assert_query_plans(db.db_path)
+
+def test_dropped_index_is_reported(db):
+    migrate_database(db)
+    with db.transaction() as conn:
+        conn.execute("DROP INDEX idx_businesses_name_phone")
+    
+    failures = check_query_plans(db.db_path)
+    assert set(failures) == {name for name, (_, index) in HOT_QUERIES.items() if index == 'idx_businesses_name_phone'}
+
+def test_unversioned_database_is_upgraded(db):
+    # A database created before the rating, coordinate and payload columns existed
+    conn = sqlite3.connect(db.db_path)
+    conn.execute("CREATE TABLE businesses (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, phone TEXT)")
+    conn.execute("CREATE TABLE emails (id INTEGER PRIMARY KEY AUTOINCREMENT, business_id INTEGER, campaign_id INTEGER, "
+                 "status TEXT DEFAULT 'pending', scheduled_time TIMESTAMP)")
+    conn.execute("INSERT INTO businesses (name, phone) VALUES ('Café Nero', '020 7946 0000')")
+    conn.commit()
+    conn.close()
+    
+    assert migrate_database(db) == SCHEMA_VERSION
+    
+    assert {'rating', 'review_count', 'latitude', 'longitude'} <= columns(db, 'businesses')
+    assert {'message_id', 'mime_payload'} <= columns(db, 'emails')
+    assert db.execute("SELECT name FROM businesses").fetchall() == [('Café Nero',)]
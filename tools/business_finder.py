@@ -7,21 +7,75 @@ It uses Google Maps data and provides filtering options to identify potential cl
 """
 
 import os
+import sys
 import json
 import time
-import pandas as pd
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from datetime import datetime
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+
+try:
+    from googleapiclient.discovery import build
+    from googleapiclient.errors import HttpError
+except ImportError:
+    # Without the discovery client every Places call goes over plain HTTP
+    build = None
+    HttpError = requests.HTTPError
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.response_cache import ResponseCache
+from tools.lead_export import EXPORT_FORMATS, LEAD_FIELDS, export_leads
+from tools.lead_index import LeadIndex
+from tools.lead_scoring import LeadScorer
+from tools.lead_dedup import LeadDeduplicator
+from tools.rate_limiter import RateLimiter, RateLimitError
+from tools.osm_source import OsmExtractReader
+from tools.postcode_index import PostcodeIndex
+
+# Default Places quota: 600 requests per minute, with short bursts allowed
+PLACES_RATE = 10.0
+PLACES_BURST = 20
+
+# Places API (New) base URL and per-request timeout in seconds for plain HTTP calls
+PLACES_API_URL = 'https://places.googleapis.com'
+PLACES_TIMEOUT = 10
 
 class BusinessFinder:
     """Tool to find businesses without websites in specified locations."""
     
-    def __init__(self, api_key=None):
-        """Initialize the BusinessFinder with optional API key."""
+    def __init__(self, api_key=None, max_in_flight=8, places_endpoint=None, cache=None, cache_only=False,
+                 dedupe=True, rate_limiter=None, osm_extract=None, postcode_index=None, prober=None):
+        """
+        Initialize the BusinessFinder.
+        
+        Args:
+            api_key (str): Optional Google Maps API key
+            max_in_flight (int): Maximum number of concurrent Places detail requests
+            places_endpoint (str): Optional Places API base URL (e.g. a local stub server), called over plain HTTP
+            cache (ResponseCache): Optional persistent cache for Places responses
+            cache_only (bool): Serve Places data from the cache only, never calling the API
+            dedupe (bool): Drop leads that duplicate ones already in self.results
+            rate_limiter (RateLimiter): Limiter pacing Places requests (default: shared 'places' bucket)
+            osm_extract (str): Optional local OpenStreetMap extract (.osm/.geojson) used instead of the API
+            postcode_index (PostcodeIndex): Geocodes leads without coordinates (default: data/postcodes.idx if built)
+            prober (PresenceProber): Optional prober checking leads for websites and social media
+        """
         self.api_key = api_key
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.places_endpoint = places_endpoint
+        self.cache = cache
+        self.cache_only = cache_only
+        self.rate_limiter = rate_limiter or RateLimiter('places', rate=PLACES_RATE, capacity=PLACES_BURST)
+        self.osm_extract = osm_extract
+        self.postcode_index = postcode_index or PostcodeIndex.open_default()
+        self.prober = prober
         self.results = []
+        self.deduplicator = LeadDeduplicator() if dedupe else None
+        self._index = None
+        self._local = threading.local()
         self.output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
         os.makedirs(self.output_dir, exist_ok=True)
         
@@ -37,54 +91,316 @@ class BusinessFinder:
         Returns:
             list: List of business data dictionaries
         """
-        if not self.api_key:
+        if not self.api_key and not self.cache_only:
             print("Warning: No API key provided. Using manual search method instead.")
             return self.find_businesses_manual(query, location, max_results)
             
         try:
-            # Build the Places API service
-            places_service = build('places', 'v1', developerKey=self.api_key)
-            
-            # Perform the search
-            search_request = places_service.places().searchNearby(
-                location=location,
-                keyword=query,
-                radius=5000,  # 5km radius
-                maxResults=max_results
-            )
-            search_response = search_request.execute()
-            
-            # Process results
-            businesses = []
-            for place in search_response.get('places', []):
-                # Get detailed information for each place
-                detail_request = places_service.places().get(name=place['name'])
-                detail_response = detail_request.execute()
-                
-                # Check if the business has a website
-                has_website = 'websiteUri' in detail_response
-                
-                business_data = {
-                    'name': detail_response.get('displayName', {}).get('text', ''),
-                    'address': detail_response.get('formattedAddress', ''),
-                    'phone': detail_response.get('internationalPhoneNumber', ''),
-                    'has_website': has_website,
-                    'website': detail_response.get('websiteUri', ''),
-                    'category': ', '.join([c.get('displayName', {}).get('text', '') for c in detail_response.get('primaryTypeDisplayName', [])]),
-                    'rating': detail_response.get('rating', 0),
-                    'location': location,
-                    'source': 'Google Maps API'
-                }
-                
-                if not has_website:
-                    businesses.append(business_data)
-            
+            # Follow next-page tokens until max_results new leads are collected
+            businesses = list(islice(
+                self._unique(self._geocode(self.iter_places(query, location, page_size=min(max_results, 20)))),
+                max_results
+            ))
             self.results.extend(businesses)
             return businesses
             
-        except HttpError as e:
+        except (HttpError, requests.RequestException, RateLimitError) as e:
+            # Never substitute sample data for a failed live search
             print(f"Error accessing Google Places API: {e}")
-            return self.find_businesses_manual(query, location, max_results)
+            return []
+    
+    def iter_businesses(self, query, location, limit=None, radius=5000, page_size=20):
+        """
+        Stream businesses without websites as they arrive, following next-page tokens.
+        
+        Leads are yielded page by page and are not recorded in self.results,
+        so downstream stages can start before the search finishes and memory
+        stays flat. With an OSM extract the extract is streamed instead of
+        calling the API; without an API key the simulated manual source is used.
+        API errors are raised to the caller rather than replaced with
+        simulated data.
+        
+        Args:
+            query (str): Type of business (e.g., 'restaurants', 'plumbers')
+            location (str): Location to search in (e.g., 'London, UK')
+            limit (int): Optional maximum number of leads to yield
+            radius (int): Search radius in metres
+            page_size (int): Number of search hits requested per page
+            
+        Yields:
+            dict: Business data dictionaries
+        """
+        if self.osm_extract:
+            businesses = OsmExtractReader(self.osm_extract, query, location)
+        elif not self.api_key and not self.cache_only:
+            businesses = self._iter_manual_businesses(query, location, limit or 20)
+        else:
+            businesses = self.iter_places(query, location, radius=radius, page_size=page_size)
+        
+        yield from islice(self._geocode(businesses), limit)
+    
+    def iter_places(self, query, location, radius=5000, page_size=20, exclude_place_ids=None, max_pages=None):
+        """
+        Stream Places nearby search hits without websites, page by page.
+        
+        Unlike find_businesses_google_maps this neither records the results
+        nor falls back to simulated data, so API errors reach the caller.
+        
+        Args:
+            query (str): Type of business (e.g., 'restaurants', 'plumbers')
+            location (str): Location to search around (address or 'lat,lng')
+            radius (int): Search radius in metres
+            page_size (int): Number of search hits requested per page
+            exclude_place_ids (set): Place IDs to skip without fetching details
+            max_pages (int): Optional maximum number of pages to follow
+            
+        Yields:
+            dict: Business data dictionaries
+        """
+        page_token = None
+        pages = 0
+        while True:
+            businesses, page_token = self._search_page(
+                query, location, radius, page_size, page_token, exclude_place_ids
+            )
+            yield from businesses
+            
+            pages += 1
+            if not page_token or (max_pages and pages >= max_pages):
+                return
+    
+    def search_places(self, query, location, radius=5000, max_results=20, exclude_place_ids=None):
+        """
+        Run one Places nearby search and return the hits without websites.
+        
+        Args:
+            query (str): Type of business (e.g., 'restaurants', 'plumbers')
+            location (str): Location to search around (address or 'lat,lng')
+            radius (int): Search radius in metres
+            max_results (int): Maximum number of search hits to request
+            exclude_place_ids (set): Place IDs to skip without fetching details
+            
+        Returns:
+            list: List of business data dictionaries
+        """
+        return list(self.iter_places(
+            query, location, radius=radius, page_size=max_results,
+            exclude_place_ids=exclude_place_ids, max_pages=1
+        ))
+    
+    def _search_page(self, query, location, radius, page_size, page_token=None, exclude_place_ids=None):
+        """
+        Fetch one page of nearby search results and their details.
+        
+        Args:
+            query (str): Type of business
+            location (str): Location to search around
+            radius (int): Search radius in metres
+            page_size (int): Number of search hits requested
+            page_token (str): Token of the page to fetch, None for the first page
+            exclude_place_ids (set): Place IDs to skip without fetching details
+            
+        Returns:
+            tuple: (list of business data dictionaries, next page token or None)
+        """
+        params = {
+            'location': location,
+            'keyword': query,
+            'radius': radius,
+            'maxResults': page_size
+        }
+        if page_token:
+            params['pageToken'] = page_token
+        
+        search_key = ResponseCache.make_key('searchNearby', query, location, radius, page_size, page_token)
+        search_response = self._cached_call(
+            search_key,
+            lambda: self._places_request('POST', 'places:searchNearby', params)
+        )
+        if search_response is None:
+            print(f"No cached search results for {query} in {location}")
+            return [], None
+        
+        places = search_response.get('places', [])
+        if exclude_place_ids:
+            places = [p for p in places if self._place_id(p) not in exclude_place_ids]
+        
+        # Fetch details for every hit concurrently, keeping search order
+        details = self.fetch_place_details([place['name'] for place in places])
+        
+        businesses = []
+        for detail_response in details:
+            if detail_response is None:
+                continue
+            business_data = self._place_to_business(detail_response, location)
+            if not business_data['has_website']:
+                businesses.append(business_data)
+        return businesses, search_response.get('nextPageToken')
+    
+    @staticmethod
+    def _place_id(place):
+        """Get the place ID from a Places search hit or details response."""
+        return place.get('id') or place.get('name', '').split('/')[-1]
+    
+    def _get_places_service(self):
+        """
+        Get a Places API service for the current thread.
+        
+        The discovery client is not thread-safe, so each worker thread builds
+        and keeps its own service object.
+        
+        Returns:
+            Resource: Google Places API service
+        """
+        service = getattr(self._local, 'places_service', None)
+        if service is None:
+            service = build('places', 'v1', developerKey=self.api_key)
+            self._local.places_service = service
+        return service
+    
+    def _places_request(self, method, resource, body=None):
+        """
+        Call a Places API method.
+        
+        Uses the discovery client when it is installed and no endpoint override
+        is set; otherwise posts to the REST endpoint directly, so a local stub
+        server or a machine without googleapiclient sees the same requests.
+        
+        Args:
+            method (str): 'GET' for a place resource, 'POST' for a search
+            resource (str): Resource path under /v1 (e.g. 'places/ChIJ...' or 'places:searchNearby')
+            body (dict): Request body for searches
+            
+        Returns:
+            dict: Decoded API response
+        """
+        if build is not None and not self.places_endpoint:
+            places = self._get_places_service().places()
+            if method == 'GET':
+                return places.get(name=resource).execute()
+            return places.searchNearby(**body).execute()
+        
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({'X-Goog-Api-Key': self.api_key or '', 'X-Goog-FieldMask': '*'})
+            self._local.session = session
+        url = f"{(self.places_endpoint or PLACES_API_URL).rstrip('/')}/v1/{resource}"
+        response = session.request(method, url, json=body, timeout=PLACES_TIMEOUT)
+        # HTTPError carries the response, so the rate limiter sees 429s and their Retry-After
+        response.raise_for_status()
+        return response.json()
+    
+    def _cached_call(self, key, fetch):
+        """
+        Serve a Places response from the cache, fetching and storing it on a miss.
+        
+        Args:
+            key (str): Cache key for the request
+            fetch (callable): Function performing the API request
+            
+        Returns:
+            dict: API response, or None on a miss in cache-only mode
+        """
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        if self.cache_only:
+            return None
+        
+        # Paced by the shared token bucket; 429s and 5xx errors are retried with backoff
+        response = self.rate_limiter.call(fetch)
+        if self.cache is not None:
+            self.cache.set(key, response)
+        return response
+    
+    def _get_place_details(self, place_name):
+        """
+        Fetch the details for a single place.
+        
+        Args:
+            place_name (str): Places resource name (e.g. 'places/ChIJ...')
+            
+        Returns:
+            dict: Place details response, or None on a miss in cache-only mode
+        """
+        return self._cached_call(
+            ResponseCache.make_key('place', place_name),
+            lambda: self._places_request('GET', place_name)
+        )
+    
+    def fetch_place_details(self, place_names, max_in_flight=None):
+        """
+        Fetch place details concurrently with a bounded number of requests in flight.
+        
+        Args:
+            place_names (list): Places resource names to look up
+            max_in_flight (int): Optional override for the concurrency limit
+            
+        Returns:
+            list: Place details responses, in the same order as place_names
+                  (None for cache misses in cache-only mode)
+        """
+        place_names = list(place_names)
+        if not place_names:
+            return []
+        
+        workers = min(max_in_flight or self.max_in_flight, len(place_names))
+        if workers == 1:
+            return [self._get_place_details(name) for name in place_names]
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._get_place_details, place_names))
+    
+    def _place_to_business(self, detail_response, location):
+        """
+        Convert a Places details response into a business data dictionary.
+        
+        Args:
+            detail_response (dict): Place details response
+            location (str): Location the search was run for
+            
+        Returns:
+            dict: Business data dictionary
+        """
+        return {
+            'name': detail_response.get('displayName', {}).get('text', ''),
+            'address': detail_response.get('formattedAddress', ''),
+            'phone': detail_response.get('internationalPhoneNumber', ''),
+            'has_website': 'websiteUri' in detail_response,
+            'website': detail_response.get('websiteUri', ''),
+            'category': ', '.join([c.get('displayName', {}).get('text', '') for c in detail_response.get('primaryTypeDisplayName', [])]),
+            'rating': detail_response.get('rating', 0),
+            'review_count': detail_response.get('userRatingCount', 0),
+            'location': location,
+            'source': 'Google Maps API',
+            'place_id': self._place_id(detail_response),
+            'latitude': detail_response.get('location', {}).get('latitude'),
+            'longitude': detail_response.get('location', {}).get('longitude')
+        }
+    
+    def find_businesses_osm(self, query, location='', max_results=None):
+        """
+        Find businesses without websites in a local OpenStreetMap extract.
+        
+        The extract is streamed, so memory use does not grow with its size.
+        
+        Args:
+            query (str): Type of business (e.g., 'restaurants', 'plumbers'); empty for all
+            location (str): Location label for the leads
+            max_results (int): Optional maximum number of results to return
+            
+        Returns:
+            list: List of business data dictionaries
+        """
+        print(f"Scanning {self.osm_extract} for {query or 'businesses'} without website...")
+        
+        leads = OsmExtractReader(self.osm_extract, query, location)
+        businesses = list(islice(self._unique(self._geocode(leads)), max_results))
+        self.results.extend(businesses)
+        return businesses
     
     def find_businesses_manual(self, query, location, max_results=20):
         """
@@ -100,11 +416,54 @@ class BusinessFinder:
         """
         print(f"Searching for {query} in {location} without website...")
         
+        sample_businesses = list(self._unique(self._geocode(self._iter_manual_businesses(query, location, max_results))))
+        self.results.extend(sample_businesses)
+        return sample_businesses
+    
+    def _unique(self, businesses):
+        """
+        Drop leads that duplicate ones already recorded.
+        
+        Args:
+            businesses (iterable): Business data dictionaries
+            
+        Returns:
+            iterable: Leads not seen before (all of them when dedupe is off)
+        """
+        if self.deduplicator is None:
+            return businesses
+        return self.deduplicator.filter(businesses)
+    
+    def _geocode(self, businesses):
+        """
+        Attach coordinates from the local postcode index to leads without any.
+        
+        Args:
+            businesses (iterable): Business data dictionaries
+            
+        Returns:
+            iterable: The same leads (unchanged when no postcode index is built)
+        """
+        if self.postcode_index is None:
+            return businesses
+        return self.postcode_index.geocode_leads(businesses)
+    
+    def _iter_manual_businesses(self, query, location, max_results=20):
+        """
+        Generate simulated business data without recording it.
+        
+        Args:
+            query (str): Type of business (e.g., 'restaurants', 'plumbers')
+            location (str): Location to search in (e.g., 'London, UK')
+            max_results (int): Maximum number of results to generate
+            
+        Yields:
+            dict: Simulated business data dictionaries
+        """
         # This is a simulation - in a real scenario, you would use web scraping or other methods
         # to gather this data from Google Maps or other sources
         
         # Generate some sample data for demonstration
-        sample_businesses = []
         business_types = {
             'restaurants': ['Italian', 'Indian', 'Chinese', 'Pub', 'Cafe', 'Bistro'],
             'plumbers': ['Emergency Plumbing', 'Plumbing & Heating', 'Bathroom Specialist'],
@@ -130,7 +489,7 @@ class BusinessFinder:
             area = london_areas[i % len(london_areas)]
             business_type = category_options[i % len(category_options)]
             
-            business_data = {
+            yield {
                 'name': f"{business_type} {i+1} - {area}",
                 'address': f"{10+i} High Street, {area}, {location}",
                 'phone': f"+44 20 7946 {1000+i}",
@@ -141,10 +500,36 @@ class BusinessFinder:
                 'location': location,
                 'source': 'Manual Search Simulation'
             }
-            sample_businesses.append(business_data)
+    
+    def probe_presence(self):
+        """
+        Probe the results for websites and social media the source data missed.
         
-        self.results.extend(sample_businesses)
-        return sample_businesses
+        Leads found to have a website are dropped from the results; the rest
+        get 'has_social_media' set for exclude_social_media filtering.
+        
+        Returns:
+            list: The remaining results
+        """
+        if self.prober is None:
+            raise ValueError("No PresenceProber configured")
+        
+        self.results = [b for b in self.prober.probe(self.results) if not b['has_website']]
+        return self.results
+    
+    def iter_probed(self, businesses):
+        """
+        Probe a stream of leads in batches, dropping those found to have a website.
+        
+        Args:
+            businesses (iterable): Business data dictionaries
+            
+        Returns:
+            iterable: Leads still without a website (all of them when no prober is configured)
+        """
+        if self.prober is None:
+            return businesses
+        return (b for b in self.prober.iter_probe(businesses) if not b['has_website'])
     
     def filter_results(self, min_rating=None, categories=None, exclude_social_media=False):
         """
@@ -158,20 +543,26 @@ class BusinessFinder:
         Returns:
             list: Filtered list of business data dictionaries
         """
-        filtered_results = self.results.copy()
+        # The index follows self.results incrementally; rebuild it if the list was replaced
+        if self._index is None or self._index.leads is not self.results:
+            self._index = LeadIndex(self.results)
         
-        if min_rating is not None:
-            filtered_results = [b for b in filtered_results if b.get('rating', 0) >= min_rating]
-            
-        if categories:
-            filtered_results = [b for b in filtered_results if any(cat.lower() in b.get('category', '').lower() for cat in categories)]
-            
-        # In a real implementation, you would check for social media presence
-        # This is just a placeholder for the concept
-        if exclude_social_media:
-            filtered_results = [b for b in filtered_results if not b.get('has_social_media', False)]
+        return self._index.filter(min_rating, categories, exclude_social_media)
+    
+    def prioritize(self, top, leads=None, origin=None):
+        """
+        Rank leads by priority score and keep only the best ones as the results.
+        
+        Args:
+            top (int): Number of leads to keep
+            leads (list): Leads to rank, defaults to self.results
+            origin (tuple): Optional (lat, lng); closer leads score higher
             
-        return filtered_results
+        Returns:
+            list: The top leads with a 'score' key, best first
+        """
+        self.results = LeadScorer(origin=origin).top_k(self.results if leads is None else leads, top)
+        return self.results
     
     def export_to_csv(self, filename=None):
         """
@@ -190,9 +581,8 @@ class BusinessFinder:
         filepath = os.path.join(self.output_dir, filename)
         
         if self.results:
-            df = pd.DataFrame(self.results)
-            df.to_csv(filepath, index=False)
-            print(f"Exported {len(self.results)} businesses to {filepath}")
+            count = export_leads(self.results, filepath, 'csv', fields=self._result_fields())
+            print(f"Exported {count} businesses to {filepath}")
             return filepath
         else:
             print("No results to export")
@@ -215,13 +605,51 @@ class BusinessFinder:
         filepath = os.path.join(self.output_dir, filename)
         
         if self.results:
-            with open(filepath, 'w') as f:
-                json.dump(self.results, f, indent=2)
-            print(f"Exported {len(self.results)} businesses to {filepath}")
+            count = export_leads(self.results, filepath, 'json')
+            print(f"Exported {count} businesses to {filepath}")
             return filepath
         else:
             print("No results to export")
             return None
+    
+    def export_leads(self, leads=None, fmt='csv', filename=None):
+        """
+        Stream leads to a file in the requested format.
+        
+        Records are written one at a time, so passing a generator such as
+        iter_businesses() exports any number of leads in bounded memory.
+        
+        Args:
+            leads (iterable): Leads to export, defaults to the recorded results
+            fmt (str): Export format: csv, csv.gz, ndjson, ndjson.gz, json, parquet or arrow
+            filename (str): Optional filename, defaults to timestamped file
+            
+        Returns:
+            str: Path to the exported file
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        
+        if not filename:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"business_leads_{timestamp}{EXPORT_FORMATS[fmt]}"
+        
+        filepath = os.path.join(self.output_dir, filename)
+        
+        if leads is None:
+            leads = self.results
+        
+        count = export_leads(leads, filepath, fmt)
+        print(f"Exported {count} businesses to {filepath}")
+        return filepath
+    
+    def _result_fields(self):
+        """Get the columns present in the recorded results, standard columns first."""
+        keys = {}
+        for business in self.results:
+            for key in business:
+                keys.setdefault(key, None)
+        return [f for f in LEAD_FIELDS if f in keys] + [k for k in keys if k not in LEAD_FIELDS]
 
 def main():
     """Main function to demonstrate the BusinessFinder class."""
@@ -3,13 +3,54 @@
 Business Finder CLI Interface
 
 This script provides a command-line interface for the BusinessFinder tool.
+Run with "sweep" as the first argument to sweep a whole region, e.g.:
+
+    business_finder_cli.py sweep -q plumbers --bbox 51.28,-0.51,51.69,0.33 -k KEY
 """
 
 import argparse
 import sys
 import os
+import json
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tools.business_finder import BusinessFinder
+from tools.response_cache import ResponseCache
+from tools.region_sweep import RegionSweep
+from tools.lead_export import EXPORT_FORMATS
+from tools.lead_index import build_predicate
+from tools.rate_limiter import RateLimiter
+from tools.lead_scoring import LeadScorer
+from tools.presence_prober import PresenceProber
+from outreach.lead_sink import BusinessSink
+
+def add_places_arguments(parser):
+    """Add the Places API and cache options shared by every command."""
+    parser.add_argument('--api-key', '-k', type=str, default=None,
+                        help='Google Maps API key (if available)')
+    
+    parser.add_argument('--max-in-flight', type=int, default=8,
+                        help='Maximum concurrent Places detail requests (default: 8)')
+    
+    parser.add_argument('--places-endpoint', type=str, default=None,
+                        help='Override the Places API endpoint (e.g. a local stub server)')
+    
+    parser.add_argument('--rate-limit', type=float, default=10.0,
+                        help='Places requests per second, shared by every running process (default: 10)')
+    
+    parser.add_argument('--cache-file', type=str, default=None,
+                        help='Path to the Places response cache (default: data/response_cache.db)')
+    
+    parser.add_argument('--cache-ttl', type=float, default=168,
+                        help='Hours before cached Places responses expire (default: 168)')
+    
+    parser.add_argument('--cache-max-entries', type=int, default=100000,
+                        help='Maximum cached responses kept before LRU eviction (default: 100000)')
+    
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Disable the Places response cache')
+    
+    parser.add_argument('--cache-only', action='store_true',
+                        help='Offline mode: serve Places data from the cache only')
 
 def parse_arguments():
     """Parse command line arguments."""
@@ -18,11 +59,15 @@ def parse_arguments():
     parser.add_argument('--query', '-q', type=str, required=True,
                         help='Type of business to search for (e.g., restaurants, plumbers)')
     
-    parser.add_argument('--location', '-l', type=str, required=True,
-                        help='Location to search in (e.g., "London, UK")')
+    parser.add_argument('--location', '-l', type=str, default=None,
+                        help='Location to search in (e.g., "London, UK"); optional with --osm-file')
     
-    parser.add_argument('--max-results', '-m', type=int, default=20,
-                        help='Maximum number of results to return (default: 20)')
+    parser.add_argument('--max-results', '-m', type=int, default=None,
+                        help='Maximum number of results to return (default: 20, or all with --osm-file)')
+    
+    parser.add_argument('--osm-file', type=str, default=None,
+                        help='Read leads from a local OpenStreetMap extract (.osm, .geojson, .geojsonl; '
+                             'optionally .gz/.bz2) instead of the Places API')
     
     parser.add_argument('--min-rating', '-r', type=float, default=None,
                         help='Minimum rating to include in results')
@@ -39,28 +84,259 @@ def parse_arguments():
     parser.add_argument('--output-file', '-f', type=str, default=None,
                         help='Output filename (without extension)')
     
-    parser.add_argument('--api-key', '-k', type=str, default=None,
-                        help='Google Maps API key (if available)')
+    parser.add_argument('--probe', action='store_true',
+                        help='Check candidate domains and social profiles for each lead; '
+                             'drops leads that turn out to have a website')
+    
+    parser.add_argument('--probe-workers', type=int, default=32,
+                        help='Maximum concurrent probe lookups (default: 32)')
+    
+    parser.add_argument('--probe-timeout', type=float, default=3.0,
+                        help='Timeout per probe request in seconds (default: 3)')
+    
+    parser.add_argument('--top', type=int, default=None,
+                        help='Keep only the N highest-priority leads, best first')
     
-    return parser.parse_args()
+    parser.add_argument('--format', type=str, choices=sorted(EXPORT_FORMATS), default=None,
+                        help='Stream leads straight to a single file in this format '
+                             '(csv, csv.gz, ndjson, ndjson.gz, json, parquet, arrow)')
+    
+    parser.add_argument('--to-db', type=str, nargs='?', const='', default=None, metavar='DB_PATH',
+                        help='Stream leads straight into the outreach database (default: data/outreach.db)')
+    
+    add_places_arguments(parser)
+    
+    args = parser.parse_args()
+    if args.osm_file:
+        args.location = args.location or ''
+    elif not args.location:
+        parser.error('--location is required unless --osm-file is given')
+    elif args.max_results is None:
+        args.max_results = 20
+    return args
+
+def parse_sweep_arguments(argv):
+    """Parse command line arguments for the sweep subcommand."""
+    parser = argparse.ArgumentParser(
+        prog='business_finder_cli.py sweep',
+        description='Sweep a whole region with overlapping Places searches.'
+    )
+    
+    parser.add_argument('--query', '-q', type=str, required=True,
+                        help='Type of business to search for (e.g., restaurants, plumbers)')
+    
+    region = parser.add_mutually_exclusive_group(required=True)
+    region.add_argument('--bbox', type=str,
+                        help='Bounding box as "south,west,north,east"')
+    region.add_argument('--polygon', type=str,
+                        help='Polygon as "lat,lng;lat,lng;..." or path to a GeoJSON file')
+    
+    parser.add_argument('--radius', type=int, default=5000,
+                        help='Search radius of each cell in metres (default: 5000)')
+    
+    parser.add_argument('--overlap', type=float, default=0.1,
+                        help='Extra overlap between neighbouring cells (default: 0.1)')
+    
+    parser.add_argument('--workers', '-w', type=int, default=4,
+                        help='Number of cells searched concurrently (default: 4)')
+    
+    parser.add_argument('--max-results', '-m', type=int, default=20,
+                        help='Search hits requested per result page (default: 20)')
+    
+    parser.add_argument('--checkpoint', type=str, default=None,
+                        help='Checkpoint file (default: data/sweep_<query>.json)')
+    
+    parser.add_argument('--to-db', type=str, nargs='?', const='', default=None, metavar='DB_PATH',
+                        help='Stream leads straight into the outreach database (default: data/outreach.db)')
+    
+    add_places_arguments(parser)
+    
+    return parser.parse_args(argv)
+
+def parse_polygon(value):
+    """Parse a polygon from an inline "lat,lng;..." string or a GeoJSON file."""
+    if os.path.exists(value):
+        with open(value, 'r') as f:
+            geojson = json.load(f)
+        if geojson.get('type') == 'FeatureCollection':
+            geojson = geojson['features'][0]
+        geometry = geojson.get('geometry', geojson)
+        # GeoJSON rings are [lng, lat]; use the outer ring
+        return [(lat, lng) for lng, lat in geometry['coordinates'][0]]
+    
+    return [tuple(float(v) for v in point.split(',')) for point in value.split(';') if point.strip()]
+
+def create_finder(args):
+    """
+    Create the BusinessFinder and response cache from parsed arguments.
+    
+    Returns:
+        tuple: (BusinessFinder, ResponseCache or None)
+    """
+    cache = None
+    if not args.no_cache:
+        cache = ResponseCache(
+            path=args.cache_file,
+            ttl=int(args.cache_ttl * 3600),
+            max_entries=args.cache_max_entries
+        )
+    
+    prober = None
+    if getattr(args, 'probe', False):
+        prober = PresenceProber(max_workers=args.probe_workers, timeout=args.probe_timeout, cache=cache)
+    
+    finder = BusinessFinder(
+        api_key=args.api_key,
+        max_in_flight=args.max_in_flight,
+        places_endpoint=args.places_endpoint,
+        cache=cache,
+        cache_only=args.cache_only,
+        rate_limiter=RateLimiter('places', rate=args.rate_limit, capacity=max(1.0, 2 * args.rate_limit)),
+        osm_extract=getattr(args, 'osm_file', None),
+        prober=prober
+    )
+    return finder, cache
+
+def print_stats(finder, cache):
+    """Print cache hit/miss and rate limiter statistics."""
+    if cache is not None:
+        stats = cache.stats()
+        print(f"Cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']}% hit rate)")
+    
+    stats = finder.rate_limiter.stats()
+    if stats['requests']:
+        print(f"Rate limit: {stats['requests']} requests, {stats['throttles']} throttled, "
+              f"{stats['retries']} retries, {stats['wait_time']}s waiting")
+    
+    if finder.prober is not None:
+        stats = finder.prober.stats()
+        print(f"Probe: {stats['leads']} leads, {stats['websites_found']} websites and "
+              f"{stats['social_found']} social profiles found ({stats['lookups']} lookups, "
+              f"{stats['cached']} cached, {stats['unknown']} inconclusive, {stats['errors']} errors)")
+
+def run_sweep(argv):
+    """Run the sweep subcommand."""
+    args = parse_sweep_arguments(argv)
+    
+    if args.cache_only and args.no_cache:
+        print("Error: --cache-only cannot be combined with --no-cache.")
+        return
+    
+    if not args.api_key and not args.cache_only:
+        print("Error: a sweep needs --api-key (or --cache-only to replay cached responses).")
+        return
+    
+    finder, cache = create_finder(args)
+    
+    checkpoint = args.checkpoint
+    if not checkpoint:
+        safe_query = "".join([c if c.isalnum() else "_" for c in args.query])
+        checkpoint = os.path.join(finder.output_dir, f"sweep_{safe_query}.json")
+    
+    bbox = tuple(float(v) for v in args.bbox.split(',')) if args.bbox else None
+    polygon = parse_polygon(args.polygon) if args.polygon else None
+    
+    sink = BusinessSink(args.to_db or None) if args.to_db is not None else None
+    
+    sweep = RegionSweep.for_region(
+        finder, args.query, args.radius, checkpoint,
+        bbox=bbox, polygon=polygon, overlap=args.overlap,
+        workers=args.workers, max_results=args.max_results, sink=sink
+    )
+    try:
+        summary = sweep.run()
+    finally:
+        if sink is not None:
+            sink.close()
+    
+    print(f"Completed {summary['completed_cells']}/{summary['total_cells']} cells "
+          f"({summary['failed_cells']} failed).")
+    print(f"Collected {summary['total_leads']} unique leads ({summary['new_leads']} new this run).")
+    print(f"Leads written to: {summary['leads_file']}")
+    if sink is not None:
+        stats = sink.stats()
+        print(f"Database: {stats['inserted']} inserted, {stats['updated']} updated in {sink.db_path}")
+    if summary['failed_cells']:
+        print("Re-run the same command to retry the failed cells.")
+    
+    print_stats(finder, cache)
+
+def iter_filtered_leads(finder, args):
+    """Stream search results through the filters given on the command line."""
+    leads = finder.iter_probed(finder.iter_businesses(args.query, args.location, limit=args.max_results))
+    
+    predicate = build_predicate(args.min_rating, args.categories, args.exclude_social)
+    if predicate is not None:
+        leads = (b for b in leads if predicate.matches(b))
+    
+    # Ranking needs the whole stream, but only the running top N is kept in memory
+    if args.top:
+        leads = LeadScorer().top_k_stream(leads, args.top)
+    return leads
+
+def stream_to_db(finder, args):
+    """Stream search results through the filters straight into the outreach database."""
+    print(f"Streaming {args.query} in {args.location or args.osm_file} into the outreach database...")
+    
+    with BusinessSink(args.to_db or None) as sink:
+        sink.write_all(iter_filtered_leads(finder, args))
+    
+    stats = sink.stats()
+    print(f"Inserted {stats['inserted']} and updated {stats['updated']} businesses in {sink.db_path}")
+
+def stream_export(finder, args):
+    """Stream search results through the filters straight into the export file."""
+    print(f"Streaming {args.query} in {args.location or args.osm_file} to {args.format}...")
+    
+    leads = iter_filtered_leads(finder, args)
+    
+    filename = f"{args.output_file}{EXPORT_FORMATS[args.format]}" if args.output_file else None
+    filepath = finder.export_leads(leads, fmt=args.format, filename=filename)
+    print(f"{args.format} exported to: {filepath}")
 
 def main():
     """Main function to run the CLI interface."""
+    if len(sys.argv) > 1 and sys.argv[1] == 'sweep':
+        run_sweep(sys.argv[2:])
+        return
+    
     args = parse_arguments()
     
-    # Initialize the BusinessFinder
-    finder = BusinessFinder(api_key=args.api_key)
+    if args.cache_only and args.no_cache:
+        print("Error: --cache-only cannot be combined with --no-cache.")
+        return
+    
+    # Initialize the BusinessFinder and Places response cache
+    finder, cache = create_finder(args)
+    
+    if args.to_db is not None:
+        stream_to_db(finder, args)
+        print_stats(finder, cache)
+        print("Done!")
+        return
+    
+    if args.format:
+        stream_export(finder, args)
+        print_stats(finder, cache)
+        print("Done!")
+        return
     
-    print(f"Searching for {args.query} in {args.location}...")
+    print(f"Searching for {args.query} in {args.location or args.osm_file}...")
     
     # Find businesses
-    if args.api_key:
+    if args.osm_file:
+        businesses = finder.find_businesses_osm(args.query, args.location, args.max_results)
+    elif args.api_key or args.cache_only:
         businesses = finder.find_businesses_google_maps(args.query, args.location, args.max_results)
     else:
         businesses = finder.find_businesses_manual(args.query, args.location, args.max_results)
     
     print(f"Found {len(businesses)} businesses without websites.")
     
+    if args.probe:
+        remaining = finder.probe_presence()
+        print(f"{len(remaining)} businesses still without websites after probing.")
+    
     # Apply filters if specified
     if args.min_rating or args.categories or args.exclude_social:
         filtered = finder.filter_results(
@@ -69,6 +345,13 @@ def main():
             exclude_social_media=args.exclude_social
         )
         print(f"Filtered to {len(filtered)} businesses.")
+    else:
+        filtered = None
+    
+    # Rank and keep the best leads; the exports below then contain only these
+    if args.top:
+        top = finder.prioritize(args.top, leads=filtered)
+        print(f"Kept the top {len(top)} businesses by priority score.")
     
     # Export results
     if args.output_format in ['csv', 'both']:
@@ -83,6 +366,8 @@ def main():
         )
         print(f"JSON exported to: {json_file}")
     
+    print_stats(finder, cache)
+    
     print("Done!")
 
 if __name__ == "__main__":
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+SQLite Connection Manager
+
+This module gives each thread one long-lived connection per database instead
+of opening and closing a connection in every method. Connections are set up
+once with WAL journaling, a busy timeout and tuned pragmas, so the scheduler
+thread and the dashboard can read and write the outreach database at the
+same time without "database is locked" errors, and with a large prepared
+statement cache so repeated queries are not parsed again. Writes go through
+transaction(), which commits on success and rolls back on error, and schema
+changes go through migrate(), which applies numbered migrations once and
+records the schema version in PRAGMA user_version.
+
+Servers that start a thread per request (such as Flask's threaded development
+server) would otherwise open and configure a connection for every request, so
+a finished thread's connection goes back to a small pool of idle connections
+and the next new thread checks it out instead of connecting again.
+"""
+
+import os
+import sqlite3
+import threading
+import weakref
+from collections import deque
+from contextlib import contextmanager
+
+# Pragmas applied to every new connection
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',      # readers and a writer no longer block each other
+    'synchronous': 'NORMAL',    # durable with WAL, without an fsync on every commit
+    'busy_timeout': 30000,      # wait up to 30s for a competing writer, in ms
+    'cache_size': -32000,       # page cache of about 32 MB
+    'temp_store': 'MEMORY',
+}
+
+# Idle connections kept for reuse by new threads
+DEFAULT_POOL_SIZE = 8
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+def get_database(db_path, **kwargs):
+    """
+    Get the process-wide connection manager of a database file.
+    
+    Args:
+        db_path (str): Path to the SQLite database
+        **kwargs: Options passed to ConnectionManager when it is first created
+        
+    Returns:
+        ConnectionManager: The shared manager
+    """
+    key = os.path.abspath(db_path)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = _managers[key] = ConnectionManager(key, **kwargs)
+        return manager
+
+class _ThreadState:
+    """A thread's connection and transaction depth."""
+    
+    def __init__(self, conn):
+        self.conn = conn
+        self.pid = os.getpid()
+        self.depth = 0
+        self.finalizer = None
+
+class ConnectionManager:
+    """Per-thread, long-lived SQLite connections with a transaction context manager."""
+    
+    def __init__(self, db_path, pragmas=None, cached_statements=512, pool_size=DEFAULT_POOL_SIZE):
+        """
+        Initialize the ConnectionManager. Connections are opened on first use.
+        
+        Args:
+            db_path (str): Path to the SQLite database
+            pragmas (dict): Pragma overrides, merged over DEFAULT_PRAGMAS
+            cached_statements (int): Prepared statements kept per connection
+            pool_size (int): Idle connections kept for reuse once their thread finishes
+        """
+        self.db_path = db_path
+        self.pragmas = dict(DEFAULT_PRAGMAS, **(pragmas or {}))
+        self.cached_statements = cached_statements
+        self.pool_size = max(0, int(pool_size))
+        self.connections_opened = 0
+        # Keyed by thread object, so a finished thread's state is dropped with it
+        self._states = weakref.WeakKeyDictionary()
+        # Connections of finished threads, waiting for the next new thread
+        self._idle = deque()
+        # Reentrant: a thread's finalizer can run during garbage collection while the lock is held
+        self._lock = threading.RLock()
+        
+    def _connect(self):
+        """Open and configure a new connection."""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Each connection is only used by its own thread; check_same_thread is off so close_all can close it
+        conn = sqlite3.connect(self.db_path, timeout=self.pragmas['busy_timeout'] / 1000,
+                               cached_statements=self.cached_statements, check_same_thread=False)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        with self._lock:
+            self.connections_opened += 1
+        return conn
+        
+    def _checkout(self):
+        """Take an idle connection from the pool, or open a new one if there is none."""
+        pid = os.getpid()
+        with self._lock:
+            while self._idle:
+                idle_pid, conn = self._idle.pop()
+                # A forked worker must not share its parent's connection
+                if idle_pid == pid:
+                    return conn
+        return self._connect()
+        
+    def _checkin(self, state):
+        """Return a finished thread's connection to the pool, closing it if the pool is full."""
+        conn = state.conn
+        if state.pid != os.getpid():
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append((state.pid, conn))
+                return
+        conn.close()
+        
+    def _state(self):
+        """Get the calling thread's state, checking a connection out on first use."""
+        thread = threading.current_thread()
+        state = self._states.get(thread)
+        # A forked worker must not share its parent's connection
+        if state is None or state.pid != os.getpid():
+            state = _ThreadState(self._checkout())
+            with self._lock:
+                self._states[thread] = state
+            # Hand the connection back once the thread object is gone
+            state.finalizer = weakref.finalize(thread, self._checkin, state)
+            state.finalizer.atexit = False
+        return state
+        
+    def connection(self):
+        """
+        Get the calling thread's connection.
+        
+        Do not close it; use transaction() for writes.
+        
+        Returns:
+            sqlite3.Connection: Long-lived connection
+        """
+        return self._state().conn
+        
+    @contextmanager
+    def transaction(self, immediate=True):
+        """
+        Run a block of work in a transaction on the calling thread's connection.
+        
+        The transaction commits when the block finishes and rolls back if it
+        raises. Nested transaction() blocks join the outermost one.
+        
+        Args:
+            immediate (bool): Take the write lock up front (BEGIN IMMEDIATE), so a
+                              block that reads before writing waits for other
+                              writers instead of failing with "database is locked"
+                              
+        Yields:
+            sqlite3.Connection: The connection
+        """
+        state = self._state()
+        conn = state.conn
+        if state.depth:
+            state.depth += 1
+            try:
+                yield conn
+            finally:
+                state.depth -= 1
+            return
+            
+        if conn.in_transaction:
+            # Left open by a read-path caller that wrote without committing
+            conn.commit()
+        if immediate:
+            conn.execute('BEGIN IMMEDIATE')
+        state.depth = 1
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+        finally:
+            state.depth = 0
+            
+    def execute(self, sql, parameters=()):
+        """
+        Execute one statement on the calling thread's connection.
+        
+        Args:
+            sql (str): SQL statement
+            parameters (tuple): Statement parameters
+            
+        Returns:
+            sqlite3.Cursor: Cursor over the results
+        """
+        return self.connection().execute(sql, parameters)
+        
+    def user_version(self):
+        """Get the schema version recorded in the database (0 if never migrated)."""
+        return self.execute('PRAGMA user_version').fetchone()[0]
+        
+    def migrate(self, migrations):
+        """
+        Bring the schema up to date with a list of versioned migrations.
+        
+        Migrations newer than the recorded user_version are applied in order,
+        all in one write transaction together with the new version number, so
+        an interrupted upgrade leaves the database on its old version and the
+        next run starts it again. An up-to-date database costs one PRAGMA read.
+        
+        Args:
+            migrations (list): (version, description, apply) tuples, where apply
+                               is called with the connection
+                               
+        Returns:
+            int: Schema version after migrating
+        """
+        latest = max((version for version, _, _ in migrations), default=0)
+        current = self.user_version()
+        if current >= latest:
+            return current
+            
+        with self.transaction() as conn:
+            # Another process may have migrated while this one waited for the lock
+            current = conn.execute('PRAGMA user_version').fetchone()[0]
+            for version, description, apply in sorted(migrations, key=lambda migration: migration[0]):
+                if version <= current:
+                    continue
+                apply(conn)
+                conn.execute(f"PRAGMA user_version = {int(version)}")
+                current = version
+        return current
+        
+    def release(self):
+        """
+        Return the calling thread's connection to the pool now.
+        
+        For a thread that is about to finish or go idle, e.g. at the end of a
+        request; the next call from the thread checks a connection out again.
+        """
+        thread = threading.current_thread()
+        with self._lock:
+            state = self._states.get(thread)
+            if state is None or state.depth:
+                return
+            del self._states[thread]
+        state.finalizer.detach()
+        self._checkin(state)
+            
+    def close(self):
+        """Close the calling thread's connection; the next call reopens it."""
+        with self._lock:
+            state = self._states.pop(threading.current_thread(), None)
+        if state is not None:
+            state.finalizer.detach()
+            state.conn.close()
+            
+    def close_all(self):
+        """Close every thread's connection and the idle pool, e.g. at shutdown."""
+        with self._lock:
+            states = list(self._states.values())
+            conns = [state.conn for state in states] + [conn for _, conn in self._idle]
+            self._states.clear()
+            self._idle.clear()
+        for state in states:
+            state.finalizer.detach()
+        for conn in conns:
+            conn.close()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Geo Utilities
+
+This module provides the small amount of geometry used across the tools:
+great-circle distances, point-in-polygon tests and tiling a region into
+overlapping search circles.
+"""
+
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+METERS_PER_DEGREE_LAT = 111320.0
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """
+    Calculate the great-circle distance between two points.
+    
+    Args:
+        lat1 (float): Latitude of the first point
+        lng1 (float): Longitude of the first point
+        lat2 (float): Latitude of the second point
+        lng2 (float): Longitude of the second point
+        
+    Returns:
+        float: Distance in kilometres
+    """
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+def bounding_box(points):
+    """
+    Get the bounding box of a list of (lat, lng) points.
+    
+    Args:
+        points (list): List of (lat, lng) tuples
+        
+    Returns:
+        tuple: (south, west, north, east)
+    """
+    lats = [p[0] for p in points]
+    lngs = [p[1] for p in points]
+    return min(lats), min(lngs), max(lats), max(lngs)
+
+def radius_bounding_box(lat, lng, radius_km):
+    """
+    Get the bounding box enclosing a circle.
+    
+    Args:
+        lat (float): Latitude of the centre
+        lng (float): Longitude of the centre
+        radius_km (float): Radius in kilometres
+        
+    Returns:
+        tuple: (south, west, north, east)
+    """
+    dlat = (radius_km * 1000) / METERS_PER_DEGREE_LAT
+    dlng = (radius_km * 1000) / (METERS_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 1e-6))
+    return lat - dlat, lng - dlng, lat + dlat, lng + dlng
+
+def point_in_polygon(lat, lng, polygon):
+    """
+    Test whether a point lies inside a polygon (ray casting).
+    
+    Args:
+        lat (float): Latitude of the point
+        lng (float): Longitude of the point
+        polygon (list): List of (lat, lng) vertices
+        
+    Returns:
+        bool: Whether the point is inside the polygon
+    """
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        lat_i, lng_i = polygon[i]
+        lat_j, lng_j = polygon[j]
+        if (lat_i > lat) != (lat_j > lat):
+            crossing = (lng_j - lng_i) * (lat - lat_i) / (lat_j - lat_i) + lng_i
+            if lng < crossing:
+                inside = not inside
+        j = i
+    return inside
+
+def _distance_to_segment_m(lat, lng, a, b):
+    """Approximate distance in metres from a point to a polygon edge (local equirectangular projection)."""
+    scale = METERS_PER_DEGREE_LAT * math.cos(math.radians(lat))
+    px, py = 0.0, 0.0
+    ax, ay = (a[1] - lng) * scale, (a[0] - lat) * METERS_PER_DEGREE_LAT
+    bx, by = (b[1] - lng) * scale, (b[0] - lat) * METERS_PER_DEGREE_LAT
+    dx, dy = bx - ax, by - ay
+    length_sq = dx * dx + dy * dy
+    t = 0.0 if length_sq == 0 else max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length_sq))
+    cx, cy = ax + t * dx, ay + t * dy
+    return math.hypot(cx - px, cy - py)
+
+def circle_intersects_polygon(lat, lng, radius_m, polygon):
+    """
+    Test whether a search circle overlaps a polygon.
+    
+    Args:
+        lat (float): Latitude of the circle centre
+        lng (float): Longitude of the circle centre
+        radius_m (float): Circle radius in metres
+        polygon (list): List of (lat, lng) vertices
+        
+    Returns:
+        bool: Whether the circle and polygon overlap
+    """
+    if point_in_polygon(lat, lng, polygon):
+        return True
+    for i in range(len(polygon)):
+        if _distance_to_segment_m(lat, lng, polygon[i - 1], polygon[i]) <= radius_m:
+            return True
+    return False
+
+def tile_region(radius_m, bbox=None, polygon=None, overlap=0.1):
+    """
+    Tile a bounding box or polygon into overlapping search circles.
+    
+    Cells sit on a square grid whose spacing lets neighbouring circles cover
+    the gaps between them; ``overlap`` shrinks the spacing further so edge
+    results are not lost to rounding at cell boundaries.
+    
+    Args:
+        radius_m (float): Search radius of each cell in metres
+        bbox (tuple): Optional (south, west, north, east) bounding box
+        polygon (list): Optional list of (lat, lng) vertices
+        overlap (float): Extra overlap between neighbouring cells (0 to <1)
+        
+    Returns:
+        list: Cell dictionaries with 'id', 'lat', 'lng' and 'radius'
+    """
+    if polygon:
+        south, west, north, east = bounding_box(polygon)
+    elif bbox:
+        south, west, north, east = bbox
+    else:
+        raise ValueError("Either bbox or polygon is required")
+        
+    if not 0 <= overlap < 1:
+        raise ValueError("overlap must be between 0 and 1")
+        
+    spacing_m = radius_m * math.sqrt(2) * (1 - overlap)
+    dlat = spacing_m / METERS_PER_DEGREE_LAT
+    
+    cells = []
+    rows = max(1, int(math.ceil((north - south) / dlat)) + 1)
+    for row in range(rows):
+        lat = min(south + row * dlat, north)
+        dlng = spacing_m / (METERS_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 1e-6))
+        cols = max(1, int(math.ceil((east - west) / dlng)) + 1)
+        for col in range(cols):
+            lng = min(west + col * dlng, east)
+            if polygon and not circle_intersects_polygon(lat, lng, radius_m, polygon):
+                continue
+            cells.append({
+                'id': f"{row}:{col}",
+                'lat': round(lat, 6),
+                'lng': round(lng, 6),
+                'radius': radius_m
+            })
+    return cells
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON Reader
+
+This module reads the items of a large JSON array one at a time without
+loading the document, e.g. the features of a GeoJSON FeatureCollection or a
+JSON export of leads. Only the current item and a small read buffer are held
+in memory.
+"""
+
+import json
+import codecs
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER_START = '-0123456789'
+_NUMBER_CHARS = frozenset('0123456789+-.eE')
+
+class _Buffer:
+    """Text buffer over a file that refills on demand."""
+    
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+        # Multi-byte characters may be split across binary chunks
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        
+    def fill(self):
+        """Read another chunk, dropping consumed text; returns False at end of file."""
+        if self.eof:
+            return False
+        while True:
+            data = self.f.read(self.chunk_size)
+            chunk = self._decoder.decode(data, final=not data) if isinstance(data, bytes) else data
+            if chunk or not data:
+                break
+        if not chunk:
+            self.eof = True
+            return False
+        self.text = self.text[self.pos:] + chunk
+        self.pos = 0
+        return True
+        
+    def peek(self):
+        """Get the next non-whitespace character without consuming it ('' at end of file)."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ''
+                
+    def expect(self, chars):
+        """Consume the next non-whitespace character, which must be one of chars."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} in JSON stream, found {char or 'end of file'!r}")
+        self.pos += 1
+        return char
+        
+    def value(self, decoder):
+        """Decode the next complete JSON value, reading more text as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A number running up to the buffer edge may continue in the next chunk
+            # (e.g. "2." + "5"), even if the part read so far already decodes
+            if not self.eof and self.text[self.pos] in _NUMBER_START:
+                run_end = end
+                while run_end < len(self.text) and self.text[run_end] in _NUMBER_CHARS:
+                    run_end += 1
+                if run_end == len(self.text) and self.fill():
+                    continue
+            self.pos = end
+            return value
+
+def iter_json_array(f, key=None, chunk_size=1 << 16):
+    """
+    Stream the items of a JSON array.
+    
+    Args:
+        f (file): Text or binary file object positioned at the start of the document
+        key (str): If given, stream the array stored under this key of a
+                   top-level object (e.g. 'features'); otherwise the document
+                   itself must be an array
+        chunk_size (int): Characters read per refill
+        
+    Yields:
+        Decoded array items, in order
+    """
+    decoder = json.JSONDecoder()
+    buffer = _Buffer(f, chunk_size)
+    
+    if key is not None:
+        buffer.expect('{')
+        if buffer.peek() == '}':
+            return
+        while True:
+            name = buffer.value(decoder)
+            buffer.expect(':')
+            if name == key and buffer.peek() == '[':
+                break
+            # Skip any other member (e.g. 'type', 'crs', 'bbox')
+            buffer.value(decoder)
+            if buffer.expect(',}') == '}':
+                return
+                
+    buffer.expect('[')
+    if buffer.peek() == ']':
+        return
+    while True:
+        yield buffer.value(decoder)
+        if buffer.expect(',]') == ']':
+            return
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Lead Deduplication
+
+This module removes duplicate business leads. Phone numbers are normalized to
+E.164 and names are normalized for case, punctuation and legal suffixes such
+as "Ltd"/"Limited". Leads are grouped into blocks by hash key and fuzzy name
+comparison only happens inside a block, so deduplication never does
+pairwise work across the whole lead set.
+"""
+
+import re
+import unicodedata
+from difflib import SequenceMatcher
+
+# Legal-form suffixes that do not distinguish one business from another
+_LEGAL_SUFFIXES = {'ltd', 'limited', 'plc', 'llp', 'llc', 'inc', 'co', 'company', 'uk'}
+
+_APOSTROPHE_RE = re.compile(r"['’`]")
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+
+# UK postcode (outward code, optional space, inward code), e.g. 'SW1A 1AA'
+_POSTCODE_RE = re.compile(r'\b([A-Z]{1,2}[0-9][A-Z0-9]?) ?([0-9][A-Z]{2})\b')
+
+def normalize_phone(phone, default_country_code='44'):
+    """
+    Normalize a phone number to E.164 format.
+    
+    Args:
+        phone (str): Phone number in any common format
+        default_country_code (str): Country code for national numbers (default: UK)
+        
+    Returns:
+        str: E.164 number (e.g. '+442079461000'), or '' if there are no digits
+    """
+    if phone is None:
+        return ''
+    # Drop the '(0)' national trunk prefix written after a country code
+    phone = str(phone).strip().replace('(0)', '')
+    digits = re.sub(r'\D', '', phone)
+    if not digits:
+        return ''
+        
+    if phone.startswith('+'):
+        return '+' + digits
+    if digits.startswith('00'):
+        return '+' + digits[2:]
+    if digits.startswith('0'):
+        return '+' + default_country_code + digits[1:]
+    if digits.startswith(default_country_code) and len(digits) > 10:
+        return '+' + digits
+    return '+' + default_country_code + digits
+
+def normalize_name(name):
+    """
+    Normalize a business name for comparison.
+    
+    Lowercases, treats '&' as 'and', strips punctuation and drops a leading
+    'the' and trailing legal suffixes ('Ltd', 'Limited', 'PLC', ...).
+    
+    Args:
+        name (str): Business name
+        
+    Returns:
+        str: Normalized name
+    """
+    if name is None:
+        return ''
+    name = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    name = name.casefold().replace('&', ' and ')
+    name = _APOSTROPHE_RE.sub('', name)
+    tokens = _NON_ALNUM_RE.sub(' ', name).split()
+    
+    while len(tokens) > 1 and tokens[-1] in _LEGAL_SUFFIXES:
+        tokens.pop()
+    if len(tokens) > 1 and tokens[0] == 'the':
+        tokens.pop(0)
+        
+    return ' '.join(tokens)
+
+def normalize_postcode(text):
+    """
+    Extract and normalize a UK postcode.
+    
+    Works on a bare postcode or a full address; the last postcode found wins.
+    
+    Args:
+        text (str): Postcode or address
+        
+    Returns:
+        str: Postcode as 'SW1A 1AA', or '' if there is none
+    """
+    if not text:
+        return ''
+    matches = _POSTCODE_RE.findall(str(text).upper())
+    if not matches:
+        return ''
+    outward, inward = matches[-1]
+    return f"{outward} {inward}"
+
+class LeadDeduplicator:
+    """Streaming deduplicator using hash blocking plus fuzzy name matching."""
+    
+    def __init__(self, threshold=0.9, max_block_size=50, default_country_code='44'):
+        """
+        Initialize the LeadDeduplicator.
+        
+        Args:
+            threshold (float): Minimum name similarity (0-1) for a fuzzy match
+            max_block_size (int): Maximum leads remembered per block
+            default_country_code (str): Country code for national phone numbers
+        """
+        self.threshold = threshold
+        self.max_block_size = max_block_size
+        self.default_country_code = default_country_code
+        
+        self.seen = 0
+        self.duplicates = 0
+        self._exact_keys = set()
+        self._blocks = {}
+        
+    def _block_key(self, name, phone, lead):
+        """Get the blocking key: the phone number, or name prefix plus location without one."""
+        if phone:
+            return 'p:' + phone
+        location = normalize_name(lead.get('location') or '')
+        return 'n:' + name.replace(' ', '')[:4] + '|' + location
+        
+    def _similar(self, a, b):
+        """Fuzzy string comparison with cheap upper-bound checks first."""
+        if a == b:
+            return True
+        matcher = SequenceMatcher(None, a, b)
+        return (matcher.real_quick_ratio() >= self.threshold
+                and matcher.quick_ratio() >= self.threshold
+                and matcher.ratio() >= self.threshold)
+                
+    def is_duplicate(self, lead):
+        """
+        Check a lead against everything seen so far, remembering it if new.
+        
+        Args:
+            lead (dict): Business data dictionary
+            
+        Returns:
+            bool: Whether the lead duplicates an earlier one
+        """
+        self.seen += 1
+        name = normalize_name(lead.get('name'))
+        phone = normalize_phone(lead.get('phone'), self.default_country_code)
+        
+        address = normalize_name(lead.get('address') or '')
+        block_key = self._block_key(name, phone, lead)
+        
+        exact_key = (name, phone) if phone else (name, block_key, address)
+        if exact_key in self._exact_keys:
+            self.duplicates += 1
+            return True
+        
+        block = self._blocks.setdefault(block_key, [])
+        for other_name, other_address in block:
+            if not self._similar(name, other_name):
+                continue
+            # Without a phone to anchor the match, the addresses must agree too
+            if phone or not address or not other_address or self._similar(address, other_address):
+                self.duplicates += 1
+                return True
+                
+        self._exact_keys.add(exact_key)
+        if len(block) < self.max_block_size:
+            block.append((name, address))
+        return False
+        
+    def filter(self, leads):
+        """
+        Yield only the leads that are not duplicates.
+        
+        Args:
+            leads (iterable): Business data dictionaries
+            
+        Yields:
+            dict: Unique leads, in input order
+        """
+        for lead in leads:
+            if not self.is_duplicate(lead):
+                yield lead
+                
+    def stats(self):
+        """
+        Get deduplication statistics.
+        
+        Returns:
+            dict: Leads seen, duplicates dropped and unique leads kept
+        """
+        return {
+            'seen': self.seen,
+            'duplicates': self.duplicates,
+            'unique': self.seen - self.duplicates
+        }
+
+def dedupe_leads(leads, **kwargs):
+    """
+    Deduplicate a stream of leads, e.g. as a pre-import pass.
+    
+    Args:
+        leads (iterable): Business data dictionaries
+        **kwargs: Options passed to LeadDeduplicator
+        
+    Yields:
+        dict: Unique leads, in input order
+    """
+    yield from LeadDeduplicator(**kwargs).filter(leads)
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Lead Enrichment
+
+This module fills missing contact fields (email, contact name, phone) on leads
+by joining them against a large local registry dump, such as a Companies
+House style bulk CSV, on normalized business name plus postcode. The join is a
+streaming hash join: a hash table is built from the leads (the small side) and
+the registry is read once, row by row, and probed against it. Memory is
+bounded by the lead set, however large the registry is.
+"""
+
+import os
+import io
+import csv
+import sys
+import gzip
+import json
+import time
+import zipfile
+import argparse
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.lead_dedup import normalize_name, normalize_postcode
+
+# Lead fields that enrichment fills when they are empty
+ENRICH_FIELDS = ('email', 'contact_name', 'phone')
+
+# Candidate registry column names for each role, matched case-insensitively
+REGISTRY_COLUMNS = {
+    'name': ['CompanyName', 'company_name', 'name', 'business_name'],
+    'postcode': ['RegAddress.PostCode', 'postcode', 'post_code', 'postal_code', 'zip'],
+    'email': ['email', 'contact_email', 'Email'],
+    'contact_name': ['contact_name', 'director', 'officer_name', 'ContactName'],
+    'phone': ['phone', 'telephone', 'phone_number'],
+}
+
+def _open_registry(path, encoding):
+    """Open a registry dump as text, transparently reading .gz files and single-file .zip archives."""
+    lower = path.lower()
+    if lower.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding=encoding, newline='')
+    if lower.endswith('.zip'):
+        archive = zipfile.ZipFile(path)
+        member = next(name for name in archive.namelist() if not name.endswith('/'))
+        return io.TextIOWrapper(archive.open(member), encoding=encoding, newline='')
+    return open(path, 'r', encoding=encoding, newline='')
+
+def _is_empty(value):
+    """Check whether a lead field is missing (None, '', or NaN from pandas)."""
+    return value is None or value != value or str(value).strip() == ''
+
+class RegistryEnricher:
+    """Streaming hash join of leads against a registry dump."""
+    
+    def __init__(self, registry_path, columns=None, fields=ENRICH_FIELDS, encoding='utf-8-sig',
+                 progress_interval=5.0):
+        """
+        Initialize the RegistryEnricher.
+        
+        Args:
+            registry_path (str): Path to the registry CSV (optionally .gz or .zip)
+            columns (dict): Registry column for each role ('name', 'postcode' and
+                            any of the fields), overriding the detected ones
+            fields (tuple): Lead fields to fill
+            encoding (str): Registry file encoding
+            progress_interval (float): Seconds between progress reports (None for quiet)
+        """
+        if not os.path.exists(registry_path):
+            raise FileNotFoundError(f"Registry file not found: {registry_path}")
+            
+        self.registry_path = registry_path
+        self.columns = columns or {}
+        self.fields = tuple(fields)
+        self.encoding = encoding
+        self.progress_interval = progress_interval
+        self._stats = {}
+        
+    def _resolve_columns(self, header):
+        """Map each role to its column index in the registry header."""
+        # Companies House headers carry leading spaces, e.g. ' CompanyNumber'
+        positions = {name.strip().lower(): i for i, name in enumerate(header)}
+        resolved = {}
+        for role in ('name', 'postcode') + self.fields:
+            candidates = [self.columns[role]] if role in self.columns else REGISTRY_COLUMNS.get(role, [])
+            for candidate in candidates:
+                if candidate.strip().lower() in positions:
+                    resolved[role] = positions[candidate.strip().lower()]
+                    break
+                    
+        for role in ('name', 'postcode'):
+            if role not in resolved:
+                raise ValueError(f"Registry {self.registry_path} has no {role} column; "
+                                 f"pass columns={{'{role}': ...}}")
+        return resolved
+        
+    def _build(self, leads):
+        """
+        Build the hash table on the leads that are missing a field.
+        
+        Returns:
+            tuple: ({(name, postcode key): [leads]}, set of compact postcodes)
+        """
+        table = {}
+        for lead in leads:
+            if not any(_is_empty(lead.get(field)) for field in self.fields):
+                continue
+            self._stats['candidates'] += 1
+            
+            postcode = normalize_postcode(lead.get('postcode') or lead.get('address'))
+            name = normalize_name(lead.get('name'))
+            if not postcode or not name:
+                continue
+            self._stats['joinable'] += 1
+            table.setdefault((name, postcode.replace(' ', '')), []).append(lead)
+            
+        return table, {postcode for _, postcode in table}
+        
+    def _report(self, rows, start, final=False):
+        """Print progress and throughput."""
+        elapsed = max(time.time() - start, 1e-9)
+        print(f"  {'Finished' if final else 'Scanned'} {rows:,} registry rows, "
+              f"{rows / elapsed:,.0f} rows/s, {self._stats['matched']:,} leads matched")
+              
+    def enrich(self, leads):
+        """
+        Fill missing contact fields on the leads, in place.
+        
+        Args:
+            leads (list): Business data dictionaries
+            
+        Returns:
+            list: The leads that had at least one field filled
+        """
+        leads = list(leads)
+        self._stats = {'leads': len(leads), 'candidates': 0, 'joinable': 0, 'matched': 0,
+                       'registry_rows': 0, 'seconds': 0.0}
+        self._stats.update({f'filled_{field}': 0 for field in self.fields})
+        
+        table, postcodes = self._build(leads)
+        start = last_report = time.time()
+        matched = {}
+        
+        if table:
+            with _open_registry(self.registry_path, self.encoding) as f:
+                reader = csv.reader(f)
+                columns = self._resolve_columns(next(reader, []))
+                name_col, postcode_col = columns['name'], columns['postcode']
+                field_cols = [(field, columns[field]) for field in self.fields if field in columns]
+                width = max(columns.values()) + 1
+                
+                rows = 0
+                for row in reader:
+                    rows += 1
+                    if rows % 65536 == 0 and self.progress_interval is not None \
+                            and time.time() - last_report >= self.progress_interval:
+                        last_report = time.time()
+                        self._stats['matched'] = len(matched)
+                        self._report(rows, start)
+                    if len(row) < width:
+                        continue
+                        
+                    # Cheap postcode probe first; most rows are rejected before normalizing the name
+                    postcode = row[postcode_col].replace(' ', '').upper()
+                    if postcode not in postcodes:
+                        continue
+                    bucket = table.get((normalize_name(row[name_col]), postcode))
+                    if bucket is None:
+                        continue
+                        
+                    for lead in bucket:
+                        for field, col in field_cols:
+                            value = row[col].strip()
+                            if value and _is_empty(lead.get(field)):
+                                lead[field] = value
+                                self._stats[f'filled_{field}'] += 1
+                                matched[id(lead)] = lead
+                                
+                self._stats['registry_rows'] = rows
+                
+        self._stats['matched'] = len(matched)
+        self._stats['seconds'] = round(time.time() - start, 3)
+        if self.progress_interval is not None:
+            self._report(self._stats['registry_rows'], start, final=True)
+        return list(matched.values())
+        
+    def stats(self):
+        """
+        Get statistics for the last enrich call.
+        
+        Returns:
+            dict: Leads, candidates (missing a field), joinable (name and postcode
+                  known), matched, registry rows scanned, seconds and filled counts per field
+        """
+        return dict(self._stats)
+
+def enrich_leads(leads, registry_path, **kwargs):
+    """
+    Fill missing contact fields on leads from a registry dump.
+    
+    Args:
+        leads (list): Business data dictionaries, updated in place
+        registry_path (str): Path to the registry CSV
+        **kwargs: Options passed to RegistryEnricher
+        
+    Returns:
+        dict: Match statistics
+    """
+    enricher = RegistryEnricher(registry_path, **kwargs)
+    enricher.enrich(leads)
+    return enricher.stats()
+
+def print_enrichment_stats(stats):
+    """Print match statistics from RegistryEnricher.stats."""
+    print(f"Matched {stats['matched']} of {stats['candidates']} leads missing contact fields "
+          f"({stats['joinable']} had a name and postcode) against {stats['registry_rows']:,} registry rows "
+          f"in {stats['seconds']:.1f}s")
+    for key, value in stats.items():
+        if key.startswith('filled_'):
+            print(f"  {key[len('filled_'):]}: {value} filled")
+
+def main():
+    """Enrich a leads file from a registry dump."""
+    parser = argparse.ArgumentParser(description='Fill missing lead contact fields from a local registry dump.')
+    parser.add_argument('--registry', '-r', type=str, required=True,
+                        help='Registry CSV (optionally .gz or .zip), e.g. a Companies House bulk download')
+    parser.add_argument('--input-file', '-i', type=str, required=True,
+                        help='Leads file (CSV or JSON)')
+    parser.add_argument('--output-file', '-o', type=str, default=None,
+                        help='Output file (default: overwrite the input file)')
+    parser.add_argument('--name-column', type=str, default=None,
+                        help='Registry column holding the business name')
+    parser.add_argument('--postcode-column', type=str, default=None,
+                        help='Registry column holding the postcode')
+    args = parser.parse_args()
+    
+    columns = {}
+    if args.name_column:
+        columns['name'] = args.name_column
+    if args.postcode_column:
+        columns['postcode'] = args.postcode_column
+        
+    if args.input_file.endswith('.csv'):
+        with open(args.input_file, 'r', encoding='utf-8', newline='') as f:
+            leads = list(csv.DictReader(f))
+    else:
+        with open(args.input_file, 'r', encoding='utf-8') as f:
+            leads = json.load(f)
+            
+    stats = enrich_leads(leads, args.registry, columns=columns)
+    print_enrichment_stats(stats)
+    
+    output_file = args.output_file or args.input_file
+    if output_file.endswith('.csv'):
+        fieldnames = list(dict.fromkeys(key for lead in leads for key in lead))
+        with open(output_file, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(leads)
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(leads, f, indent=2)
+    print(f"Enriched leads written to {output_file}")
+
+if __name__ == "__main__":
+    main()
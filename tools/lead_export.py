@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Lead Export Writers
+
+This module provides streaming writers for business leads. Records are written
+one at a time as they arrive from a result iterator, so memory stays bounded
+regardless of how many leads are exported. CSV, NDJSON and JSON are always
+available (optionally gzip-compressed); Parquet and Arrow need pyarrow.
+"""
+
+import os
+import csv
+import gzip
+import json
+from abc import ABC, abstractmethod
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Columns of a search result, in the order the finder produces them
+SEARCH_FIELDS = [
+    'name', 'address', 'phone', 'has_website', 'website', 'category',
+    'rating', 'review_count', 'location', 'source', 'place_id', 'latitude', 'longitude'
+]
+
+# Standard lead columns: search results plus what contact details, presence probing and scoring add
+LEAD_FIELDS = SEARCH_FIELDS + ['email', 'contact_name', 'has_social_media', 'social_media', 'score']
+
+# Numeric lead columns
+FLOAT_FIELDS = {'rating', 'review_count', 'latitude', 'longitude', 'score'}
+
+# Boolean lead columns
+BOOL_FIELDS = {'has_website', 'has_social_media'}
+
+# Export format -> default file extension
+EXPORT_FORMATS = {
+    'csv': '.csv',
+    'csv.gz': '.csv.gz',
+    'ndjson': '.ndjson',
+    'ndjson.gz': '.ndjson.gz',
+    'json': '.json',
+    'parquet': '.parquet',
+    'arrow': '.arrow'
+}
+
+def _open_text(filepath, compress):
+    """Open a text file for writing, gzip-compressed if requested."""
+    if compress:
+        return gzip.open(filepath, 'wt', encoding='utf-8', newline='')
+    return open(filepath, 'w', encoding='utf-8', newline='')
+
+class LeadWriter(ABC):
+    """Base class for streaming lead writers."""
+    
+    def __init__(self, filepath, fields=None):
+        """
+        Initialize the writer.
+        
+        Args:
+            filepath (str): Path of the file to write
+            fields (list): Columns to write, defaults to LEAD_FIELDS
+        """
+        self.filepath = filepath
+        self.fields = list(fields or LEAD_FIELDS)
+        self.count = 0
+        
+    @abstractmethod
+    def write(self, lead):
+        """Write a single lead."""
+        
+    def write_all(self, leads):
+        """
+        Write every lead from an iterable.
+        
+        Args:
+            leads (iterable): Lead dictionaries
+            
+        Returns:
+            int: Total number of leads written so far
+        """
+        for lead in leads:
+            self.write(lead)
+        return self.count
+        
+    @abstractmethod
+    def close(self):
+        """Flush and close the output file."""
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class CsvLeadWriter(LeadWriter):
+    """Streaming CSV writer."""
+    
+    def __init__(self, filepath, fields=None, compress=False):
+        super().__init__(filepath, fields)
+        self._file = _open_text(filepath, compress)
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fields, extrasaction='ignore', lineterminator='\n')
+        self._writer.writeheader()
+        
+    def write(self, lead):
+        self._writer.writerow(lead)
+        self.count += 1
+        
+    def close(self):
+        self._file.close()
+
+class NdjsonLeadWriter(LeadWriter):
+    """Streaming newline-delimited JSON writer (one lead per line)."""
+    
+    def __init__(self, filepath, fields=None, compress=False):
+        super().__init__(filepath, fields)
+        self._file = _open_text(filepath, compress)
+        
+    def write(self, lead):
+        self._file.write(json.dumps(lead) + '\n')
+        self.count += 1
+        
+    def close(self):
+        self._file.close()
+
+class JsonLeadWriter(LeadWriter):
+    """Streaming writer for a single indented JSON array."""
+    
+    def __init__(self, filepath, fields=None, compress=False):
+        super().__init__(filepath, fields)
+        self._file = _open_text(filepath, compress)
+        self._file.write('[')
+        
+    def write(self, lead):
+        item = json.dumps(lead, indent=2).replace('\n', '\n  ')
+        self._file.write((',\n  ' if self.count else '\n  ') + item)
+        self.count += 1
+        
+    def close(self):
+        self._file.write('\n]' if self.count else ']')
+        self._file.close()
+
+class ArrowLeadWriter(LeadWriter):
+    """Columnar Parquet / Arrow IPC writer that flushes fixed-size record batches."""
+    
+    def __init__(self, filepath, fields=None, file_format='parquet', batch_size=65536):
+        if pa is None:
+            raise ImportError("pyarrow is required for Parquet/Arrow export (pip install pyarrow)")
+        super().__init__(filepath, fields)
+        self.batch_size = batch_size
+        self.schema = pa.schema([
+            (field, pa.bool_() if field in BOOL_FIELDS
+             else pa.float64() if field in FLOAT_FIELDS
+             else pa.string())
+            for field in self.fields
+        ])
+        if file_format == 'parquet':
+            self._writer = pq.ParquetWriter(filepath, self.schema)
+        else:
+            self._writer = pa.ipc.new_file(filepath, self.schema)
+        self._columns = {field: [] for field in self.fields}
+        
+    def write(self, lead):
+        for field in self.fields:
+            value = lead.get(field)
+            if field in BOOL_FIELDS:
+                value = bool(value)
+            elif field in FLOAT_FIELDS:
+                value = float(value) if value not in (None, '') else None
+            elif value is not None:
+                value = str(value)
+            self._columns[field].append(value)
+        self.count += 1
+        
+        if len(self._columns[self.fields[0]]) >= self.batch_size:
+            self._flush()
+            
+    def _flush(self):
+        """Write the buffered rows as one record batch."""
+        if not self._columns[self.fields[0]]:
+            return
+        self._writer.write_table(pa.Table.from_pydict(self._columns, schema=self.schema))
+        self._columns = {field: [] for field in self.fields}
+        
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+def infer_format(filepath):
+    """
+    Infer the export format from a file name.
+    
+    Args:
+        filepath (str): Output path
+        
+    Returns:
+        str: Export format, defaulting to 'csv'
+    """
+    name = os.path.basename(filepath).lower()
+    for fmt, extension in sorted(EXPORT_FORMATS.items(), key=lambda item: -len(item[1])):
+        if name.endswith(extension):
+            return fmt
+    return 'csv'
+
+def open_lead_writer(filepath, fmt=None, fields=None):
+    """
+    Open a streaming writer for the requested format.
+    
+    Args:
+        filepath (str): Path of the file to write
+        fmt (str): Export format (see EXPORT_FORMATS), inferred from the path if omitted
+        fields (list): Columns to write, defaults to LEAD_FIELDS
+        
+    Returns:
+        LeadWriter: Writer to feed leads into
+    """
+    fmt = fmt or infer_format(filepath)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+        
+    compress = fmt.endswith('.gz')
+    base_format = fmt[:-3] if compress else fmt
+    
+    if base_format == 'csv':
+        return CsvLeadWriter(filepath, fields, compress=compress)
+    if base_format == 'ndjson':
+        return NdjsonLeadWriter(filepath, fields, compress=compress)
+    if base_format == 'json':
+        return JsonLeadWriter(filepath, fields)
+    return ArrowLeadWriter(filepath, fields, file_format=base_format)
+
+def export_leads(leads, filepath, fmt=None, fields=None):
+    """
+    Stream leads from an iterable into a file.
+    
+    Args:
+        leads (iterable): Lead dictionaries, e.g. from BusinessFinder.iter_businesses
+        filepath (str): Path of the file to write
+        fmt (str): Export format, inferred from the path if omitted
+        fields (list): Columns to write, defaults to LEAD_FIELDS
+        
+    Returns:
+        int: Number of leads written
+    """
+    with open_lead_writer(filepath, fmt, fields) as writer:
+        return writer.write_all(leads)
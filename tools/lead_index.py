@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Lead Index
+
+This module provides an in-memory index over business leads for fast
+interactive filtering. Category text is tokenized into an inverted index,
+ratings are kept in a sorted array for range queries, and filters are
+expressed as composable predicates shared by the CLI and the dashboard.
+"""
+
+import re
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+def tokenize(text):
+    """
+    Split text into normalized lowercase tokens.
+    
+    Args:
+        text (str): Text to tokenize
+        
+    Returns:
+        list: Alphanumeric tokens
+    """
+    return _TOKEN_RE.findall(str(text or '').lower())
+
+def _rating(lead):
+    """Get a lead's rating as a float, treating missing values as 0."""
+    try:
+        return float(lead.get('rating') or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+class Predicate(ABC):
+    """Base class for composable lead filters."""
+    
+    @abstractmethod
+    def ids(self, index):
+        """
+        Get the IDs of all indexed leads matching the predicate.
+        
+        Args:
+            index (LeadIndex): Index to query
+            
+        Returns:
+            set: Matching lead IDs
+        """
+        
+    def refine(self, index, ids):
+        """Narrow an existing ID set down to the leads matching the predicate."""
+        return ids & self.ids(index)
+        
+    @abstractmethod
+    def matches(self, lead):
+        """
+        Test a single lead without an index (used when streaming).
+        
+        Args:
+            lead (dict): Business data dictionary
+            
+        Returns:
+            bool: Whether the lead matches
+        """
+        
+    def __and__(self, other):
+        return And(self, other)
+        
+    def __or__(self, other):
+        return Or(self, other)
+
+class MinRating(Predicate):
+    """Leads rated at or above a threshold."""
+    
+    def __init__(self, min_rating):
+        self.min_rating = float(min_rating)
+        
+    def ids(self, index):
+        return index.ids_with_rating_at_least(self.min_rating)
+        
+    def refine(self, index, ids):
+        # Checking the candidates directly beats materializing the whole range
+        return {i for i in ids if index.rating(i) >= self.min_rating}
+        
+    def matches(self, lead):
+        return _rating(lead) >= self.min_rating
+
+class CategoryMatch(Predicate):
+    """Leads whose category contains any of the given terms (case-insensitive)."""
+    
+    def __init__(self, categories):
+        self.categories = [str(cat) for cat in categories]
+        
+    def ids(self, index):
+        matched = set()
+        for category in self.categories:
+            matched |= index.ids_for_category(category)
+        return matched
+        
+    def matches(self, lead):
+        text = str(lead.get('category') or '').lower()
+        return any(category.lower() in text for category in self.categories)
+
+class NoSocialMedia(Predicate):
+    """Leads without a known social media presence."""
+    
+    def ids(self, index):
+        return index.all_ids() - index.social_media_ids
+        
+    def refine(self, index, ids):
+        return ids - index.social_media_ids
+        
+    def matches(self, lead):
+        return not lead.get('has_social_media', False)
+
+class And(Predicate):
+    """Leads matching every child predicate."""
+    
+    def __init__(self, *predicates):
+        self.predicates = predicates
+        
+    def ids(self, index):
+        ids = self.predicates[0].ids(index)
+        for predicate in self.predicates[1:]:
+            if not ids:
+                break
+            ids = predicate.refine(index, ids)
+        return ids
+        
+    def matches(self, lead):
+        return all(predicate.matches(lead) for predicate in self.predicates)
+
+class Or(Predicate):
+    """Leads matching at least one child predicate."""
+    
+    def __init__(self, *predicates):
+        self.predicates = predicates
+        
+    def ids(self, index):
+        ids = set()
+        for predicate in self.predicates:
+            ids |= predicate.ids(index)
+        return ids
+        
+    def matches(self, lead):
+        return any(predicate.matches(lead) for predicate in self.predicates)
+
+def build_predicate(min_rating=None, categories=None, exclude_social_media=False):
+    """
+    Build the standard lead filter from the usual filter options.
+    
+    Args:
+        min_rating (float): Minimum rating to include
+        categories (list): List of categories to include
+        exclude_social_media (bool): Whether to exclude businesses with social media
+        
+    Returns:
+        Predicate: Combined predicate, or None when no filter is set
+    """
+    predicates = []
+    if categories:
+        predicates.append(CategoryMatch(categories))
+    if min_rating is not None:
+        predicates.append(MinRating(min_rating))
+    if exclude_social_media:
+        predicates.append(NoSocialMedia())
+        
+    if not predicates:
+        return None
+    if len(predicates) == 1:
+        return predicates[0]
+    return And(*predicates)
+
+def filter_leads(leads, min_rating=None, categories=None, exclude_social_media=False):
+    """
+    Filter leads in a single pass, without building an index.
+    
+    Cheaper than LeadIndex for a list that is only queried once, such as
+    the results of one search.
+    
+    Args:
+        leads (iterable): Business data dictionaries
+        min_rating (float): Minimum rating to include
+        categories (list): List of categories to include
+        exclude_social_media (bool): Whether to exclude businesses with social media
+        
+    Returns:
+        list: Matching leads, in their original order
+    """
+    predicate = build_predicate(min_rating, categories, exclude_social_media)
+    if predicate is None:
+        return list(leads)
+    return [lead for lead in leads if predicate.matches(lead)]
+
+class LeadIndex:
+    """In-memory index over a list of leads."""
+    
+    def __init__(self, leads=None):
+        """
+        Initialize the LeadIndex.
+        
+        Args:
+            leads (list): Leads to index. The list is referenced, not copied;
+                          call refresh() after appending to it.
+        """
+        self.leads = leads if leads is not None else []
+        self._reset()
+        self.refresh()
+        
+    def _reset(self):
+        """Drop all index structures."""
+        self._indexed = 0
+        self._postings = {}
+        self._term_cache = {}
+        self._ratings = []
+        self._sorted_ratings = None
+        self._sorted_ids = None
+        self.social_media_ids = set()
+        
+    def refresh(self):
+        """Index leads appended to the underlying list since the last refresh."""
+        if len(self.leads) < self._indexed:
+            # The list shrank, so earlier IDs are no longer valid
+            self._reset()
+            
+        if len(self.leads) == self._indexed:
+            return
+            
+        for lead_id in range(self._indexed, len(self.leads)):
+            lead = self.leads[lead_id]
+            for token in set(tokenize(lead.get('category'))):
+                self._postings.setdefault(token, []).append(lead_id)
+            self._ratings.append(_rating(lead))
+            if lead.get('has_social_media', False):
+                self.social_media_ids.add(lead_id)
+                
+        self._indexed = len(self.leads)
+        self._term_cache = {}
+        self._sorted_ratings = None
+        self._sorted_ids = None
+        
+    def add(self, lead):
+        """Append and index a single lead."""
+        self.leads.append(lead)
+        self.refresh()
+        
+    def extend(self, leads):
+        """Append and index several leads."""
+        self.leads.extend(leads)
+        self.refresh()
+        
+    def __len__(self):
+        return self._indexed
+        
+    def all_ids(self):
+        """Get the IDs of every indexed lead."""
+        return set(range(self._indexed))
+        
+    def rating(self, lead_id):
+        """Get the normalized rating of an indexed lead."""
+        return self._ratings[lead_id]
+        
+    def ids_with_rating_at_least(self, min_rating):
+        """
+        Range query on the sorted rating array.
+        
+        Args:
+            min_rating (float): Minimum rating
+            
+        Returns:
+            set: IDs of leads rated at or above min_rating
+        """
+        if self._sorted_ratings is None:
+            order = sorted(range(self._indexed), key=self._ratings.__getitem__)
+            self._sorted_ids = order
+            self._sorted_ratings = [self._ratings[i] for i in order]
+            
+        start = bisect_left(self._sorted_ratings, min_rating)
+        return set(self._sorted_ids[start:])
+        
+    def ids_for_category(self, term):
+        """
+        Look up leads whose category contains a term (case-insensitive substring).
+        
+        The term is tokenized and each token is matched against the token
+        vocabulary, which is far smaller than the number of leads. Terms that
+        could straddle token boundaries are verified against the raw text.
+        
+        Args:
+            term (str): Category term
+            
+        Returns:
+            set: Matching lead IDs
+        """
+        term = term.lower()
+        if term in self._term_cache:
+            return self._term_cache[term]
+            
+        term_tokens = tokenize(term)
+        if not term_tokens:
+            ids = self.all_ids() if not term else {
+                i for i in range(self._indexed)
+                if term in str(self.leads[i].get('category') or '').lower()
+            }
+        else:
+            ids = None
+            for term_token in term_tokens:
+                token_ids = set()
+                for token, postings in self._postings.items():
+                    if term_token in token:
+                        token_ids.update(postings)
+                ids = token_ids if ids is None else ids & token_ids
+                if not ids:
+                    break
+                    
+            if ids and term_tokens != [term]:
+                ids = {i for i in ids if term in str(self.leads[i].get('category') or '').lower()}
+                
+        self._term_cache[term] = ids
+        return ids
+        
+    def query(self, predicate):
+        """
+        Get the leads matching a predicate, in their original order.
+        
+        Args:
+            predicate (Predicate): Filter to apply, or None for all leads
+            
+        Returns:
+            list: Matching lead dictionaries
+        """
+        self.refresh()
+        if predicate is None:
+            return list(self.leads)
+        return [self.leads[i] for i in sorted(predicate.ids(self))]
+        
+    def filter(self, min_rating=None, categories=None, exclude_social_media=False):
+        """
+        Filter the indexed leads with the standard filter options.
+        
+        Args:
+            min_rating (float): Minimum rating to include
+            categories (list): List of categories to include
+            exclude_social_media (bool): Whether to exclude businesses with social media
+            
+        Returns:
+            list: Filtered list of business data dictionaries
+        """
+        return self.query(build_predicate(min_rating, categories, exclude_social_media))
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Lead File Readers
+
+This module is the reading counterpart of lead_export: it streams business
+leads out of CSV, NDJSON and JSON files (optionally gzip-compressed) one
+record at a time, so a multi-gigabyte lead file can be imported or rendered
+in constant memory. CSV columns are converted with explicit types instead of
+pandas inference, and JSON arrays are parsed incrementally.
+"""
+
+import os
+import csv
+import sys
+import gzip
+import json
+from itertools import islice
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.json_stream import iter_json_array
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+# Input format -> file extensions (checked after stripping .gz)
+READ_FORMATS = {
+    'csv': ('.csv', '.tsv'),
+    'ndjson': ('.ndjson', '.jsonl'),
+    'json': ('.json', '.geojson'),
+}
+
+def _to_bool(value):
+    """Parse a CSV boolean ('True', 'yes', '1'...)."""
+    return value.strip().lower() in ('true', 'yes', 'y', '1', 't')
+
+def _to_int(value):
+    """Parse a CSV integer, accepting float notation such as '12.0'."""
+    return int(float(value))
+
+# Column -> type of the standard lead columns read from CSV; other columns stay text
+LEAD_DTYPES = {
+    'id': int,
+    'has_website': bool,
+    'rating': float,
+    'review_count': int,
+    'latitude': float,
+    'longitude': float,
+}
+
+_CONVERTERS = {bool: _to_bool, int: _to_int, float: float, str: str}
+
+def open_lead_file(filepath):
+    """
+    Open a lead file as text, decompressing it if it is gzipped.
+    
+    Compression is detected from the file contents, so a gzipped file is
+    read correctly whatever its name.
+    
+    Args:
+        filepath (str): Path of the file to read
+        
+    Returns:
+        file: Text file object
+    """
+    with open(filepath, 'rb') as f:
+        compressed = f.read(2) == _GZIP_MAGIC
+    if compressed:
+        return gzip.open(filepath, 'rt', encoding='utf-8-sig', newline='')
+    return open(filepath, 'r', encoding='utf-8-sig', newline='')
+
+def infer_read_format(filepath):
+    """
+    Infer the format of a lead file from its name.
+    
+    Args:
+        filepath (str): Path of the file to read
+        
+    Returns:
+        str: 'csv', 'ndjson' or 'json'
+    """
+    name = os.path.basename(filepath).lower()
+    if name.endswith('.gz'):
+        name = name[:-3]
+    for fmt, extensions in READ_FORMATS.items():
+        if name.endswith(extensions):
+            return fmt
+    raise ValueError(f"Unsupported lead file format: {filepath}")
+
+def iter_csv(f, dtypes=None, delimiter=','):
+    """
+    Stream records from a CSV file.
+    
+    Empty cells are left out of the record, so callers' defaults apply, and
+    values of typed columns that do not parse are dropped the same way.
+    
+    Args:
+        f (file): Text file object
+        dtypes (dict): Column -> bool/int/float/str (default: LEAD_DTYPES)
+        delimiter (str): Field delimiter
+        
+    Yields:
+        dict: One record per row
+    """
+    dtypes = LEAD_DTYPES if dtypes is None else dtypes
+    reader = csv.reader(f, delimiter=delimiter)
+    header = [name.strip() for name in next(reader, [])]
+    converters = [_CONVERTERS.get(dtypes.get(name)) for name in header]
+    columns = list(zip(header, converters))
+    
+    for row in reader:
+        record = {}
+        for (name, convert), value in zip(columns, row):
+            if value == '':
+                continue
+            if convert is not None:
+                try:
+                    value = convert(value)
+                except ValueError:
+                    continue
+            record[name] = value
+        if record:
+            yield record
+
+def iter_ndjson(f):
+    """
+    Stream records from an NDJSON file, one JSON object per line.
+    
+    Args:
+        f (file): Text file object
+        
+    Yields:
+        dict: One record per non-blank line
+    """
+    for number, line in enumerate(f, 1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"Invalid JSON on line {number}: {e}") from None
+
+class _Prefixed:
+    """Read-only file wrapper that yields some already-consumed text first."""
+    
+    def __init__(self, prefix, f):
+        self.prefix = prefix
+        self.f = f
+        
+    def read(self, size=-1):
+        if not self.prefix:
+            return self.f.read(size)
+        text, self.prefix = self.prefix, ''
+        if size is None or size < 0:
+            return text + self.f.read()
+        return text + self.f.read(size - len(text)) if size > len(text) else text
+        
+    def __iter__(self):
+        if self.prefix:
+            text, self.prefix = self.prefix, ''
+            yield text + self.f.readline()
+        yield from self.f
+
+def iter_json(f, key=None):
+    """
+    Stream records from a JSON file.
+    
+    A top-level array is parsed item by item. A file that starts with '{'
+    is read as the array under key (e.g. 'results') if one is given, and
+    as NDJSON otherwise, since line-delimited exports are often named .json.
+    
+    Args:
+        f (file): Text file object
+        key (str): Key of the record array in a top-level object
+        
+    Yields:
+        dict: One record per array item
+    """
+    first = f.read(1)
+    while first.isspace():
+        first = f.read(1)
+    if not first:
+        return
+        
+    # Put the consumed character back in front of the rest of the stream
+    stream = _Prefixed(first, f)
+    if first == '{' and key is None:
+        yield from iter_ndjson(stream)
+    else:
+        yield from iter_json_array(stream, key=key)
+
+def iter_leads(filepath, fmt=None, dtypes=None, key=None):
+    """
+    Stream leads from a CSV, NDJSON or JSON file, optionally gzipped.
+    
+    Args:
+        filepath (str): Path of the file to read
+        fmt (str): 'csv', 'ndjson' or 'json', inferred from the path if omitted
+        dtypes (dict): CSV column types (default: LEAD_DTYPES)
+        key (str): Key of the record array in a top-level JSON object
+        
+    Yields:
+        dict: Business data dictionaries, in file order
+    """
+    fmt = fmt or infer_read_format(filepath)
+    if fmt not in READ_FORMATS:
+        raise ValueError(f"Unsupported lead file format: {fmt}")
+        
+    with open_lead_file(filepath) as f:
+        if fmt == 'csv':
+            delimiter = '\t' if filepath.lower().endswith(('.tsv', '.tsv.gz')) else ','
+            yield from iter_csv(f, dtypes, delimiter)
+        elif fmt == 'ndjson':
+            yield from iter_ndjson(f)
+        else:
+            yield from iter_json(f, key)
+
+def iter_lead_chunks(filepath, chunk_size=5000, **kwargs):
+    """
+    Stream leads from a file in lists of up to chunk_size.
+    
+    Args:
+        filepath (str): Path of the file to read
+        chunk_size (int): Leads per chunk
+        **kwargs: Options passed to iter_leads
+        
+    Returns:
+        iterator: Lists of business data dictionaries
+    """
+    leads = iter_leads(filepath, **kwargs)
+    return iter(lambda: list(islice(leads, chunk_size)), [])
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Lead Scoring
+
+This module ranks leads by a priority score so the best prospects are
+contacted first. Scores are computed with NumPy over columnar arrays built
+from the leads (rating, review count, category value, distance and recency),
+and the top k leads are selected with a partial sort rather than a full one.
+"""
+
+import numpy as np
+
+# Relative value of a new website client by category (matched as a substring)
+CATEGORY_VALUES = {
+    'dentist': 1.0, 'dental': 1.0, 'solicitor': 1.0, 'accountant': 0.95, 'clinic': 0.9,
+    'builder': 0.85, 'construction': 0.85, 'roofing': 0.85, 'plumb': 0.8, 'electric': 0.8,
+    'mechanic': 0.75, 'garage': 0.75, 'beauty': 0.7, 'salon': 0.7, 'hair': 0.65,
+    'florist': 0.6, 'restaurant': 0.6, 'clean': 0.55, 'pub': 0.5, 'cafe': 0.45,
+}
+DEFAULT_CATEGORY_VALUE = 0.5
+
+# Weight of each score component
+DEFAULT_WEIGHTS = {
+    'rating': 0.35,
+    'reviews': 0.2,
+    'category': 0.2,
+    'distance': 0.15,
+    'recency': 0.1,
+}
+
+def _to_float(value):
+    """Convert a lead value to float, NaN if missing or invalid."""
+    if value is None or value == '':
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+def _encode(values):
+    """
+    Dictionary-encode a list of hashable values.
+    
+    Returns:
+        tuple: (int64 code per value, distinct values in first-seen order)
+    """
+    codes = {value: code for code, value in enumerate(dict.fromkeys(values))}
+    return np.fromiter(map(codes.__getitem__, values), dtype=np.int64, count=len(values)), list(codes)
+
+def _float_column(values):
+    """Convert one field's values to a float array, NaN where missing or invalid."""
+    try:
+        # NumPy maps None to NaN and parses numeric strings itself
+        return np.array(values, dtype=float)
+    except (TypeError, ValueError):
+        # An empty or malformed value somewhere: convert value by value
+        return np.array([_to_float(value) for value in values], dtype=float)
+
+def leads_to_columns(leads):
+    """
+    Convert lead dictionaries into the columnar arrays used for scoring.
+    
+    Categories are dictionary-encoded: 'category' holds an integer code per
+    lead and 'category_names' the distinct lowercased names. Each column is
+    read in a single pass, and categories and dates are normalized once per
+    distinct value rather than once per lead.
+    
+    Args:
+        leads (list): Business data dictionaries
+        
+    Returns:
+        dict: Arrays 'rating', 'review_count', 'category', 'latitude', 'longitude', 'added'
+              plus the 'category_names' list
+    """
+    raw_codes, raw_categories = _encode([lead.get('category') for lead in leads])
+    codes = {}
+    names = np.array([codes.setdefault(str(value or '').lower(), len(codes)) for value in raw_categories],
+                     dtype=np.int64)
+    
+    added_codes, raw_added = _encode([lead.get('date_added') for lead in leads])
+    try:
+        added = np.array([str(value or '').replace(' ', 'T') or 'NaT' for value in raw_added], dtype='datetime64[s]')
+    except ValueError:
+        added = np.array(['NaT'] * len(raw_added), dtype='datetime64[s]')
+        
+    return {
+        'rating': _float_column([lead.get('rating') for lead in leads]),
+        'review_count': _float_column([lead.get('review_count') for lead in leads]),
+        'category': names[raw_codes] if len(names) else raw_codes,
+        'category_names': list(codes),
+        'latitude': _float_column([lead.get('latitude') for lead in leads]),
+        'longitude': _float_column([lead.get('longitude') for lead in leads]),
+        'added': added[added_codes] if len(added) else np.zeros(0, dtype='datetime64[s]')
+    }
+
+class LeadScorer:
+    """Vectorized priority scoring of leads."""
+    
+    def __init__(self, weights=None, category_values=None, origin=None, distance_scale_km=5.0,
+                 recency_half_life_days=30.0, review_saturation=200):
+        """
+        Initialize the LeadScorer.
+        
+        Args:
+            weights (dict): Component weights (see DEFAULT_WEIGHTS)
+            category_values (dict): Category substring -> value between 0 and 1
+            origin (tuple): Optional (lat, lng); closer leads score higher
+            distance_scale_km (float): Distance at which the distance score halves
+            recency_half_life_days (float): Age at which the recency score halves
+            review_saturation (int): Review count that earns the full review score
+        """
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.category_values = category_values or CATEGORY_VALUES
+        self.origin = origin
+        self.distance_scale_km = distance_scale_km
+        self.recency_half_life_days = recency_half_life_days
+        self.review_saturation = review_saturation
+        
+    def _category_scores(self, codes, names):
+        """Score each distinct category once and broadcast back to the rows."""
+        values = np.array([
+            max((value for term, value in self.category_values.items() if term in name),
+                default=DEFAULT_CATEGORY_VALUE)
+            for name in names
+        ] or [DEFAULT_CATEGORY_VALUE])
+        return values[codes]
+        
+    def _distances_km(self, latitude, longitude):
+        """Vectorized haversine distance from the origin."""
+        lat0, lng0 = np.radians(self.origin[0]), np.radians(self.origin[1])
+        lat, lng = np.radians(latitude), np.radians(longitude)
+        a = np.sin((lat - lat0) / 2) ** 2 + np.cos(lat0) * np.cos(lat) * np.sin((lng - lng0) / 2) ** 2
+        return 2 * 6371.0088 * np.arcsin(np.sqrt(a))
+        
+    def score_columns(self, columns, now=None):
+        """
+        Score leads given as columnar arrays.
+        
+        Args:
+            columns (dict): Arrays as returned by leads_to_columns
+            now (numpy.datetime64): Reference time for recency (default: now)
+            
+        Returns:
+            numpy.ndarray: Scores between 0 and 100
+        """
+        rating = np.nan_to_num(columns['rating'], nan=0.0)
+        reviews = np.nan_to_num(columns['review_count'], nan=0.0)
+        
+        components = {
+            'rating': np.clip(rating / 5.0, 0.0, 1.0),
+            'reviews': np.clip(np.log1p(np.maximum(reviews, 0)) / np.log1p(self.review_saturation), 0.0, 1.0),
+            'category': self._category_scores(columns['category'], columns['category_names']),
+        }
+        
+        if self.origin is not None:
+            distance = self._distances_km(columns['latitude'], columns['longitude'])
+            # Leads without coordinates get no distance credit
+            components['distance'] = np.nan_to_num(1.0 / (1.0 + distance / self.distance_scale_km), nan=0.0)
+            
+        added = columns.get('added')
+        if added is not None and not np.isnat(added).all():
+            now = now if now is not None else np.datetime64('now', 's')
+            age_days = (now - added) / np.timedelta64(1, 'D')
+            components['recency'] = np.nan_to_num(0.5 ** (np.maximum(age_days, 0) / self.recency_half_life_days), nan=0.0)
+            
+        # Components that cannot be computed drop out and the rest are renormalized
+        total_weight = sum(self.weights[name] for name in components)
+        score = np.zeros(len(rating))
+        for name, values in components.items():
+            score += self.weights[name] * values
+        return 100.0 * score / total_weight if total_weight else score
+        
+    def score(self, leads, now=None, columns=None):
+        """
+        Score a list of leads.
+        
+        Args:
+            leads (list): Business data dictionaries
+            now (numpy.datetime64): Reference time for recency
+            columns (dict): Optional arrays already built from leads by leads_to_columns
+            
+        Returns:
+            numpy.ndarray: Scores between 0 and 100, in lead order
+        """
+        return self.score_columns(leads_to_columns(leads) if columns is None else columns, now)
+        
+    @staticmethod
+    def top_indices(scores, k):
+        """
+        Get the indices of the k highest scores, best first.
+        
+        Uses argpartition (O(n)) and only sorts the k selected scores;
+        ties among the selected leads keep their original order.
+        
+        Args:
+            scores (numpy.ndarray): Scores
+            k (int): Number of indices to return
+            
+        Returns:
+            numpy.ndarray: Indices into scores
+        """
+        n = len(scores)
+        k = max(0, min(int(k), n))
+        if k == 0:
+            return np.zeros(0, dtype=int)
+        candidates = np.arange(n) if k == n else np.argpartition(-scores, k - 1)[:k]
+        order = np.lexsort((candidates, -scores[candidates]))
+        return candidates[order]
+        
+    def top_k(self, leads, k, now=None, columns=None):
+        """
+        Get the k highest-priority leads.
+        
+        Args:
+            leads (list): Business data dictionaries
+            k (int): Number of leads to return
+            now (numpy.datetime64): Reference time for recency
+            columns (dict): Optional arrays already built from leads by leads_to_columns,
+                            so repeated rankings of the same leads skip the conversion
+            
+        Returns:
+            list: Copies of the best leads with a 'score' key, best first
+        """
+        leads = list(leads)
+        scores = self.score(leads, now, columns)
+        return [dict(leads[i], score=round(float(scores[i]), 2)) for i in self.top_indices(scores, k)]
+        
+    def top_k_stream(self, leads, k, chunk_size=65536, now=None):
+        """
+        Get the k highest-priority leads from a stream without holding it all in memory.
+        
+        Leads are scored a chunk at a time and merged into the running top k,
+        so memory stays at O(k + chunk_size).
+        
+        Args:
+            leads (iterable): Business data dictionaries
+            k (int): Number of leads to return
+            chunk_size (int): Leads scored per batch
+            now (numpy.datetime64): Reference time for recency
+            
+        Returns:
+            list: Copies of the best leads with a 'score' key, best first
+        """
+        best = []
+        best_scores = np.zeros(0)
+        chunk = []
+        
+        def merge(chunk):
+            nonlocal best, best_scores
+            candidates = best + chunk
+            scores = np.concatenate([best_scores, self.score(chunk, now)])
+            keep = self.top_indices(scores, k)
+            best = [candidates[i] for i in keep]
+            best_scores = scores[keep]
+            
+        for lead in leads:
+            chunk.append(lead)
+            if len(chunk) >= chunk_size:
+                merge(chunk)
+                chunk = []
+        if chunk:
+            merge(chunk)
+            
+        return [dict(lead, score=round(float(score), 2)) for lead, score in zip(best, best_scores)]
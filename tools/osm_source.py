@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+OpenStreetMap Extract Source
+
+This module turns a local OpenStreetMap extract into business leads. OSM XML
+(.osm, optionally .gz/.bz2) is read with iterparse and GeoJSON with a streaming
+array reader, so regional extracts of any size are processed in constant
+memory. Shops, crafts and business amenities that have a name but no
+website tag are emitted in the same dictionary schema as the other sources.
+"""
+
+import os
+import sys
+import bz2
+import gzip
+import json
+import time
+import xml.etree.ElementTree as ET
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.json_stream import iter_json_array
+
+# Tags that mark a business, in order of preference for the category
+BUSINESS_KEYS = ['shop', 'craft', 'amenity', 'office', 'healthcare']
+
+# Amenity values that are businesses (as opposed to benches, parking, ...)
+BUSINESS_AMENITIES = {
+    'restaurant', 'cafe', 'pub', 'bar', 'fast_food', 'food_court', 'ice_cream', 'biergarten',
+    'dentist', 'doctors', 'clinic', 'pharmacy', 'veterinary', 'car_repair', 'car_wash',
+    'driving_school', 'childcare', 'kindergarten', 'language_school', 'music_school',
+    'nightclub', 'cinema', 'theatre', 'marketplace', 'bureau_de_change', 'taxi', 'funeral_hall'
+}
+
+# Tags that mean the business already has a website
+WEBSITE_TAGS = ('website', 'contact:website', 'url', 'brand:website')
+
+# File suffixes of GeoJSON FeatureCollections and of line-delimited GeoJSON sequences
+GEOJSON_SUFFIXES = ('.geojson', '.json')
+SEQUENCE_SUFFIXES = ('.geojsonl', '.geojsons', '.ndjson')
+
+def _query_terms(query):
+    """Turn a search query like 'plumbers' into singular terms matched against tags."""
+    terms = []
+    for word in (query or '').lower().replace('-', ' ').split():
+        if word.endswith('ies'):
+            word = word[:-3] + 'y'
+        elif word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+def tags_to_business(tags, osm_id, lat=None, lng=None, location=''):
+    """
+    Convert the tags of an OSM element into a business data dictionary.
+    
+    Args:
+        tags (dict): OSM tags
+        osm_id (str): Element ID such as 'node/123'
+        lat (float): Latitude, if known
+        lng (float): Longitude, if known
+        location (str): Location label for the lead
+        
+    Returns:
+        dict: Business data dictionary, or None if the element is not a named business
+    """
+    name = tags.get('name')
+    if not name:
+        return None
+        
+    category = None
+    for key in BUSINESS_KEYS:
+        value = tags.get(key)
+        if value and (key != 'amenity' or value in BUSINESS_AMENITIES):
+            category = value.replace('_', ' ')
+            break
+    if category is None:
+        return None
+        
+    website = next((tags[tag] for tag in WEBSITE_TAGS if tags.get(tag)), '')
+    address = ', '.join(part for part in (
+        ' '.join(p for p in (tags.get('addr:housenumber'), tags.get('addr:street')) if p),
+        tags.get('addr:city'),
+        tags.get('addr:postcode')
+    ) if part)
+    
+    return {
+        'name': name,
+        'address': address,
+        'phone': tags.get('phone') or tags.get('contact:phone') or '',
+        'has_website': bool(website),
+        'website': website,
+        'category': category,
+        'rating': 0,
+        'review_count': 0,
+        'location': location or tags.get('addr:city', ''),
+        'source': 'OpenStreetMap',
+        'place_id': f"osm:{osm_id}",
+        'latitude': lat,
+        'longitude': lng
+    }
+
+class OsmExtractReader:
+    """Streaming reader that yields leads from an OSM XML or GeoJSON extract."""
+    
+    def __init__(self, path, query=None, location='', progress_interval=5.0):
+        """
+        Initialize the OsmExtractReader.
+        
+        Args:
+            path (str): Path to a .osm/.xml or .geojson/.json extract (optionally .gz/.bz2)
+            query (str): Only keep businesses whose category or name matches (e.g. 'plumbers')
+            location (str): Location label for the leads
+            progress_interval (float): Seconds between progress reports (None for quiet)
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"OSM extract not found: {path}")
+            
+        self.path = path
+        self.terms = _query_terms(query)
+        self.location = location
+        self.progress_interval = progress_interval
+        
+        self.elements = 0
+        self.leads = 0
+        self.with_website = 0
+        self._size = os.path.getsize(path)
+        self._raw = None
+        self._start_time = None
+        self._last_report = 0.0
+        
+    def _base_name(self):
+        """Get the lowercased path without a compression suffix."""
+        name = self.path.lower()
+        for suffix in ('.gz', '.bz2'):
+            if name.endswith(suffix):
+                return name[:-len(suffix)]
+        return name
+        
+    def _is_geojson(self):
+        """Check whether the extract is GeoJSON rather than OSM XML."""
+        return self._base_name().endswith(GEOJSON_SUFFIXES + SEQUENCE_SUFFIXES)
+        
+    def _matches(self, business):
+        """Check a business against the query terms."""
+        if not self.terms:
+            return True
+        text = f"{business['category']} {business['name']}".lower()
+        return any(term in text for term in self.terms)
+        
+    def _emit(self, business):
+        """Count a candidate business and decide whether it becomes a lead."""
+        if business is None:
+            return False
+        if business['has_website']:
+            self.with_website += 1
+            return False
+        if not self._matches(business):
+            return False
+        self.leads += 1
+        return True
+        
+    def _report(self, final=False):
+        """Print progress and throughput."""
+        if self.progress_interval is None:
+            return
+        now = time.time()
+        if not final and now - self._last_report < self.progress_interval:
+            return
+        self._last_report = now
+        
+        elapsed = max(now - self._start_time, 1e-9)
+        read = self._raw.tell() if self._raw is not None and not self._raw.closed else self._size
+        percent = 100.0 * read / self._size if self._size else 100.0
+        print(f"  {'Finished' if final else 'Scanned'} {self.elements:,} elements "
+              f"({read / 1e6:,.1f}/{self._size / 1e6:,.1f} MB, {percent:.0f}%), "
+              f"{self.elements / elapsed:,.0f} elements/s, {self.leads:,} leads")
+              
+    def __iter__(self):
+        """
+        Stream leads from the extract.
+        
+        Yields:
+            dict: Business data dictionaries for businesses without websites
+        """
+        self._start_time = self._last_report = time.time()
+        raw = open(self.path, 'rb')
+        self._raw = raw
+        try:
+            if self.path.lower().endswith('.gz'):
+                f = gzip.GzipFile(fileobj=raw)
+            elif self.path.lower().endswith('.bz2'):
+                f = bz2.BZ2File(raw)
+            else:
+                f = raw
+            elements = self._iter_geojson(f) if self._is_geojson() else self._iter_xml(f)
+            for business in elements:
+                self._report()
+                if self._emit(business):
+                    yield business
+        finally:
+            self._report(final=True)
+            raw.close()
+            
+    def _iter_xml(self, f):
+        """Yield a candidate business (or None) for every node, way and relation."""
+        context = ET.iterparse(f, events=('start', 'end'))
+        _, root = next(context)
+        
+        for event, elem in context:
+            if event != 'end' or elem.tag not in ('node', 'way', 'relation'):
+                continue
+            self.elements += 1
+            
+            tags = {tag.get('k'): tag.get('v') for tag in elem.iter('tag')}
+            business = None
+            if tags:
+                lat, lng = elem.get('lat'), elem.get('lon')
+                if lat is None:
+                    # Ways/relations only carry coordinates in Overpass "out center" output
+                    center = elem.find('center')
+                    if center is not None:
+                        lat, lng = center.get('lat'), center.get('lon')
+                business = tags_to_business(
+                    tags, f"{elem.tag}/{elem.get('id')}",
+                    float(lat) if lat is not None else None,
+                    float(lng) if lng is not None else None,
+                    self.location
+                )
+                
+            # Drop the processed element so memory stays constant
+            root.clear()
+            yield business
+            
+    def _iter_features(self, f):
+        """Yield GeoJSON features from a FeatureCollection or a GeoJSON sequence file."""
+        if self._base_name().endswith(SEQUENCE_SUFFIXES):
+            # One feature per line, optionally prefixed with the RFC 8142 record separator
+            for line in f:
+                line = line.strip().lstrip(b'\x1e')
+                if line:
+                    yield json.loads(line)
+        else:
+            yield from iter_json_array(f, key='features')
+            
+    def _iter_geojson(self, f):
+        """Yield a candidate business (or None) for every GeoJSON feature."""
+        for feature in self._iter_features(f):
+            self.elements += 1
+            properties = feature.get('properties') or {}
+            tags = properties.get('tags') if isinstance(properties.get('tags'), dict) else properties
+            
+            lat = lng = None
+            geometry = feature.get('geometry') or {}
+            coordinates = geometry.get('coordinates')
+            if geometry.get('type') == 'Point' and coordinates:
+                lng, lat = coordinates[0], coordinates[1]
+            elif geometry.get('type') == 'Polygon' and coordinates:
+                # Centre of the outer ring's vertices is close enough for a building
+                ring = coordinates[0]
+                lng = sum(p[0] for p in ring) / len(ring)
+                lat = sum(p[1] for p in ring) / len(ring)
+                
+            osm_id = feature.get('id') or properties.get('@id') or properties.get('osm_id') or ''
+            yield tags_to_business(tags, str(osm_id), lat, lng, self.location)
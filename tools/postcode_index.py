@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Postcode Index
+
+This module geocodes leads from a local postcode table instead of an external
+API. A build step turns a postcode-to-lat/lng CSV (e.g. the ONS Postcode
+Directory or a free "ukpostcodes.csv" dump) into a compact binary file of
+fixed-size records sorted by postcode. PostcodeIndex memory-maps that file and
+binary-searches it, so lookups read a few pages of the map and never parse
+the file; opening it costs nothing however many postcodes it holds.
+"""
+
+import os
+import csv
+import sys
+import mmap
+import gzip
+import struct
+import argparse
+import numpy as np
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.lead_dedup import normalize_postcode
+
+# File layout: header, then records of (postcode without space, NUL-padded; latitude; longitude)
+_MAGIC = b'PCIX'
+_VERSION = 1
+_HEADER = struct.Struct('<4sII')
+_RECORD = struct.Struct('<8sff')
+_RECORD_DTYPE = np.dtype([('postcode', 'S8'), ('latitude', '<f4'), ('longitude', '<f4')])
+_KEY_SIZE = 8
+
+# Candidate CSV column names, matched case-insensitively
+POSTCODE_COLUMNS = ['postcode', 'pcds', 'pcd', 'pcd2', 'post_code']
+LATITUDE_COLUMNS = ['latitude', 'lat']
+LONGITUDE_COLUMNS = ['longitude', 'long', 'lng', 'lon']
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'postcodes.idx')
+
+def _key(postcode):
+    """Get the fixed-size record key for a postcode: uppercase, no spaces, NUL-padded."""
+    return postcode.replace(' ', '').upper().encode('ascii', 'ignore')[:_KEY_SIZE].ljust(_KEY_SIZE, b'\0')
+
+def _find_column(positions, candidates, path):
+    """Get the index of the first candidate column present in the header."""
+    for candidate in candidates:
+        if candidate in positions:
+            return positions[candidate]
+    raise ValueError(f"{path} has none of the columns {', '.join(candidates)}")
+
+def build_postcode_index(csv_path, output_path=None):
+    """
+    Build the binary postcode index from a CSV.
+    
+    Rows without coordinates (terminated postcodes in the ONS directory carry
+    none, or the placeholder 99.999999) are skipped; when a postcode appears
+    more than once the last row wins.
+    
+    Args:
+        csv_path (str): Postcode CSV (optionally .gz) with postcode, latitude and longitude columns
+        output_path (str): Index file to write (default: data/postcodes.idx)
+        
+    Returns:
+        int: Number of postcodes in the index
+    """
+    output_path = output_path or DEFAULT_INDEX_PATH
+    opener = gzip.open if csv_path.lower().endswith('.gz') else open
+    
+    # Packed records take 16 bytes each, so even the full UK directory sorts in memory
+    records = bytearray()
+    with opener(csv_path, 'rt', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        positions = {name.strip().lower(): i for i, name in enumerate(next(reader, []))}
+        postcode_col = _find_column(positions, POSTCODE_COLUMNS, csv_path)
+        lat_col = _find_column(positions, LATITUDE_COLUMNS, csv_path)
+        lng_col = _find_column(positions, LONGITUDE_COLUMNS, csv_path)
+        width = max(postcode_col, lat_col, lng_col) + 1
+        
+        for row in reader:
+            if len(row) < width or not row[postcode_col].strip():
+                continue
+            try:
+                lat, lng = float(row[lat_col]), float(row[lng_col])
+            except ValueError:
+                continue
+            if not (-90.0 <= lat <= 90.0) or lat == 99.999999:
+                continue
+            records += _RECORD.pack(_key(row[postcode_col]), lat, lng)
+            
+    table = np.frombuffer(records, dtype=_RECORD_DTYPE)
+    table = table[np.argsort(table['postcode'], kind='stable')]
+    if len(table):
+        # Keep the last of each run of equal postcodes
+        table = table[np.append(table['postcode'][1:] != table['postcode'][:-1], True)]
+        
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    temp_path = output_path + '.tmp'
+    with open(temp_path, 'wb') as out:
+        out.write(_HEADER.pack(_MAGIC, _VERSION, len(table)))
+        out.write(table.tobytes())
+    # Replace atomically so readers never map a half-written index
+    os.replace(temp_path, output_path)
+    return len(table)
+
+class PostcodeIndex:
+    """Memory-mapped, binary-searched postcode -> (lat, lng) table."""
+    
+    def __init__(self, path=None):
+        """
+        Initialize the PostcodeIndex.
+        
+        Args:
+            path (str): Index file built by build_postcode_index (default: data/postcodes.idx)
+        """
+        self.path = path or DEFAULT_INDEX_PATH
+        self._file = open(self.path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, version, self.count = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"{self.path} is not a postcode index (version {_VERSION})")
+        if len(self._map) != _HEADER.size + self.count * _RECORD.size:
+            self.close()
+            raise ValueError(f"{self.path} is truncated; rebuild it")
+            
+        self.lookups = 0
+        self.hits = 0
+        
+    @classmethod
+    def open_default(cls):
+        """
+        Open the default index if it has been built.
+        
+        Returns:
+            PostcodeIndex: The index, or None if data/postcodes.idx does not exist
+        """
+        if not os.path.exists(DEFAULT_INDEX_PATH):
+            return None
+        return cls(DEFAULT_INDEX_PATH)
+        
+    def __len__(self):
+        return self.count
+        
+    def lookup(self, postcode):
+        """
+        Get the coordinates of a postcode.
+        
+        Args:
+            postcode (str): Postcode, with or without the space, any case
+            
+        Returns:
+            tuple: (lat, lng), or None if the postcode is unknown
+        """
+        self.lookups += 1
+        key = _key(postcode)
+        data = self._map
+        base = _HEADER.size
+        size = _RECORD.size
+        
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = base + mid * size
+            if data[offset:offset + _KEY_SIZE] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+                
+        offset = base + lo * size
+        if lo < self.count and data[offset:offset + _KEY_SIZE] == key:
+            self.hits += 1
+            _, lat, lng = _RECORD.unpack_from(data, offset)
+            return lat, lng
+        return None
+        
+    def geocode(self, address):
+        """
+        Get the coordinates of the postcode in an address.
+        
+        Args:
+            address (str): Address or bare postcode
+            
+        Returns:
+            tuple: (lat, lng), or None if there is no known postcode
+        """
+        postcode = normalize_postcode(address)
+        return self.lookup(postcode) if postcode else None
+        
+    def geocode_leads(self, leads):
+        """
+        Attach coordinates to leads that have none, from the postcode in their address.
+        
+        Args:
+            leads (iterable): Business data dictionaries
+            
+        Yields:
+            dict: The same leads, with 'latitude'/'longitude' filled where possible
+        """
+        for lead in leads:
+            lat = lead.get('latitude')
+            if lat is None or lat == '' or lat != lat:
+                point = self.geocode(lead.get('postcode') or lead.get('address'))
+                if point is not None:
+                    lead['latitude'], lead['longitude'] = round(point[0], 6), round(point[1], 6)
+            yield lead
+            
+    def stats(self):
+        """
+        Get lookup statistics.
+        
+        Returns:
+            dict: Postcodes in the index, lookups, hits and misses
+        """
+        return {
+            'postcodes': self.count,
+            'lookups': self.lookups,
+            'hits': self.hits,
+            'misses': self.lookups - self.hits
+        }
+        
+    def close(self):
+        """Unmap and close the index file."""
+        self._map.close()
+        self._file.close()
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def main():
+    """Build or query the postcode index."""
+    parser = argparse.ArgumentParser(description='Build or query the memory-mapped postcode index.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    build = subparsers.add_parser('build', help='Build the index from a postcode CSV')
+    build.add_argument('csv_file', help='CSV with postcode, latitude and longitude columns (optionally .gz)')
+    build.add_argument('--output', '-o', type=str, default=None,
+                       help='Index file (default: data/postcodes.idx)')
+                       
+    lookup = subparsers.add_parser('lookup', help='Look up postcodes')
+    lookup.add_argument('postcodes', nargs='+', help='Postcodes to look up')
+    lookup.add_argument('--index', type=str, default=None,
+                        help='Index file (default: data/postcodes.idx)')
+                        
+    args = parser.parse_args()
+    
+    if args.command == 'build':
+        count = build_postcode_index(args.csv_file, args.output)
+        print(f"Indexed {count:,} postcodes in {args.output or DEFAULT_INDEX_PATH}")
+        return
+        
+    with PostcodeIndex(args.index) as index:
+        for postcode in args.postcodes:
+            point = index.lookup(postcode)
+            print(f"{postcode}: {f'{point[0]:.6f}, {point[1]:.6f}' if point else 'not found'}")
+
+if __name__ == "__main__":
+    main()
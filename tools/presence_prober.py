@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Web Presence Prober
+
+This module checks whether leads really lack a website, and whether they have
+a social media profile, instead of trusting the Places payload alone. For a
+batch of leads it derives candidate domains (e.g. smithplumbing.co.uk) and
+social profile URLs from the business name, de-duplicates them across the
+batch, and probes them concurrently: a DNS lookup first, then an HTTP HEAD
+request over a shared connection pool with strict timeouts. Each probe
+finds something present, absent or unknown (timeouts, server errors, and
+social networks answering with a login redirect or a rate limit); only
+present and absent results are cached, with a TTL, so repeat runs do not
+probe again and transient failures are retried on the next run.
+"""
+
+import os
+import sys
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.lead_dedup import normalize_name
+from tools.response_cache import ResponseCache
+
+# Top-level domains tried for each business name, most likely first
+DEFAULT_TLDS = ['.co.uk', '.com', '.uk']
+
+# Social networks probed for a profile named after the business
+SOCIAL_PROFILES = {
+    'facebook': 'https://www.facebook.com/{slug}',
+    'instagram': 'https://www.instagram.com/{slug}',
+}
+
+# Statuses showing that a website is there even if it refuses a HEAD request
+_SITE_PRESENT_STATUSES = {401, 403, 405, 429}
+
+# Statuses showing that a profile does not exist; social networks answer
+# unauthenticated requests for unknown profiles with redirects to a login
+# page or with 429, so anything but 2xx or these is inconclusive
+_PROFILE_ABSENT_STATUSES = {404, 410}
+
+def _resolve(host):
+    """Check whether a host name resolves, using the system resolver."""
+    try:
+        return bool(socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM))
+    except (socket.gaierror, UnicodeError):
+        return False
+
+class PresenceProber:
+    """Concurrent, cached probing of candidate websites and social profiles."""
+    
+    def __init__(self, max_workers=32, timeout=3.0, cache=None, ttl=7 * 24 * 3600, tlds=None,
+                 social_profiles=None, resolver=None, base_url=None, session=None, check_http=True):
+        """
+        Initialize the PresenceProber.
+        
+        Args:
+            max_workers (int): Maximum number of lookups in flight
+            timeout (float): Deadline per DNS lookup, and connect and read timeout per HTTP request, in seconds
+            cache (ResponseCache): Optional cache for probe results
+            ttl (int): Time-to-live of cached probe results, in seconds
+            tlds (list): Top-level domains tried for each business name
+            social_profiles (dict): Network name -> profile URL template with a {slug} field
+            resolver (callable): Takes a host name and returns whether it resolves
+                                 (default: the system resolver; pass a stub in tests)
+            base_url (str): Send every HTTP request to this server instead, with the
+                            original host in the Host header (e.g. a local stub server)
+            session (requests.Session): Optional session to reuse
+            check_http (bool): Confirm resolving domains with a HEAD request
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.timeout = timeout
+        self.cache = cache
+        self.ttl = ttl
+        self.tlds = tlds or DEFAULT_TLDS
+        self.social_profiles = SOCIAL_PROFILES if social_profiles is None else social_profiles
+        self.resolver = resolver or _resolve
+        self.base_url = base_url.rstrip('/') if base_url else None
+        self.check_http = check_http
+        
+        # One pooled session shared by all workers, so connections are kept alive and reused
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        self._executor = None
+        self._dns_executor = None
+        self._lock = threading.Lock()
+        self._stats = {'leads': 0, 'websites_found': 0, 'social_found': 0, 'lookups': 0, 'cached': 0,
+                       'unknown': 0, 'errors': 0}
+        
+    @staticmethod
+    def _slugs(name):
+        """Get the name slugs used for domains and profiles, e.g. 'smithplumbing' and 'smith-plumbing'."""
+        tokens = normalize_name(name).split()
+        if not tokens:
+            return []
+        joined = ''.join(tokens)
+        hyphenated = '-'.join(tokens)
+        return [joined] if joined == hyphenated else [joined, hyphenated]
+        
+    def candidate_domains(self, lead):
+        """
+        Get the domains a lead's website would plausibly use.
+        
+        Args:
+            lead (dict): Business data dictionary
+            
+        Returns:
+            list: Domain names, most likely first
+        """
+        return [slug + tld for slug in self._slugs(lead.get('name')) for tld in self.tlds]
+        
+    def social_urls(self, lead):
+        """
+        Get the social profile URLs a lead would plausibly use.
+        
+        Args:
+            lead (dict): Business data dictionary
+            
+        Returns:
+            list: Profile URLs
+        """
+        slugs = self._slugs(lead.get('name'))
+        if not slugs:
+            return []
+        # Profile names cannot contain hyphens on most networks
+        return [template.format(slug=slugs[0]) for template in self.social_profiles.values()]
+        
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+            
+    def _head(self, url):
+        """
+        Send a HEAD request to a URL.
+        
+        Args:
+            url (str): URL to request
+            
+        Returns:
+            int: Response status, or None if the request failed or timed out
+        """
+        if self.base_url:
+            parts = urlsplit(url)
+            target = f"{self.base_url}{parts.path or '/'}"
+            headers = {'Host': parts.netloc}
+        else:
+            target, headers = url, None
+        try:
+            response = self.session.head(target, headers=headers, timeout=(self.timeout, self.timeout),
+                                         allow_redirects=False)
+        except requests.exceptions.RequestException:
+            self._count('errors')
+            return None
+        return response.status_code
+        
+    def _resolve_within_timeout(self, host):
+        """
+        Run the resolver with a deadline of self.timeout.
+        
+        getaddrinfo takes no timeout and can block for a long time on a slow
+        resolver, so lookups run on their own pool and a late one is given up on.
+        
+        Returns:
+            bool: Whether the host resolves, or None if the lookup timed out
+        """
+        with self._lock:
+            if self._dns_executor is None:
+                self._dns_executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            future = self._dns_executor.submit(self.resolver, host)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            return None
+        
+    def _probe_domain(self, domain):
+        """Check whether a website is served on the domain (True, False, or None if unknown)."""
+        resolved = self._resolve_within_timeout(domain)
+        if resolved is None:
+            return None
+        if not resolved:
+            return False
+        if not self.check_http:
+            return True
+        status = self._head(f"https://{domain}/")
+        if status is None or status >= 500:
+            return None
+        # Redirects count: sites commonly redirect to www or another page
+        return status < 400 or status in _SITE_PRESENT_STATUSES
+        
+    def _probe_profile(self, url):
+        """Check whether a social profile exists (True, False, or None if unknown)."""
+        status = self._head(url)
+        if status is None:
+            return None
+        if 200 <= status < 300:
+            return True
+        if status in _PROFILE_ABSENT_STATUSES:
+            return False
+        return None
+        
+    def _probe_target(self, target):
+        """Probe one ('domain', name) or ('social', url) target."""
+        kind, value = target
+        if kind == 'domain':
+            return self._probe_domain(value)
+        return self._probe_profile(value)
+        
+    def _probe_all(self, targets):
+        """
+        Probe targets concurrently, serving and storing results through the cache.
+        
+        Args:
+            targets (list): Unique ('domain', name) / ('social', url) pairs
+            
+        Returns:
+            dict: Target -> True (present), False (absent) or None (unknown)
+        """
+        keys = {target: ResponseCache.make_key('presence', *target) for target in targets}
+        results = {}
+        if self.cache is not None:
+            # One cache transaction per batch rather than one per lookup
+            cached = self.cache.get_many(list(keys.values()))
+            results = {target: cached[key]['present'] for target, key in keys.items() if key in cached}
+            self._count('cached', len(results))
+            
+        pending = [target for target in targets if target not in results]
+        if pending:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            probed = dict(zip(pending, self._executor.map(self._probe_target, pending)))
+            self._count('lookups', len(pending))
+            self._count('unknown', sum(1 for present in probed.values() if present is None))
+            results.update(probed)
+            if self.cache is not None:
+                # Unknown results are not cached, so they are probed again next time
+                self.cache.set_many({keys[target]: {'present': present} for target, present in probed.items()
+                                     if present is not None}, ttl=self.ttl)
+        return results
+        
+    def probe(self, leads):
+        """
+        Probe a batch of leads and update them in place.
+        
+        Sets 'has_website'/'website' when a candidate domain serves a site,
+        and 'has_social_media'/'social_media' from the profile probes. Only
+        confirmed results count: a lead whose probes were inconclusive is
+        not marked as having a website or social media. Leads already known
+        to have a website are left alone.
+        
+        Args:
+            leads (list): Business data dictionaries
+            
+        Returns:
+            list: The same leads
+        """
+        leads = list(leads)
+        plans = []
+        targets = {}
+        for lead in leads:
+            domains = [] if lead.get('has_website') else self.candidate_domains(lead)
+            profiles = self.social_urls(lead)
+            plans.append((lead, domains, profiles))
+            # Chains and common names share candidates; each is probed once per batch
+            for target in [('domain', d) for d in domains] + [('social', u) for u in profiles]:
+                targets.setdefault(target, None)
+                
+        targets.update(self._probe_all(list(targets)))
+        
+        for lead, domains, profiles in plans:
+            found = next((d for d in domains if targets[('domain', d)] is True), None)
+            if found:
+                lead['has_website'] = True
+                lead['website'] = f"https://{found}"
+                self._count('websites_found')
+                
+            social = [u for u in profiles if targets[('social', u)] is True]
+            lead['has_social_media'] = bool(social)
+            lead['social_media'] = ', '.join(social)
+            if social:
+                self._count('social_found')
+                
+        self._count('leads', len(leads))
+        return leads
+        
+    def iter_probe(self, leads, batch_size=500):
+        """
+        Probe a stream of leads a batch at a time.
+        
+        Args:
+            leads (iterable): Business data dictionaries
+            batch_size (int): Leads probed together
+            
+        Yields:
+            dict: Probed leads, in input order
+        """
+        batch = []
+        for lead in leads:
+            batch.append(lead)
+            if len(batch) >= batch_size:
+                yield from self.probe(batch)
+                batch = []
+        if batch:
+            yield from self.probe(batch)
+            
+    def stats(self):
+        """
+        Get probe statistics.
+        
+        Returns:
+            dict: Leads probed, websites and social profiles found, network
+                  lookups, cached results, inconclusive probes and request errors
+        """
+        with self._lock:
+            return dict(self._stats)
+            
+    def close(self):
+        """Shut down the worker pools and close pooled connections."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._dns_executor is not None:
+            # Lookups still stuck in the resolver are abandoned rather than waited for
+            self._dns_executor.shutdown(wait=False, cancel_futures=True)
+            self._dns_executor = None
+        self.session.close()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter
+
+This module paces calls to external APIs with a token bucket. The bucket lives
+in a small SQLite file so every process on the machine draws from the same
+quota. Throttled (429) and transient server errors are retried with
+exponential backoff and full jitter, and a Retry-After header pauses every
+process sharing the bucket rather than just the caller.
+"""
+
+import os
+import time
+import random
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# HTTP statuses worth retrying: throttling plus transient server errors
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+def error_status(error):
+    """
+    Get the HTTP status code carried by an API client exception.
+    
+    Understands googleapiclient's HttpError and requests' HTTPError.
+    
+    Args:
+        error (Exception): Exception raised by an API call
+        
+    Returns:
+        int: HTTP status code, or None if the error has none
+    """
+    resp = getattr(error, 'resp', None)
+    if resp is not None and getattr(resp, 'status', None) is not None:
+        return int(resp.status)
+    response = getattr(error, 'response', None)
+    if response is not None and getattr(response, 'status_code', None) is not None:
+        return int(response.status_code)
+    return None
+
+def retry_after_seconds(error):
+    """
+    Get the delay requested by a Retry-After header on an API client exception.
+    
+    Args:
+        error (Exception): Exception raised by an API call
+        
+    Returns:
+        float: Seconds to wait, or None if the header is missing or invalid
+    """
+    value = None
+    resp = getattr(error, 'resp', None)
+    if resp is not None and hasattr(resp, 'get'):
+        value = resp.get('retry-after')
+    response = getattr(error, 'response', None)
+    if value is None and response is not None and getattr(response, 'headers', None) is not None:
+        value = response.headers.get('Retry-After')
+    if value is None:
+        return None
+        
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class RateLimitError(Exception):
+    """Raised when a call is still throttled after every retry."""
+
+class RateLimiter:
+    """Token-bucket rate limiter shared across processes through SQLite."""
+    
+    def __init__(self, name, rate, capacity=None, path=None, max_retries=5, base_delay=1.0, max_delay=60.0):
+        """
+        Initialize the RateLimiter.
+        
+        Args:
+            name (str): Bucket name; limiters with the same name and path share a quota
+            rate (float): Sustained requests per second
+            capacity (float): Maximum burst size (default: one second of requests)
+            path (str): Path to the SQLite bucket file (default: data/rate_limits.db)
+            max_retries (int): Retries for throttled or transient failures
+            base_delay (float): First backoff delay in seconds
+            max_delay (float): Upper bound on a single backoff delay in seconds
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+            
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.path = path or os.path.join(base_dir, 'data', 'rate_limits.db')
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        
+        self.name = name
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self.max_retries = max(0, int(max_retries))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        
+        self.requests = 0
+        self.throttles = 0
+        self.retries = 0
+        self.wait_time = 0.0
+        
+        self._lock = threading.Lock()
+        self._random = random.Random()
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute('''
+        CREATE TABLE IF NOT EXISTS rate_buckets (
+            name TEXT PRIMARY KEY,
+            tokens REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            blocked_until REAL NOT NULL DEFAULT 0
+        )
+        ''')
+        
+    def _take(self, tokens):
+        """
+        Take tokens from the shared bucket if they are available.
+        
+        Returns:
+            float: 0 if the tokens were taken, otherwise seconds to wait before retrying
+        """
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock up front, so the
+            # read-refill-write below is atomic across processes
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                now = time.time()
+                row = self._conn.execute(
+                    'SELECT tokens, updated_at, blocked_until FROM rate_buckets WHERE name = ?',
+                    (self.name,)
+                ).fetchone()
+                
+                if row is None:
+                    available, blocked_until = self.capacity, 0.0
+                else:
+                    elapsed = max(0.0, now - row[1])
+                    available = min(self.capacity, row[0] + elapsed * self.rate)
+                    blocked_until = row[2]
+                    
+                if blocked_until > now:
+                    wait = blocked_until - now
+                elif available >= tokens:
+                    available -= tokens
+                    wait = 0.0
+                else:
+                    wait = (tokens - available) / self.rate
+                    
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO rate_buckets (name, tokens, updated_at, blocked_until) VALUES (?, ?, ?, ?)',
+                    (self.name, available, now, blocked_until)
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return wait
+        
+    def acquire(self, tokens=1):
+        """
+        Block until the bucket allows a request.
+        
+        Args:
+            tokens (int): Number of tokens the request costs
+            
+        Returns:
+            float: Seconds spent waiting
+        """
+        if tokens > self.capacity:
+            # The bucket never holds more than capacity, so this would wait forever
+            raise ValueError(f"{self.name}: request of {tokens} tokens exceeds bucket capacity {self.capacity:g}")
+            
+        waited = 0.0
+        while True:
+            wait = self._take(tokens)
+            if wait <= 0:
+                break
+            time.sleep(wait)
+            waited += wait
+            
+        with self._lock:
+            self.requests += 1
+            self.wait_time += waited
+        return waited
+        
+    def pause(self, seconds):
+        """
+        Stop every process sharing the bucket from sending requests for a while.
+        
+        Args:
+            seconds (float): How long to pause
+        """
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                until = time.time() + seconds
+                self._conn.execute(
+                    'INSERT OR IGNORE INTO rate_buckets (name, tokens, updated_at, blocked_until) VALUES (?, 0, ?, 0)',
+                    (self.name, time.time())
+                )
+                self._conn.execute(
+                    'UPDATE rate_buckets SET blocked_until = MAX(blocked_until, ?) WHERE name = ?',
+                    (until, self.name)
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+                
+    def backoff_delay(self, attempt):
+        """
+        Get the delay before a retry (exponential backoff with full jitter).
+        
+        Args:
+            attempt (int): Zero-based retry number
+            
+        Returns:
+            float: Seconds to wait
+        """
+        return self._random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        
+    def call(self, fetch, tokens=1):
+        """
+        Run an API call within the rate limit, retrying throttled and transient failures.
+        
+        Args:
+            fetch (callable): Function performing the request; it should raise
+                              an HTTP error (googleapiclient or requests) on failure
+            tokens (int): Number of tokens the request costs
+            
+        Returns:
+            The value returned by fetch
+        """
+        attempt = 0
+        while True:
+            self.acquire(tokens)
+            try:
+                return fetch()
+            except Exception as e:
+                status = error_status(e)
+                if status not in RETRYABLE_STATUSES:
+                    raise
+                    
+                retry_after = retry_after_seconds(e)
+                with self._lock:
+                    if status == 429:
+                        self.throttles += 1
+                    if attempt >= self.max_retries:
+                        raise RateLimitError(f"{self.name}: giving up after {attempt} retries (HTTP {status})") from e
+                    self.retries += 1
+                    
+                delay = retry_after if retry_after is not None else self.backoff_delay(attempt)
+                if status == 429:
+                    # Throttling applies to the whole quota, so every process backs off
+                    self.pause(delay)
+                else:
+                    time.sleep(delay)
+                    with self._lock:
+                        self.wait_time += delay
+                attempt += 1
+                
+    def stats(self):
+        """
+        Get rate limiter metrics for this process.
+        
+        Returns:
+            dict: Requests sent, throttles, retries and total/average wait time
+        """
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'throttles': self.throttles,
+                'retries': self.retries,
+                'wait_time': round(self.wait_time, 3),
+                'avg_wait': round(self.wait_time / self.requests, 3) if self.requests else 0.0
+            }
+            
+    def close(self):
+        """Close the bucket database connection."""
+        self._conn.close()
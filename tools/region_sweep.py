@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Region Sweep Engine
+
+This module covers a whole region with Places nearby searches. The region is
+tiled into overlapping radius cells which are searched by a worker pool.
+Leads are deduplicated by place ID and a checkpoint is written after every
+cell, so an interrupted sweep resumes without re-fetching finished cells.
+"""
+
+import os
+import sys
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.geo import tile_region
+
+class RegionSweep:
+    """Resumable, parallel sweep of a region with Places nearby searches."""
+    
+    def __init__(self, finder, query, cells, checkpoint_path, workers=4, max_results=20, sink=None):
+        """
+        Initialize the RegionSweep.
+        
+        Args:
+            finder (BusinessFinder): Finder used to run each cell search
+            query (str): Type of business to search for
+            cells (list): Cells from tools.geo.tile_region
+            checkpoint_path (str): Path to the JSON checkpoint file
+            workers (int): Number of cells searched concurrently
+            max_results (int): Search hits requested per result page
+            sink (BusinessSink): Optional database sink that also receives new leads
+        """
+        self.finder = finder
+        self.query = query
+        self.cells = cells
+        self.checkpoint_path = checkpoint_path
+        self.leads_path = os.path.splitext(checkpoint_path)[0] + '_leads.ndjson'
+        self.workers = max(1, int(workers))
+        self.max_results = max_results
+        self.sink = sink
+        
+        self.completed_cells = set()
+        self.seen_place_ids = set()
+        self.failed_cells = {}
+        
+    @classmethod
+    def for_region(cls, finder, query, radius_m, checkpoint_path, bbox=None, polygon=None,
+                   overlap=0.1, **kwargs):
+        """
+        Create a sweep by tiling a bounding box or polygon.
+        
+        Args:
+            finder (BusinessFinder): Finder used to run each cell search
+            query (str): Type of business to search for
+            radius_m (float): Search radius of each cell in metres
+            checkpoint_path (str): Path to the JSON checkpoint file
+            bbox (tuple): Optional (south, west, north, east) bounding box
+            polygon (list): Optional list of (lat, lng) vertices
+            overlap (float): Extra overlap between neighbouring cells
+            
+        Returns:
+            RegionSweep: Configured sweep
+        """
+        cells = tile_region(radius_m, bbox=bbox, polygon=polygon, overlap=overlap)
+        return cls(finder, query, cells, checkpoint_path, **kwargs)
+        
+    def _signature(self):
+        """Identify the sweep so a checkpoint is never resumed against different cells."""
+        return {
+            'query': self.query,
+            'cells': len(self.cells),
+            'first_cell': self.cells[0] if self.cells else None,
+            'last_cell': self.cells[-1] if self.cells else None
+        }
+        
+    def load_checkpoint(self):
+        """
+        Restore progress from an existing checkpoint.
+        
+        Returns:
+            int: Number of cells already completed
+        """
+        if not os.path.exists(self.checkpoint_path):
+            return 0
+            
+        with open(self.checkpoint_path, 'r') as f:
+            state = json.load(f)
+            
+        if state.get('signature') != self._signature():
+            raise ValueError(f"Checkpoint {self.checkpoint_path} belongs to a different sweep")
+            
+        self.completed_cells = set(state.get('completed_cells', []))
+        
+        # Leads are the source of truth for dedup; a cell that was written but
+        # not yet checkpointed is simply searched again and its hits skipped
+        if os.path.exists(self.leads_path):
+            self._load_leads()
+            
+        return len(self.completed_cells)
+        
+    def _load_leads(self):
+        """
+        Collect the place IDs of the leads already written.
+        
+        A crash mid-write can leave the last line cut off. It is truncated
+        away: its cell was never checkpointed, so the cell is searched again.
+        """
+        with open(self.leads_path, 'rb+') as f:
+            end = 0
+            line = b'\n'
+            for line in f:
+                try:
+                    lead = json.loads(line) if line.strip() else None
+                except ValueError:
+                    if f.read().strip():
+                        raise ValueError(f"{self.leads_path} has an unreadable lead at byte {end}")
+                    print(f"Dropping a partial lead at the end of {self.leads_path}")
+                    f.seek(end)
+                    f.truncate()
+                    return
+                if lead is not None:
+                    self.seen_place_ids.add(lead.get('place_id'))
+                end += len(line)
+                
+            # A complete lead whose newline never reached the disk
+            if not line.endswith(b'\n'):
+                f.write(b'\n')
+        
+    def _write_checkpoint(self):
+        """Atomically write the checkpoint file."""
+        state = {
+            'signature': self._signature(),
+            'completed_cells': sorted(self.completed_cells),
+            'leads_file': self.leads_path,
+            'updated_at': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
+        
+    def _search_cell(self, cell):
+        """Search a single cell across all result pages, skipping places already collected."""
+        location = f"{cell['lat']},{cell['lng']}"
+        return list(self.finder.iter_places(
+            self.query,
+            location,
+            radius=int(cell['radius']),
+            page_size=self.max_results,
+            exclude_place_ids=self.seen_place_ids
+        ))
+        
+    def run(self, progress_interval=1):
+        """
+        Run (or resume) the sweep.
+        
+        Args:
+            progress_interval (int): Print progress every N finished cells
+            
+        Returns:
+            dict: Summary with cell counts, new leads and output paths
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.checkpoint_path)), exist_ok=True)
+        resumed = self.load_checkpoint()
+        pending = [cell for cell in self.cells if cell['id'] not in self.completed_cells]
+        
+        total = len(self.cells)
+        if resumed:
+            print(f"Resuming sweep: {resumed}/{total} cells already done")
+        print(f"Sweeping {len(pending)} cells for '{self.query}' with {self.workers} workers...")
+        
+        new_leads = 0
+        finished = 0
+        start_time = time.time()
+        
+        with open(self.leads_path, 'a') as leads_file, \
+                ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self._search_cell, cell): cell for cell in pending}
+            
+            for future in as_completed(futures):
+                cell = futures[future]
+                finished += 1
+                
+                try:
+                    businesses = future.result()
+                except Exception as e:
+                    self.failed_cells[cell['id']] = str(e)
+                    print(f"Cell {cell['id']} failed: {e}")
+                    continue
+                    
+                # Only the main thread writes, so dedup needs no locking
+                fresh = []
+                for business in businesses:
+                    place_id = business.get('place_id')
+                    if place_id in self.seen_place_ids:
+                        continue
+                    self.seen_place_ids.add(place_id)
+                    fresh.append(business)
+                    
+                # Commit to the database before the leads file: a crash in
+                # between only means the cell's leads are upserted again
+                if self.sink is not None:
+                    self.sink.write_all(fresh)
+                    self.sink.commit()
+                    
+                for business in fresh:
+                    leads_file.write(json.dumps(business) + '\n')
+                new_leads += len(fresh)
+                
+                leads_file.flush()
+                os.fsync(leads_file.fileno())
+                self.completed_cells.add(cell['id'])
+                self._write_checkpoint()
+                
+                if finished % progress_interval == 0 or finished == len(pending):
+                    elapsed = max(time.time() - start_time, 1e-9)
+                    print(f"  [{len(self.completed_cells)}/{total}] cells, "
+                          f"{finished / elapsed:.2f} cells/s, {new_leads} new leads")
+                          
+        return {
+            'total_cells': total,
+            'completed_cells': len(self.completed_cells),
+            'failed_cells': len(self.failed_cells),
+            'new_leads': new_leads,
+            'total_leads': len(self.seen_place_ids),
+            'leads_file': self.leads_path,
+            'checkpoint': self.checkpoint_path
+        }
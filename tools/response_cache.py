@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Response Cache
+
+This module provides a persistent on-disk cache for external API responses.
+Entries are stored in SQLite, expire after a per-entry TTL and are evicted
+least-recently-used first once the cache grows past its size bound. Cache hits
+only read: their access times are kept in memory and written back in one
+batch every so often, so lookups do not take the write lock or wait on disk.
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+
+class ResponseCache:
+    """SQLite-backed response cache with per-entry TTL and LRU eviction."""
+    
+    def __init__(self, path=None, ttl=7 * 24 * 3600, max_entries=100000, touch_interval=60, touch_batch=1000):
+        """
+        Initialize the ResponseCache.
+        
+        Args:
+            path (str): Path to the SQLite cache file, defaults to data/response_cache.db
+            ttl (int): Default time-to-live for entries in seconds
+            max_entries (int): Maximum number of entries kept before LRU eviction
+            touch_interval (float): Seconds between write-backs of access times
+            touch_batch (int): Pending access times that trigger an early write-back
+        """
+        if path is None:
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            path = os.path.join(base_dir, 'data', 'response_cache.db')
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self.touch_batch = touch_batch
+        self.hits = 0
+        self.misses = 0
+        
+        self._lock = threading.Lock()
+        # Key -> last access time not yet written to the database
+        self._touched = {}
+        self._touched_flushed_at = time.time()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('''
+        CREATE TABLE IF NOT EXISTS cache_entries (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed_at ON cache_entries (accessed_at)')
+        self._conn.commit()
+        self._size = self._conn.execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+        
+    @staticmethod
+    def make_key(*parts):
+        """
+        Build a cache key from request parameters.
+        
+        Args:
+            *parts: JSON-serializable request parameters
+            
+        Returns:
+            str: Stable hex digest identifying the request
+        """
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        
+    def get(self, key):
+        """
+        Look up a cached value.
+        
+        Args:
+            key (str): Cache key
+            
+        Returns:
+            object: The cached value, or None on a miss or expired entry
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, expires_at FROM cache_entries WHERE key = ?', (key,)
+            ).fetchone()
+            
+            if row is None:
+                self.misses += 1
+                return None
+                
+            value, expires_at = row
+            if expires_at <= now:
+                self._conn.execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+                self._conn.commit()
+                self._size -= 1
+                self.misses += 1
+                return None
+                
+            self._touch([key], now)
+            self.hits += 1
+            
+        return json.loads(value)
+        
+    def set(self, key, value, ttl=None):
+        """
+        Store a value in the cache.
+        
+        Args:
+            key (str): Cache key
+            value (object): JSON-serializable value
+            ttl (int): Optional TTL in seconds overriding the cache default
+        """
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._size += self._upsert([(key, json.dumps(value), expires_at, now)])
+            
+            if self._size > self.max_entries:
+                self._evict()
+                
+    def get_many(self, keys):
+        """
+        Look up many cached values in one transaction.
+        
+        Args:
+            keys (list): Cache keys
+            
+        Returns:
+            dict: Key -> cached value for the keys that hit (misses and expired entries are left out)
+        """
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        found = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT key, value FROM cache_entries WHERE key IN ({placeholders}) AND expires_at > ?',
+                    chunk + [now]
+                ).fetchall()
+                found.update(rows)
+            self._touch(found, now)
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+            
+        return {key: json.loads(value) for key, value in found.items()}
+        
+    def set_many(self, items, ttl=None):
+        """
+        Store many values in one transaction.
+        
+        Args:
+            items (dict): Cache key -> JSON-serializable value
+            ttl (int): Optional TTL in seconds overriding the cache default
+        """
+        if not items:
+            return
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._size += self._upsert([(key, json.dumps(value), expires_at, now) for key, value in items.items()])
+            
+            if self._size > self.max_entries:
+                self._evict()
+                
+    def _upsert(self, rows):
+        """
+        Insert or overwrite entries in one transaction (called with the lock held).
+        
+        Args:
+            rows (list): (key, value, expires_at, accessed_at) tuples with distinct keys
+            
+        Returns:
+            int: Number of keys that were not in the cache before
+        """
+        # Only genuinely new rows count towards the size; overwrites are applied separately
+        inserted = self._conn.executemany('''
+        INSERT INTO cache_entries (key, value, expires_at, accessed_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(key) DO NOTHING
+        ''', rows).rowcount
+        if inserted < len(rows):
+            self._conn.executemany(
+                'UPDATE cache_entries SET value = ?, expires_at = ?, accessed_at = ? WHERE key = ?',
+                [(value, expires_at, accessed_at, key) for key, value, expires_at, accessed_at in rows]
+            )
+        self._conn.commit()
+        return inserted
+        
+    def _touch(self, keys, now):
+        """Record cache hits, writing access times back once enough are pending or enough time has passed."""
+        for key in keys:
+            self._touched[key] = now
+        if len(self._touched) >= self.touch_batch or now - self._touched_flushed_at >= self.touch_interval:
+            self._flush_touches()
+            
+    def _flush_touches(self):
+        """Write pending access times in one transaction (called with the lock held)."""
+        if self._touched:
+            self._conn.executemany('UPDATE cache_entries SET accessed_at = MAX(accessed_at, ?) WHERE key = ?',
+                                   [(accessed_at, key) for key, accessed_at in self._touched.items()])
+            self._conn.commit()
+            self._touched = {}
+        self._touched_flushed_at = time.time()
+        
+    def flush(self):
+        """Write pending access times to the database now."""
+        with self._lock:
+            self._flush_touches()
+            
+    def _evict(self):
+        """Drop expired entries, then the least recently used ones, down to the size bound."""
+        # Eviction order must see recent hits
+        self._flush_touches()
+        self._conn.execute('DELETE FROM cache_entries WHERE expires_at <= ?', (time.time(),))
+        self._size = self._conn.execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+        
+        excess = self._size - self.max_entries
+        if excess > 0:
+            self._conn.execute('''
+            DELETE FROM cache_entries WHERE key IN (
+                SELECT key FROM cache_entries ORDER BY accessed_at ASC LIMIT ?
+            )
+            ''', (excess,))
+            self._size -= excess
+        self._conn.commit()
+        
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._conn.execute('DELETE FROM cache_entries')
+            self._conn.commit()
+            self._touched = {}
+            self._size = 0
+            
+    def stats(self):
+        """
+        Get cache hit/miss statistics.
+        
+        Returns:
+            dict: Hits, misses, hit rate and current number of entries
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round((self.hits / lookups) * 100, 2) if lookups else 0,
+            'entries': self._size
+        }
+        
+    def close(self):
+        """Write pending access times and close the underlying database connection."""
+        with self._lock:
+            self._flush_touches()
+            self._conn.close()
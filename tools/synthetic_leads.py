@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Synthetic Lead Generator
+
+This script generates large, repeatable datasets of realistic-looking leads for
+load testing import, campaign creation, sending and analytics. Leads are
+produced as a stream from a seeded random generator, so the same seed always
+yields the same rows and memory stays flat from 10^4 up to 10^7 records.
+"""
+
+import os
+import sys
+import math
+import time
+import argparse
+import random
+from collections import deque
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.lead_export import EXPORT_FORMATS, SEARCH_FIELDS, export_leads
+from outreach.lead_sink import BusinessSink
+
+# Business categories -> trade names used to build business names
+CATEGORIES = {
+    'restaurants': ['Kitchen', 'Grill', 'Trattoria', 'Curry House', 'Bistro', 'Diner', 'Noodle Bar'],
+    'cafes': ['Cafe', 'Coffee House', 'Tea Rooms', 'Bakery'],
+    'pubs': ['Arms', 'Tavern', 'Inn', 'Alehouse'],
+    'plumbers': ['Plumbing', 'Plumbing & Heating', 'Bathrooms', 'Drainage Services'],
+    'electricians': ['Electrical', 'Electrical Services', 'Lighting', 'Rewiring'],
+    'hairdressers': ['Hair Salon', 'Barbers', 'Hair & Beauty', 'Hair Studio'],
+    'dentists': ['Dental Practice', 'Dental Care', 'Orthodontics'],
+    'mechanics': ['Motors', 'Auto Repairs', 'Garage', 'Car Care'],
+    'cleaners': ['Cleaning Services', 'Cleaners', 'Carpet Cleaning'],
+    'florists': ['Florist', 'Flowers', 'Flower Studio'],
+    'builders': ['Builders', 'Construction', 'Property Maintenance', 'Roofing'],
+    'beauty salons': ['Beauty', 'Nail Bar', 'Spa', 'Aesthetics'],
+}
+
+# Town -> (dialling code, centre latitude, centre longitude, districts)
+LOCATIONS = {
+    'London': ('20', 51.5072, -0.1276, ['Camden', 'Hackney', 'Islington', 'Lambeth', 'Lewisham', 'Southwark', 'Croydon', 'Barnet', 'Ealing', 'Brixton']),
+    'Manchester': ('161', 53.4808, -2.2426, ['Ancoats', 'Didsbury', 'Chorlton', 'Salford', 'Withington', 'Levenshulme']),
+    'Birmingham': ('121', 52.4862, -1.8904, ['Digbeth', 'Edgbaston', 'Moseley', 'Erdington', 'Harborne', 'Selly Oak']),
+    'Leeds': ('113', 53.8008, -1.5491, ['Headingley', 'Chapel Allerton', 'Roundhay', 'Armley', 'Horsforth']),
+    'Glasgow': ('141', 55.8642, -4.2518, ['Partick', 'Govan', 'Shawlands', 'Dennistoun', 'Finnieston']),
+    'Bristol': ('117', 51.4545, -2.5879, ['Clifton', 'Bedminster', 'Redland', 'Easton', 'Southville']),
+    'Liverpool': ('151', 53.4084, -2.9916, ['Anfield', 'Wavertree', 'Toxteth', 'Allerton', 'Walton']),
+    'Edinburgh': ('131', 55.9533, -3.1883, ['Leith', 'Morningside', 'Stockbridge', 'Portobello', 'Bruntsfield']),
+    'Cardiff': ('29', 51.4816, -3.1791, ['Canton', 'Roath', 'Cathays', 'Llandaff', 'Splott']),
+    'Newcastle': ('191', 54.9783, -1.6178, ['Jesmond', 'Heaton', 'Gosforth', 'Byker', 'Fenham']),
+}
+
+# Spread of generated coordinates around a town centre, in degrees latitude (~8 km)
+COORDINATE_SPREAD = 0.07
+
+SURNAMES = [
+    'Smith', 'Jones', 'Taylor', 'Brown', 'Williams', 'Wilson', 'Johnson', 'Davies', 'Patel', 'Robinson',
+    'Wright', 'Thompson', 'Evans', 'Walker', 'White', 'Roberts', 'Green', 'Hall', 'Khan', 'Wood',
+    'Clarke', 'Harris', 'Lewis', 'Martin', 'Jackson', 'Clark', 'Turner', 'Hill', 'Scott', 'Cooper',
+    'Ward', 'Morris', 'Moore', 'King', 'Watson', 'Baker', 'Harrison', 'Morgan', 'Ahmed', 'Singh',
+]
+
+STREETS = [
+    'High Street', 'Station Road', 'Church Street', 'Park Road', 'Victoria Road', 'London Road',
+    'Green Lane', 'Manor Road', 'Mill Lane', 'King Street', 'Queen Street', 'Market Place',
+]
+
+NAME_PATTERNS = ["{surname}'s {trade}", "{surname} {trade}", "{district} {trade}", "The {district} {trade}",
+                 "{surname} & Sons {trade}", "{initial}{initial2} {trade}"]
+
+LEGAL_SUFFIXES = ['', '', '', ' Ltd', ' Limited']
+
+EMAIL_DOMAINS = ['gmail.com', 'outlook.com', 'yahoo.co.uk', 'btinternet.com', 'hotmail.co.uk']
+
+# Multiplier coprime with 10^7, so each row index maps to a distinct local number
+_PHONE_MULTIPLIER = 7919
+
+class SyntheticLeadGenerator:
+    """Seeded generator of realistic business leads."""
+    
+    def __init__(self, seed=42, duplicate_rate=0.0, with_emails=False, categories=None, locations=None):
+        """
+        Initialize the SyntheticLeadGenerator.
+        
+        Args:
+            seed (int): Random seed; the same seed always produces the same leads
+            duplicate_rate (float): Fraction of rows (0-1) that re-emit a recent lead
+                                    with formatting differences, as real sources do
+            with_emails (bool): Include an email address on every lead
+            categories (list): Restrict to these categories (default: all of CATEGORIES)
+            locations (list): Restrict to these towns (default: all of LOCATIONS)
+        """
+        if not 0 <= duplicate_rate < 1:
+            raise ValueError("duplicate_rate must be between 0 and 1")
+            
+        self.seed = seed
+        self.duplicate_rate = duplicate_rate
+        self.with_emails = with_emails
+        self.categories = list(categories or CATEGORIES)
+        self.locations = list(locations or LOCATIONS)
+        
+        unknown = [c for c in self.categories if c not in CATEGORIES] + [l for l in self.locations if l not in LOCATIONS]
+        if unknown:
+            raise ValueError(f"Unknown categories/locations: {', '.join(unknown)}")
+            
+    @property
+    def fields(self):
+        """Columns produced by the generator."""
+        return SEARCH_FIELDS + ['email'] if self.with_emails else list(SEARCH_FIELDS)
+        
+    def _lead(self, rng, index):
+        """Build the unique lead for a row index."""
+        category = rng.choice(self.categories)
+        town = rng.choice(self.locations)
+        code, centre_lat, centre_lng, districts = LOCATIONS[town]
+        district = rng.choice(districts)
+        
+        name = rng.choice(NAME_PATTERNS).format(
+            surname=rng.choice(SURNAMES),
+            trade=rng.choice(CATEGORIES[category]),
+            district=district,
+            initial=chr(65 + rng.randrange(26)),
+            initial2=chr(65 + rng.randrange(26))
+        ) + rng.choice(LEGAL_SUFFIXES)
+        
+        local = (index * _PHONE_MULTIPLIER + self.seed) % 10 ** 7
+        number = f"{code}{local:07d}"[:10]
+        phone = f"+44 {number[:len(code)]} {number[len(code):]}"
+        
+        # Ratings cluster around 4 like real review scores
+        rating = round(min(5.0, max(1.0, rng.gauss(4.1, 0.6))), 1)
+        
+        lead = {
+            'name': name,
+            'address': f"{rng.randint(1, 250)} {rng.choice(STREETS)}, {district}, {town}",
+            'phone': phone,
+            'has_website': False,
+            'website': '',
+            'category': category,
+            'rating': rating,
+            'review_count': min(int(rng.paretovariate(1.2) * 5) - 5, 5000),
+            'location': f"{town}, UK",
+            'source': 'Synthetic',
+            'place_id': f"synthetic-{self.seed}-{index}",
+            'latitude': round(centre_lat + rng.gauss(0, COORDINATE_SPREAD / 2), 6),
+            'longitude': round(centre_lng + rng.gauss(0, COORDINATE_SPREAD / 2 / math.cos(math.radians(centre_lat))), 6)
+        }
+        
+        if self.with_emails:
+            handle = ''.join(c for c in name.lower() if c.isalnum())[:24]
+            lead['email'] = f"{handle}{index % 1000}@{rng.choice(EMAIL_DOMAINS)}"
+            
+        return lead
+        
+    def _duplicate(self, rng, lead, index):
+        """Re-emit a lead with the formatting noise seen across real sources."""
+        duplicate = dict(lead)
+        name = lead['name']
+        for suffix in (' Ltd', ' Limited'):
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+        duplicate['name'] = rng.choice([name, name.upper(), name + ' Ltd', name.replace('&', 'and')])
+        duplicate['phone'] = rng.choice([lead['phone'], '0' + lead['phone'][4:], lead['phone'].replace(' ', '')])
+        duplicate['place_id'] = f"synthetic-{self.seed}-{index}"
+        return duplicate
+        
+    def iter_leads(self, count):
+        """
+        Stream synthetic leads.
+        
+        Args:
+            count (int): Number of rows to generate
+            
+        Yields:
+            dict: Lead dictionaries, duplicates included
+        """
+        rng = random.Random(self.seed)
+        recent = deque(maxlen=1000)
+        
+        for index in range(count):
+            if recent and rng.random() < self.duplicate_rate:
+                yield self._duplicate(rng, rng.choice(recent), index)
+                continue
+                
+            lead = self._lead(rng, index)
+            recent.append(lead)
+            yield lead
+
+def write_leads_to_db(leads, db_path=None, batch_size=10000):
+    """
+    Upsert leads into the outreach database in batches.
+    
+    Args:
+        leads (iterable): Lead dictionaries
+        db_path (str): Path to the outreach database (default: data/outreach.db)
+        batch_size (int): Rows per upsert batch
+        
+    Returns:
+        int: Number of rows inserted or updated
+    """
+    with BusinessSink(db_path, batch_size=batch_size) as sink:
+        sink.write_all(leads)
+        
+    stats = sink.stats()
+    return stats['inserted'] + stats['updated']
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Generate a repeatable synthetic lead dataset for load testing.')
+    
+    parser.add_argument('--count', '-n', type=int, default=10000,
+                        help='Number of leads to generate (default: 10000)')
+                        
+    parser.add_argument('--seed', '-s', type=int, default=42,
+                        help='Random seed (default: 42)')
+                        
+    parser.add_argument('--duplicate-rate', type=float, default=0.0,
+                        help='Fraction of rows that duplicate an earlier lead (default: 0)')
+                        
+    parser.add_argument('--emails', action='store_true',
+                        help='Include email addresses')
+                        
+    parser.add_argument('--categories', '-c', type=str, nargs='+', default=None,
+                        choices=sorted(CATEGORIES), help='Restrict to these categories')
+                        
+    parser.add_argument('--locations', type=str, nargs='+', default=None,
+                        choices=sorted(LOCATIONS), help='Restrict to these towns')
+                        
+    parser.add_argument('--output', '-o', type=str, default=None,
+                        help='Output file path (format inferred from the extension)')
+                        
+    parser.add_argument('--format', '-f', type=str, default=None, choices=list(EXPORT_FORMATS),
+                        help='Output format (default: inferred from --output, else csv)')
+                        
+    parser.add_argument('--db', type=str, nargs='?', const='', default=None,
+                        help='Upsert into the outreach database instead (default path: data/outreach.db)')
+                        
+    return parser.parse_args()
+
+def main():
+    """Main function to run the CLI interface."""
+    args = parse_arguments()
+    
+    generator = SyntheticLeadGenerator(
+        seed=args.seed,
+        duplicate_rate=args.duplicate_rate,
+        with_emails=args.emails,
+        categories=args.categories,
+        locations=args.locations
+    )
+    leads = generator.iter_leads(args.count)
+    
+    start_time = time.time()
+    if args.db is not None:
+        count = write_leads_to_db(leads, db_path=args.db or None)
+        target = args.db or 'data/outreach.db'
+    else:
+        fmt = args.format
+        output = args.output
+        if not output:
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            fmt = fmt or 'csv'
+            output = os.path.join(base_dir, 'data', f"synthetic_leads_{args.seed}_{args.count}{EXPORT_FORMATS[fmt]}")
+        count = export_leads(leads, output, fmt=fmt, fields=generator.fields)
+        target = output
+        
+    elapsed = max(time.time() - start_time, 1e-9)
+    print(f"Wrote {count} leads to {target} in {elapsed:.1f}s ({count / elapsed:,.0f} leads/s)")
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,7 @@ import sqlite3
 # Add project root to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tools.business_finder import BusinessFinder
+from tools.lead_index import filter_leads
 from outreach.outreach_generator import OutreachGenerator
 from outreach.outreach_automation import OutreachAutomation
 
@@ -26,7 +27,8 @@ app.secret_key = 'business_finder_secret_key'
 base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 db_path = os.path.join(base_dir, 'data', 'outreach.db')
 automation = OutreachAutomation(db_path=db_path)
-finder = BusinessFinder()
+# One finder serves every request, so it must not drop leads seen by earlier searches
+finder = BusinessFinder(dedupe=False)
 generator = OutreachGenerator()
 
 @app.route('/')
@@ -38,9 +40,8 @@ def index():
 def leads():
     """Render the leads management page."""
     # Get leads from database
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    cursor = automation.db.connection().cursor()
+    cursor.row_factory = sqlite3.Row
     
     cursor.execute('''
     SELECT id, name, category, location, phone, email, date_added
@@ -49,7 +50,6 @@ def leads():
     ''')
     
     leads_data = cursor.fetchall()
-    conn.close()
     
     return render_template('leads.html', leads=leads_data)
 
@@ -106,13 +106,11 @@ def api_find_businesses():
     
     # Apply filters if specified
     min_rating = data.get('min_rating')
-    if min_rating:
-        min_rating = float(min_rating)
-        businesses = [b for b in businesses if b.get('rating', 0) >= min_rating]
-    
-    categories = data.get('categories')
-    if categories:
-        businesses = [b for b in businesses if any(cat.lower() in b.get('category', '').lower() for cat in categories)]
+    businesses = filter_leads(
+        businesses,
+        min_rating=float(min_rating) if min_rating else None,
+        categories=data.get('categories')
+    )
     
     return jsonify({'businesses': businesses})
 
@@ -158,9 +156,10 @@ def api_create_campaign():
     # Add businesses if specified
     business_ids = data.get('business_ids')
     filters = data.get('filters')
+    top = int(data['top']) if data.get('top') else None
     
-    if business_ids or filters:
-        count = automation.add_businesses_to_campaign(campaign_id, business_ids, filters)
+    if business_ids or filters or top:
+        count = automation.add_businesses_to_campaign(campaign_id, business_ids, filters, top=top)
         return jsonify({'success': True, 'campaign_id': campaign_id, 'businesses_added': count})
     
     return jsonify({'success': True, 'campaign_id': campaign_id})
@@ -174,8 +173,8 @@ def api_schedule_campaign():
     if not campaign_id:
         return jsonify({'error': 'Campaign ID is required'}), 400
     
-    # Generate email content first
-    automation.generate_campaign_emails(campaign_id)
+    # Generate email content first, optionally as send-ready MIME payloads
+    automation.generate_campaign_emails(campaign_id, prebuild_mime=bool(data.get('prebuild_mime')))
     
     # Schedule campaign
     start_date = data.get('start_date')
@@ -214,19 +213,11 @@ def api_generate_website():
 @app.route('/templates')
 def templates():
     """Render the email templates management page."""
-    # Get templates from the OutreachGenerator
-    template_names = list(generator.templates.keys())
-    templates_data = []
-    
-    for name in template_names:
-        template_path = os.path.join(generator.templates_dir, name)
-        with open(template_path, 'r') as f:
-            content = f.read()
-        
-        templates_data.append({
-            'name': name,
-            'content': content
-        })
+    # Get templates from the shared template registry (compiled copies hold the text)
+    templates_data = [
+        {'name': name, 'content': generator.templates[name].template}
+        for name in generator.templates
+    ]
     
     return render_template('templates.html', templates=templates_data)
 
@@ -240,17 +231,11 @@ def api_save_template():
     if not name or not content:
         return jsonify({'error': 'Name and content are required'}), 400
     
-    # Ensure template has .txt extension
-    if not name.endswith('.txt'):
-        name += '.txt'
-    
-    # Save template
-    template_path = os.path.join(generator.templates_dir, name)
-    with open(template_path, 'w') as f:
-        f.write(content)
-    
-    # Reload templates
-    generator.templates = generator.load_templates()
+    # Save template; only this template is recompiled, the others stay cached
+    try:
+        generator.registry.save(name, content)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({'success': True})
 
@@ -258,9 +243,8 @@ def api_save_template():
 def analytics():
     """Render the analytics page."""
     # Get analytics data from database
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    cursor = automation.db.connection().cursor()
+    cursor.row_factory = sqlite3.Row
     
     cursor.execute('''
     SELECT a.campaign_id, c.name, a.sent_count, a.open_count, a.click_count, 
@@ -271,7 +255,6 @@ def analytics():
     ''')
     
     analytics_data = cursor.fetchall()
-    conn.close()
     
     return render_template('analytics.html', analytics=analytics_data)
 